@@ -27,7 +27,7 @@ from .base_connector import BaseConnector
 from .binance_connector import BinanceConnector
 from .coinbase_connector import CoinbaseConnector
 from .kraken_connector import KrakenConnector
-from .blockchain_connector import BlockchainConnector
+from .blockchain_connector import BlockchainConnector, get_multi_chain_balances
 from .defi_connectors import (
     UniswapV2Connector,
     UniswapV3Connector,
@@ -44,6 +44,7 @@ __all__ = [
     "KrakenConnector",
     # Blockchain & Web3
     "BlockchainConnector",
+    "get_multi_chain_balances",
     # DeFi Connectors
     "UniswapV2Connector",
     "UniswapV3Connector",
@@ -15,10 +15,80 @@ from abc import ABC, abstractmethod
 from typing import Optional, Dict, Any, List
 from datetime import datetime
 from decimal import Decimal
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 
 logger = logging.getLogger(__name__)
 
+# Códigos HTTP transitorios que merecen reintento (rate limit y errores 5xx)
+RETRY_STATUS_FORCELIST = (429, 500, 502, 503, 504)
+
+
+def create_retry_session(
+    total: int = 5,
+    backoff_factor: float = 0.3,
+    allowed_methods: frozenset = frozenset({"GET"}),
+    pool_maxsize: int = 10,
+    pool_connections: int = 10,
+) -> requests.Session:
+    """
+    Crea una sesión HTTP con reintentos y backoff exponencial.
+    
+    Respeta la cabecera ``Retry-After`` en respuestas 429/503, de modo que
+    un error transitorio no se convierte en una respuesta vacía.
+    
+    Args:
+        total: Número máximo de reintentos
+        backoff_factor: Factor de backoff exponencial (segundos)
+        allowed_methods: Métodos HTTP que se pueden reintentar
+        pool_maxsize: Conexiones keep-alive por host en el pool
+        pool_connections: Número de hosts distintos con pool propio
+        
+    Returns:
+        Sesión requests con el adaptador de reintentos montado
+    """
+    retry = Retry(
+        total=total,
+        backoff_factor=backoff_factor,
+        status_forcelist=RETRY_STATUS_FORCELIST,
+        respect_retry_after_header=True,
+        allowed_methods=allowed_methods,
+    )
+    adapter = HTTPAdapter(
+        max_retries=retry,
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+    )
+    
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def parse_json(response: requests.Response) -> Any:
+    """
+    Decodifica el body JSON de una respuesta.
+    
+    Usa orjson (decodificación en C) si está instalado; si no, ``response.json()``.
+    
+    Args:
+        response: Respuesta HTTP
+        
+    Returns:
+        Objeto JSON decodificado
+    """
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
+
 
 class BaseConnector(ABC):
     """
@@ -120,4 +190,4 @@ class BaseConnector(ABC):
         self.close()
 
 
-__all__ = ["BaseConnector"]
+__all__ = ["BaseConnector", "create_retry_session", "parse_json"]
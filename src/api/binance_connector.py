@@ -22,13 +22,15 @@ import hmac
 import time
 from typing import Optional, Dict, Any, List
 from decimal import Decimal
-import requests
 
-from .base_connector import BaseConnector
+from .base_connector import BaseConnector, create_retry_session, parse_json
 
 
 logger = logging.getLogger(__name__)
 
+# Binance devuelve los saldos vacíos con este formato exacto
+ZERO_AMOUNT = "0.00000000"
+
 
 class BinanceConnector(BaseConnector):
     """Conector para API de Binance."""
@@ -53,10 +55,15 @@ class BinanceConnector(BaseConnector):
         if testnet:
             self.base_url = "https://testnet.binance.vision"
         
-        self.session = requests.Session()
+        self.session = create_retry_session()
         self.session.headers.update({
             'X-MBX-APIKEY': self.api_key
         })
+        
+        # Caché corto de /api/v3/account (evita una request firmada por llamada)
+        self._account_cache: Dict[str, Any] = {}
+        self._account_cache_timestamp = 0.0
+        self._account_cache_ttl = 3  # segundos
     
     def _generate_signature(self, data: Dict[str, Any]) -> str:
         """
@@ -94,9 +101,17 @@ class BinanceConnector(BaseConnector):
         """
         Obtiene información de la cuenta.
         
+        La respuesta se cachea durante ``_account_cache_ttl`` segundos, de modo
+        que llamadas consecutivas (p. ej. ``get_balances`` por activo) comparten
+        una sola request.
+        
         Returns:
             Dict con datos de cuenta
         """
+        if (self._account_cache and
+                time.time() - self._account_cache_timestamp < self._account_cache_ttl):
+            return self._account_cache
+        
         try:
             timestamp = int(time.time() * 1000)
             params = {'timestamp': timestamp}
@@ -107,7 +122,10 @@ class BinanceConnector(BaseConnector):
                 params=params
             )
             response.raise_for_status()
-            return response.json()
+            
+            self._account_cache = parse_json(response)
+            self._account_cache_timestamp = time.time()
+            return self._account_cache
         
         except Exception as e:
             logger.error(f"Error getting Binance account info: {e}")
@@ -127,15 +145,19 @@ class BinanceConnector(BaseConnector):
             account_info = self.get_account_info()
             balances = {}
             
-            for balance in account_info.get('balances', []):
+            for balance in account_info.get('balances', ()):
                 symbol = balance['asset']
-                free = Decimal(balance['free'])
-                locked = Decimal(balance['locked'])
-                total = free + locked
+                if asset and symbol != asset:
+                    continue
+                
+                # La mayoría de activos vienen a cero: filtrar por string
+                # antes de construir ningún Decimal
+                free, locked = balance['free'], balance['locked']
+                if free == ZERO_AMOUNT and locked == ZERO_AMOUNT:
+                    continue
                 
+                total = Decimal(free) + Decimal(locked)
                 if total > 0:  # Solo incluir si hay saldo
-                    if asset and symbol != asset:
-                        continue
                     balances[symbol] = total
             
             logger.debug(f"Got {len(balances)} balances from Binance")
@@ -170,7 +192,7 @@ class BinanceConnector(BaseConnector):
                 params=params
             )
             deposits_response.raise_for_status()
-            deposits = deposits_response.json().get('depositList', [])
+            deposits = parse_json(deposits_response).get('depositList', [])
             
             # Retiros
             withdraws_response = self.session.get(
@@ -178,7 +200,7 @@ class BinanceConnector(BaseConnector):
                 params=params
             )
             withdraws_response.raise_for_status()
-            withdraws = withdraws_response.json().get('withdrawList', [])
+            withdraws = parse_json(withdraws_response).get('withdrawList', [])
             
             transactions = []
             
@@ -237,7 +259,7 @@ class BinanceConnector(BaseConnector):
                 )
                 
                 if response.status_code == 200:
-                    data = response.json()
+                    data = parse_json(response)
                     prices[asset] = Decimal(data['price'])
                 else:
                     logger.warning(f"Could not get price for {asset}")
@@ -22,13 +22,14 @@ Version: 3.0.0
 License: MIT
 """
 
+import asyncio
 import logging
 from typing import Optional, Dict, Any, List
 from decimal import Decimal
 from web3 import Web3
 from web3.contract import Contract
 
-from .base_connector import BaseConnector
+from .base_connector import BaseConnector, create_retry_session
 
 
 logger = logging.getLogger(__name__)
@@ -91,7 +92,9 @@ class BlockchainConnector(BaseConnector):
         if not endpoint:
             raise ValueError(f"Unknown network: {network}")
         
-        self.w3 = Web3(Web3.HTTPProvider(endpoint))
+        # JSON-RPC usa POST; las lecturas son idempotentes y se pueden reintentar
+        self.session = create_retry_session(allowed_methods=frozenset({"GET", "POST"}))
+        self.w3 = Web3(Web3.HTTPProvider(endpoint, session=self.session))
         
         if not self.w3.is_connected():
             logger.error(f"Could not connect to {network} RPC")
@@ -256,4 +259,44 @@ class BlockchainConnector(BaseConnector):
             return "UNKNOWN"
 
 
-__all__ = ["BlockchainConnector"]
+async def get_multi_chain_balances(
+    wallet_address: str,
+    tokens_by_chain: Optional[Dict[str, List[str]]] = None,
+    networks: Optional[List[str]] = None,
+) -> Dict[str, Dict[str, Decimal]]:
+    """
+    Obtiene saldos de una wallet en varias redes EVM en paralelo.
+    
+    Cada red usa su propio proveedor RPC, así que las consultas son
+    independientes: se lanzan todas a la vez (Web3.py es síncrono, por lo que
+    cada una corre en un hilo) y el tiempo total es el de la red más lenta.
+    
+    Args:
+        wallet_address: Dirección de wallet (0x...)
+        tokens_by_chain: Dict red -> lista de contratos ERC-20 (opcional)
+        networks: Redes a consultar (default: todas las de RPC_ENDPOINTS)
+        
+    Returns:
+        Dict red -> (símbolo -> saldo)
+    """
+    tokens_by_chain = tokens_by_chain or {}
+    networks = networks or list(BlockchainConnector.RPC_ENDPOINTS)
+    
+    def _fetch(network: str) -> Dict[str, Decimal]:
+        try:
+            connector = BlockchainConnector(network)
+        except Exception as e:
+            logger.error(f"Could not create {network} connector: {e}")
+            return {}
+        try:
+            return connector.get_balances(wallet_address, tokens_by_chain.get(network))
+        finally:
+            connector.close()
+    
+    results = await asyncio.gather(
+        *(asyncio.to_thread(_fetch, network) for network in networks)
+    )
+    return dict(zip(networks, results))
+
+
+__all__ = ["BlockchainConnector", "get_multi_chain_balances"]
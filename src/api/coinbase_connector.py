@@ -17,15 +17,16 @@ License: MIT
 """
 
 import logging
-import hashlib
+import heapq
 import hmac
 import base64
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, Dict, Any, List
 from decimal import Decimal
-import requests
+from operator import itemgetter
 
-from .base_connector import BaseConnector
+from .base_connector import BaseConnector, create_retry_session, parse_json
 
 
 logger = logging.getLogger(__name__)
@@ -39,6 +40,9 @@ class CoinbaseConnector(BaseConnector):
     
     BASE_URL = "https://api.exchange.coinbase.com"
     
+    # Requests concurrentes (ledgers por cuenta, tickers por activo)
+    MAX_WORKERS = 16
+    
     def __init__(self, api_key: str, api_secret: str, passphrase: str):
         """
         Inicializa conector de Coinbase.
@@ -50,7 +54,33 @@ class CoinbaseConnector(BaseConnector):
         """
         super().__init__(api_key, api_secret)
         self.passphrase = passphrase
-        self.session = requests.Session()
+        
+        # HMAC ya inicializado con la clave (estados ipad/opad precalculados);
+        # cada firma parte de una copia en C sin volver a procesar la clave
+        self._hmac_base = hmac.new(base64.b64decode(api_secret), digestmod='sha256')
+        # Cabeceras fijas prearmadas
+        self._static_headers = {
+            'CB-ACCESS-KEY': self.api_key,
+            'CB-ACCESS-PASSPHRASE': self.passphrase,
+            'Content-Type': 'application/json'
+        }
+        
+        # Una sola sesión keep-alive compartida por todos los hilos de trabajo
+        self.session = create_retry_session(pool_maxsize=self.MAX_WORKERS)
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.MAX_WORKERS,
+            thread_name_prefix="coinbase"
+        )
+        
+        # Caché de la respuesta de /accounts (compartida por saldos y ledgers)
+        self._accounts_cache: Optional[List[Dict[str, Any]]] = None
+        self._accounts_timestamp = 0.0
+        self._accounts_ttl = 60  # segundos
+        
+        # Caché de precios por símbolo
+        self._price_cache: Dict[str, Decimal] = {}
+        self._cache_timestamp: Dict[str, float] = {}
+        self._cache_ttl = 30  # segundos
     
     def _generate_auth(self, method: str, request_path: str, body: str = "") -> Dict[str, str]:
         """
@@ -64,20 +94,24 @@ class CoinbaseConnector(BaseConnector):
         Returns:
             Dict con headers de autenticación
         """
-        timestamp = str(time.time())
-        message = timestamp + method + request_path + body
-        message_bytes = message.encode('ascii')
-        hmac_key = base64.b64decode(self.api_secret)
-        signature = hmac.new(hmac_key, message_bytes, hashlib.sha256)
+        timestamp = f"{time.time():.6f}"
+        # Mensaje firmado armado directamente en bytes, sin str intermedios
+        message_bytes = b''.join((
+            timestamp.encode('ascii'),
+            method.encode('ascii'),
+            request_path.encode('ascii'),
+            body.encode('ascii')
+        ))
+        signature = self._hmac_base.copy()
+        signature.update(message_bytes)
         signature_b64 = base64.b64encode(signature.digest()).decode('utf-8')
         
-        return {
+        headers = {
             'CB-ACCESS-SIGN': signature_b64,
             'CB-ACCESS-TIMESTAMP': timestamp,
-            'CB-ACCESS-KEY': self.api_key,
-            'CB-ACCESS-PASSPHRASE': self.passphrase,
-            'Content-Type': 'application/json'
         }
+        headers.update(self._static_headers)
+        return headers
     
     def authenticate(self) -> bool:
         """
@@ -105,13 +139,7 @@ class CoinbaseConnector(BaseConnector):
             Dict con datos de cuenta
         """
         try:
-            headers = self._generate_auth('GET', '/accounts')
-            response = self.session.get(
-                f"{self.BASE_URL}/accounts",
-                headers=headers
-            )
-            response.raise_for_status()
-            return response.json()
+            return self._get_accounts()
         except Exception as e:
             logger.error(f"Error getting Coinbase account info: {e}")
             return {}
@@ -127,14 +155,7 @@ class CoinbaseConnector(BaseConnector):
             Dict símbolo -> saldo
         """
         try:
-            headers = self._generate_auth('GET', '/accounts')
-            response = self.session.get(
-                f"{self.BASE_URL}/accounts",
-                headers=headers
-            )
-            response.raise_for_status()
-            
-            accounts = response.json()
+            accounts = self._get_accounts()
             balances = {}
             
             for account in accounts:
@@ -165,52 +186,137 @@ class CoinbaseConnector(BaseConnector):
             Lista de transacciones
         """
         try:
-            # Obtener cuentas primero
-            headers = self._generate_auth('GET', '/accounts')
-            response = self.session.get(
-                f"{self.BASE_URL}/accounts",
-                headers=headers
-            )
-            response.raise_for_status()
-            accounts = response.json()
+            # Cuentas cacheadas: normalmente ya se pidieron en get_balances
+            accounts = [
+                account for account in self._get_accounts()
+                if not asset or account['currency'] == asset
+            ]
             
-            transactions = []
+            # Los ledgers de cada cuenta son independientes: pedirlos en paralelo
+            ledgers = self._executor.map(
+                lambda account: self._get_ledger(account['id'], limit),
+                accounts
+            )
             
-            # Para cada cuenta, obtener el histórico
-            for account in accounts:
-                if asset and account['currency'] != asset:
-                    continue
-                
-                account_id = account['id']
-                headers = self._generate_auth('GET', f'/accounts/{account_id}/ledger')
-                response = self.session.get(
-                    f"{self.BASE_URL}/accounts/{account_id}/ledger",
-                    headers=headers,
-                    params={'limit': limit}
-                )
-                response.raise_for_status()
-                
-                for entry in response.json():
-                    transactions.append({
+            by_timestamp = itemgetter('timestamp')
+            streams = []
+            for account, ledger in zip(accounts, ledgers):
+                stream = [
+                    {
                         'type': entry['type'],  # deposit, withdrawal, trade, etc
                         'asset': account['currency'],
                         'amount': Decimal(entry['amount']),
                         'balance': Decimal(entry['balance']),
                         'timestamp': entry['created_at'],
                         'description': entry.get('description', '')
-                    })
+                    }
+                    for entry in ledger
+                ]
+                # heapq.merge exige cada ledger ya ordenado (más reciente
+                # primero). La API suele devolverlos así y timsort lo
+                # comprueba en O(n); solo reordena si no lo están
+                stream.sort(key=by_timestamp, reverse=True)
+                streams.append(stream)
+            
+            # Mezcla de K listas ordenadas: O(N log K) en lugar de reordenar todo
+            transactions = list(heapq.merge(*streams, key=by_timestamp, reverse=True))
             
             logger.debug(f"Got {len(transactions)} transactions from Coinbase")
-            return sorted(transactions, key=lambda x: x['timestamp'], reverse=True)
+            return transactions
         
         except Exception as e:
             logger.error(f"Error getting Coinbase transactions: {e}")
             return []
     
+    def _get_accounts(self) -> List[Dict[str, Any]]:
+        """
+        Obtiene las cuentas (/accounts), reutilizando la respuesta ``_accounts_ttl`` segundos.
+        
+        Returns:
+            Lista de cuentas
+        """
+        if (self._accounts_cache is not None and
+                time.time() - self._accounts_timestamp < self._accounts_ttl):
+            return self._accounts_cache
+        
+        headers = self._generate_auth('GET', '/accounts')
+        response = self.session.get(
+            f"{self.BASE_URL}/accounts",
+            headers=headers
+        )
+        response.raise_for_status()
+        
+        self._accounts_cache = parse_json(response)
+        self._accounts_timestamp = time.time()
+        return self._accounts_cache
+    
+    def invalidate_accounts(self) -> None:
+        """Vacía la caché de cuentas para forzar un refresco."""
+        self._accounts_cache = None
+        self._accounts_timestamp = 0.0
+    
+    def _get_ledger(self, account_id: str, limit: int) -> List[Dict]:
+        """
+        Obtiene el ledger de una cuenta.
+        
+        Las cabeceras se firman justo antes de la request para que el
+        timestamp sea fresco aunque se ejecute en un hilo de trabajo.
+        
+        Args:
+            account_id: ID de la cuenta Coinbase
+            limit: Límite de registros
+            
+        Returns:
+            Lista de entradas del ledger
+        """
+        path = f'/accounts/{account_id}/ledger'
+        response = self.session.get(
+            f"{self.BASE_URL}{path}",
+            headers=self._generate_auth('GET', path),
+            params={'limit': limit}
+        )
+        response.raise_for_status()
+        return parse_json(response)
+    
+    def _fetch_one_price(self, asset: str) -> Optional[Decimal]:
+        """
+        Obtiene el último precio en USD de un activo.
+        
+        El ticker es un endpoint público, así que no se firma la request.
+        
+        Args:
+            asset: Símbolo (ej: 'BTC')
+            
+        Returns:
+            Precio USD o None si no está disponible
+        """
+        response = self.session.get(f"{self.BASE_URL}/products/{asset}-USD/ticker")
+        
+        if response.status_code != 200:
+            logger.warning(f"Could not get price for {asset}")
+            return None
+        
+        return Decimal(parse_json(response)['price'])
+    
+    def _is_cache_valid(self, asset: str) -> bool:
+        """Comprueba si el precio cacheado sigue siendo válido."""
+        if asset not in self._cache_timestamp:
+            return False
+        return time.time() - self._cache_timestamp[asset] < self._cache_ttl
+    
+    def invalidate_prices(self) -> None:
+        """Vacía la caché de precios para forzar un refresco."""
+        self._price_cache.clear()
+        self._cache_timestamp.clear()
+    
     def get_prices(self, assets: List[str]) -> Dict[str, Decimal]:
         """
         Obtiene precios en USD.
         
+        Los precios se cachean ``_cache_ttl`` segundos por símbolo. Los
+        tickers de cada activo se piden en paralelo sobre la sesión
+        compartida, así que el tiempo total es ~1 RTT en lugar de N.
+        
         Args:
             assets: Lista de símbolos (ej: ['BTC', 'ETH'])
             
@@ -219,26 +325,30 @@ class CoinbaseConnector(BaseConnector):
         """
         try:
             prices = {}
+            missing = []
             
             for asset in assets:
-                product_id = f"{asset}-USD"
-                headers = self._generate_auth('GET', f'/products/{product_id}/ticker')
-                response = self.session.get(
-                    f"{self.BASE_URL}/products/{product_id}/ticker",
-                    headers=headers
-                )
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    prices[asset] = Decimal(data['price'])
+                if self._is_cache_valid(asset):
+                    prices[asset] = self._price_cache[asset]
                 else:
-                    logger.warning(f"Could not get price for {asset}")
+                    missing.append(asset)
+            
+            for asset, price in zip(missing, self._executor.map(self._fetch_one_price, missing)):
+                if price is not None:
+                    prices[asset] = price
+                    self._price_cache[asset] = price
+                    self._cache_timestamp[asset] = time.time()
             
             return prices
         
         except Exception as e:
             logger.error(f"Error getting Coinbase prices: {e}")
             return {}
+    
+    def close(self) -> None:
+        """Cierra sesión y detiene el pool de hilos."""
+        self._executor.shutdown(wait=False)
+        super().close()
 
 
 __all__ = ["CoinbaseConnector"]
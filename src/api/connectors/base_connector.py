@@ -16,6 +16,20 @@ from datetime import datetime
 logger = logging.getLogger(__name__)
 
 
+class TenantLoggerAdapter(logging.LoggerAdapter):
+    """
+    Tag a shared class logger with the account a connector instance serves
+    
+    One logger per API key or wallet would pile up forever in the logging
+    manager; instead every instance wraps its class logger and the tenant
+    goes into the record (``extra={"tenant": ...}``) and the message prefix.
+    """
+    
+    def process(self, msg, kwargs):
+        kwargs["extra"] = self.extra
+        return f"[{self.extra['tenant']}] {msg}", kwargs
+
+
 class BaseConnector(ABC):
     """Abstract base connector"""
     
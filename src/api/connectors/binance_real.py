@@ -10,9 +10,49 @@ from binance.exceptions import BinanceAPIException
 from decimal import Decimal
 from typing import List, Dict, Any, Optional
 import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import partial
+
+from src.api.connectors.base_connector import TenantLoggerAdapter
 
 logger = logging.getLogger(__name__)
+_LOGGER = logging.getLogger("connector.binance")
+
+# Binance allows 1200 request weight per minute per IP
+REQUEST_WEIGHT_PER_MINUTE = 1200
+# /api/v3/myTrades without orderId
+MY_TRADES_WEIGHT = 20
+MAX_WORKERS = 20
+
+# 429: request weight exceeded; 418: IP banned for ignoring 429s
+RATE_LIMIT_STATUS = (429, 418)
+MAX_RATE_LIMIT_RETRIES = 3
+
+
+class _RateLimiter:
+    """Thread-safe limiter spacing calls to at most `max_weight` per `period` seconds"""
+
+    def __init__(self, max_weight: int, period: float):
+        self._interval = period / max_weight
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self, weight: int = 1) -> None:
+        """Block until a call costing `weight` fits in the budget"""
+        with self._lock:
+            now = time.monotonic()
+            wait = self._next_slot - now
+            self._next_slot = max(now, self._next_slot) + self._interval * weight
+        if wait > 0:
+            time.sleep(wait)
+
+    def pause(self, seconds: float) -> None:
+        """Hold every caller back for `seconds` (after a 429/418)"""
+        with self._lock:
+            self._next_slot = max(self._next_slot, time.monotonic() + seconds)
 
 
 class BinanceRealConnector:
@@ -29,7 +69,22 @@ class BinanceRealConnector:
         self.api_key = api_key
         self.api_secret = api_secret
         self.client = Client(api_key, api_secret)
-        self.logger = logging.getLogger(f"connector.binance.{api_key[:8]}")
+        self._log_suffix = api_key[:8]
+        self.logger = TenantLoggerAdapter(_LOGGER, {"tenant": self._log_suffix})
+        
+        # Cache of the full ticker list (get_all_prices)
+        self._all_prices_cache: Dict[str, str] = {}
+        self._all_prices_timestamp = 0.0
+        self._all_prices_ttl = 15  # seconds
+        
+        # Cache of the last get_account() response, indexed by asset
+        self._account_cache: Optional[Dict[str, Any]] = None
+        self._account_timestamp = 0.0
+        self._account_ttl = 5  # seconds
+        self._balance_dict: Dict[str, Dict[str, str]] = {}
+        
+        # Request weight budget, shared by every worker thread of get_all_trades
+        self._rate_limiter = _RateLimiter(REQUEST_WEIGHT_PER_MINUTE, 60)
 
     def validate_connection(self) -> bool:
         """Validate Binance API connection"""
@@ -38,12 +93,24 @@ class BinanceRealConnector:
             self.logger.info("✅ Binance connection validated")
             return True
         except BinanceAPIException as e:
-            self.logger.error(f"❌ Binance API error: {str(e)}")
+            self.logger.exception("❌ Binance API error: %s", e)
             return False
         except Exception as e:
-            self.logger.error(f"❌ Connection error: {str(e)}")
+            self.logger.exception("❌ Connection error: %s", e)
             return False
 
+    def _get_cached_account(self) -> Dict[str, Any]:
+        """Get account data, reusing the last response for a few seconds"""
+        if (self._account_cache is not None and
+                time.time() - self._account_timestamp < self._account_ttl):
+            return self._account_cache
+        
+        account = self.client.get_account()
+        self._account_cache = account
+        self._balance_dict = {b['asset']: b for b in account['balances']}
+        self._account_timestamp = time.time()
+        return account
+
     def get_balance(self) -> Dict[str, Dict[str, Any]]:
         """
         Get account balance from Binance
@@ -57,7 +124,7 @@ class BinanceRealConnector:
             }
         """
         try:
-            account = self.client.get_account()
+            account = self._get_cached_account()
             balances = {}
             
             for balance in account['balances']:
@@ -74,31 +141,31 @@ class BinanceRealConnector:
                         "total": str(total)
                     }
             
-            self.logger.info(f"✅ Balance fetched: {len(balances)} assets")
+            self.logger.info("✅ Balance fetched: %s assets", len(balances))
             return balances
         except BinanceAPIException as e:
-            self.logger.error(f"❌ Error fetching balance: {str(e)}")
+            self.logger.error("❌ Error fetching balance: %s", e)
             raise
         except Exception as e:
-            self.logger.error(f"❌ Error fetching balance: {str(e)}")
+            self.logger.error("❌ Error fetching balance: %s", e)
             raise
 
     def get_asset_balance(self, asset: str) -> Optional[Dict[str, str]]:
         """Get balance for specific asset"""
         try:
-            account = self.client.get_account()
+            self._get_cached_account()
+            balance = self._balance_dict.get(asset)
             
-            for balance in account['balances']:
-                if balance['asset'] == asset:
-                    return {
-                        "free": balance['free'],
-                        "locked": balance['locked'],
-                        "total": str(Decimal(balance['free']) + Decimal(balance['locked']))
-                    }
+            if balance is None:
+                return None
             
-            return None
+            return {
+                "free": balance['free'],
+                "locked": balance['locked'],
+                "total": str(Decimal(balance['free']) + Decimal(balance['locked']))
+            }
         except Exception as e:
-            self.logger.error(f"❌ Error fetching {asset} balance: {str(e)}")
+            self.logger.error("❌ Error fetching %s balance: %s", asset, e)
             return None
 
     def get_trading_fees(self) -> Dict[str, Any]:
@@ -107,7 +174,7 @@ class BinanceRealConnector:
             fees = self.client.get_trade_fee()
             return fees
         except Exception as e:
-            self.logger.error(f"❌ Error fetching fees: {str(e)}")
+            self.logger.error("❌ Error fetching fees: %s", e)
             raise
 
     def get_deposit_address(self, coin: str, network: str = "BTC") -> Optional[str]:
@@ -116,7 +183,7 @@ class BinanceRealConnector:
             address = self.client.get_deposit_address(coin=coin, network=network)
             return address.get('address')
         except Exception as e:
-            self.logger.error(f"❌ Error getting deposit address: {str(e)}")
+            self.logger.exception("❌ Error getting deposit address: %s", e)
             return None
 
     def get_withdraw_history(self, coin: Optional[str] = None, limit: int = 100) -> List[Dict[str, Any]]:
@@ -127,6 +194,7 @@ class BinanceRealConnector:
                 params["coin"] = coin
             
             history = self.client.get_withdraw_history(**params)
+            fromtimestamp = datetime.fromtimestamp
             
             return [
                 {
@@ -135,13 +203,13 @@ class BinanceRealConnector:
                     "amount": tx['amount'],
                     "address": tx['address'],
                     "status": tx['status'],
-                    "timestamp": datetime.fromtimestamp(tx['applyTime'] / 1000).isoformat(),
+                    "timestamp": fromtimestamp(tx['applyTime'] * 1e-3).isoformat(),
                     "txid": tx.get('txId')
                 }
                 for tx in history
             ]
         except Exception as e:
-            self.logger.error(f"❌ Error fetching withdraw history: {str(e)}")
+            self.logger.exception("❌ Error fetching withdraw history: %s", e)
             return []
 
     def get_deposit_history(self, coin: Optional[str] = None, limit: int = 100) -> List[Dict[str, Any]]:
@@ -152,6 +220,7 @@ class BinanceRealConnector:
                 params["coin"] = coin
             
             history = self.client.get_deposit_history(**params)
+            fromtimestamp = datetime.fromtimestamp
             
             return [
                 {
@@ -160,13 +229,13 @@ class BinanceRealConnector:
                     "amount": tx['amount'],
                     "address": tx['address'],
                     "status": tx['status'],
-                    "timestamp": datetime.fromtimestamp(tx['insertTime'] / 1000).isoformat(),
+                    "timestamp": fromtimestamp(tx['insertTime'] * 1e-3).isoformat(),
                     "txid": tx.get('txId')
                 }
                 for tx in history
             ]
         except Exception as e:
-            self.logger.error(f"❌ Error fetching deposit history: {str(e)}")
+            self.logger.exception("❌ Error fetching deposit history: %s", e)
             return []
 
     def get_trades(self, symbol: str, limit: int = 100) -> List[Dict[str, Any]]:
@@ -181,7 +250,10 @@ class BinanceRealConnector:
             List of trades
         """
         try:
-            trades = self.client.get_my_trades(symbol=symbol, limit=limit)
+            trades = self._weighted_call(
+                MY_TRADES_WEIGHT, self.client.get_my_trades, symbol=symbol, limit=limit
+            )
+            fromtimestamp = datetime.fromtimestamp
             
             return [
                 {
@@ -193,38 +265,75 @@ class BinanceRealConnector:
                     "commissionAsset": t['commissionAsset'],
                     "is_buyer": t['isBuyer'],
                     "is_maker": t['isMaker'],
-                    "timestamp": datetime.fromtimestamp(t['time'] / 1000).isoformat()
+                    "timestamp": fromtimestamp(t['time'] * 1e-3).isoformat()
                 }
                 for t in trades
             ]
+        except BinanceAPIException as e:
+            if e.status_code in RATE_LIMIT_STATUS:
+                # Still rate limited after backing off: missing trades must
+                # not look like an empty history
+                raise
+            self.logger.exception("❌ Error fetching trades: %s", e)
+            return []
         except Exception as e:
-            self.logger.error(f"❌ Error fetching trades: {str(e)}")
+            self.logger.exception("❌ Error fetching trades: %s", e)
             return []
 
-    def get_all_trades(self) -> List[Dict[str, Any]]:
-        """Get all trades across all symbols"""
+    def get_all_trades(self, symbols: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Get recent trades across all symbols
+        
+        Symbols are queried concurrently under the request weight limit
+        (MY_TRADES_WEIGHT each, so about one symbol per second).
+        
+        Args:
+            symbols: Only query these pairs (default: every exchange symbol)
+        """
         try:
-            # Get all trading pairs
-            exchange_info = self.client.get_exchange_info()
-            symbols = [s['symbol'] for s in exchange_info['symbols']]
+            if symbols is None:
+                # Get all trading pairs
+                exchange_info = self.client.get_exchange_info()
+                symbols = [s['symbol'] for s in exchange_info['symbols']]
             
-            all_trades = []
-            for symbol in symbols:
-                try:
-                    trades = self.get_trades(symbol, limit=10)
-                    all_trades.extend(trades)
-                except:
-                    pass  # Skip symbols with no trades
+            with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+                results = executor.map(partial(self.get_trades, limit=10), symbols)
+                all_trades = [t for trades in results for t in trades]
             
             # Sort by timestamp
             all_trades.sort(key=lambda x: x['timestamp'], reverse=True)
             
-            self.logger.info(f"✅ Fetched {len(all_trades)} trades")
+            self.logger.info("✅ Fetched %s trades from %s symbols", len(all_trades), len(symbols))
             return all_trades
+        except BinanceAPIException as e:
+            if e.status_code in RATE_LIMIT_STATUS:
+                raise
+            self.logger.exception("❌ Error fetching all trades: %s", e)
+            return []
         except Exception as e:
-            self.logger.error(f"❌ Error fetching all trades: {str(e)}")
+            self.logger.exception("❌ Error fetching all trades: %s", e)
             return []
 
+    def _weighted_call(self, weight: int, method, **params):
+        """
+        Call a client method once the weight budget allows it
+        
+        On 429/418 every thread waits for Retry-After (or an exponential
+        backoff) before the call is retried; the error is raised once
+        MAX_RATE_LIMIT_RETRIES is used up.
+        """
+        for attempt in range(MAX_RATE_LIMIT_RETRIES + 1):
+            self._rate_limiter.acquire(weight)
+            try:
+                return method(**params)
+            except BinanceAPIException as e:
+                if e.status_code not in RATE_LIMIT_STATUS or attempt == MAX_RATE_LIMIT_RETRIES:
+                    raise
+                retry_after = getattr(e.response, "headers", {}).get("Retry-After")
+                delay = float(retry_after) if retry_after else 2.0 ** (attempt + 1)
+                self.logger.warning("⏳ Binance rate limit (%s), retrying in %ss", e.status_code, delay)
+                self._rate_limiter.pause(delay)
+
     def get_price(self, symbol: str) -> Optional[str]:
         """Get current price for symbol"""
         try:
@@ -233,14 +342,31 @@ class BinanceRealConnector:
             ticker = self.client.get_ticker(symbol=symbol)
             return ticker['lastPrice']
         except Exception as e:
-            self.logger.error(f"❌ Error fetching price: {str(e)}")
+            self.logger.exception("❌ Error fetching price: %s", e)
             return None
 
     def get_all_prices(self) -> Dict[str, str]:
-        """Get all trading pair prices"""
+        """Get all trading pair prices (cached for a few seconds)"""
+        if (self._all_prices_cache and
+                time.time() - self._all_prices_timestamp < self._all_prices_ttl):
+            return self._all_prices_cache
+        
         try:
             prices = self.client.get_all_tickers()
-            return {p['symbol']: p['price'] for p in prices}
+            self._all_prices_cache = {p['symbol']: p['price'] for p in prices}
+            self._all_prices_timestamp = time.time()
+            return self._all_prices_cache
         except Exception as e:
-            self.logger.error(f"❌ Error fetching prices: {str(e)}")
+            self.logger.exception("❌ Error fetching prices: %s", e)
             return {}
+
+    def invalidate_account(self) -> None:
+        """Drop the cached account so the next call hits the API"""
+        self._account_cache = None
+        self._account_timestamp = 0.0
+        self._balance_dict = {}
+
+    def invalidate_prices(self) -> None:
+        """Drop cached prices so the next call hits the API"""
+        self._all_prices_cache = {}
+        self._all_prices_timestamp = 0.0
@@ -8,13 +8,25 @@ Bitcoin blockchain monitoring via Blockchain.com or similar API.
 """
 
 import asyncio
+import json
 import logging
+from itertools import islice
 from typing import Dict, List, Optional, Any
 from decimal import Decimal
 import aiohttp
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Decode raw response bytes directly, with orjson when available
+_json_loads = orjson.loads if orjson is not None else json.loads
+
 logger = logging.getLogger(__name__)
 
+SATOSHIS_PER_BTC = Decimal(100_000_000)
+
 
 class BitcoinConnector:
     """Bitcoin blockchain connector"""
@@ -23,70 +35,108 @@ class BitcoinConnector:
         """Initialize Bitcoin connector"""
         self.base_url = "https://blockchain.info"
         self.logger = logging.getLogger("connector.bitcoin")
+        self._session: Optional[aiohttp.ClientSession] = None
+    
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Get the shared HTTP session (keep-alive pool), creating it on first use"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=100,
+                    limit_per_host=20,
+                    ttl_dns_cache=300,
+                    keepalive_timeout=30
+                )
+            )
+        return self._session
+    
+    async def close(self):
+        """Close the shared HTTP session"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
     
     async def validate_connection(self) -> bool:
         """Validate connection"""
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(f"{self.base_url}/ticker") as resp:
-                    if resp.status == 200:
-                        self.logger.info("✅ Bitcoin API connection validated")
-                        return True
-                    else:
-                        self.logger.error(f"❌ Bitcoin API error: {resp.status}")
-                        return False
+            session = await self._get_session()
+            async with session.get(f"{self.base_url}/ticker") as resp:
+                if resp.status == 200:
+                    self.logger.info("✅ Bitcoin API connection validated")
+                    return True
+                else:
+                    self.logger.error("❌ Bitcoin API error: %s", resp.status)
+                    return False
         except Exception as e:
-            self.logger.error(f"❌ Connection error: {str(e)}")
+            self.logger.exception("❌ Connection error: %s", e)
             return False
     
-    async def get_balance(self, address: str) -> Dict[str, Any]:
-        """Get Bitcoin address balance"""
+    async def _fetch_multiaddr(self, addresses: List[str], limit: int = 0) -> Dict[str, Any]:
+        """Fetch balances and recent transactions for several addresses in one call"""
+        session = await self._get_session()
+        params = {"active": "|".join(addresses), "n": limit}
+        async with session.get(f"{self.base_url}/multiaddr", params=params) as resp:
+            if resp.status == 200:
+                return _json_loads(await resp.read())
+            raise Exception(f"API error: {resp.status}")
+    
+    async def get_balances(self, addresses: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Get balances for several Bitcoin addresses with a single request"""
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(f"{self.base_url}/q/addressbalance/{address}") as resp:
-                    if resp.status == 200:
-                        balance_satoshi = int(await resp.text())
-                        balance_btc = balance_satoshi / 100_000_000
-                        
-                        self.logger.info(f"✅ Balance for {address[:10]}...: {balance_btc} BTC")
-                        
-                        return {
-                            "address": address,
-                            "balance_satoshi": balance_satoshi,
-                            "balance_btc": str(Decimal(balance_btc))
-                        }
-                    else:
-                        raise Exception(f"API error: {resp.status}")
+            data = await self._fetch_multiaddr(addresses)
+            
+            balances = {}
+            
+            for entry in data.get('addresses', []):
+                balance_satoshi = int(entry.get('final_balance', 0))
+                balance_btc = Decimal(balance_satoshi) / SATOSHIS_PER_BTC
+                
+                balances[entry['address']] = {
+                    "address": entry['address'],
+                    "balance_satoshi": balance_satoshi,
+                    "balance_btc": str(balance_btc)
+                }
+            
+            self.logger.info("✅ Fetched balances for %s addresses", len(balances))
+            return balances
         except Exception as e:
-            self.logger.error(f"❌ Error fetching balance: {str(e)}")
+            self.logger.error("❌ Error fetching balances: %s", e)
             raise
     
-    async def get_transactions(self, address: str, limit: int = 100) -> List[Dict[str, Any]]:
-        """Get Bitcoin address transactions"""
+    async def get_balance(self, address: str) -> Dict[str, Any]:
+        """Get Bitcoin address balance"""
+        balances = await self.get_balances([address])
+        if address not in balances:
+            raise Exception(f"No balance returned for {address}")
+        return balances[address]
+    
+    async def get_transactions_batch(
+        self,
+        addresses: List[str],
+        limit: int = 100
+    ) -> List[Dict[str, Any]]:
+        """Get the combined transaction history of several Bitcoin addresses"""
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    f"{self.base_url}/address/{address}?format=json"
-                ) as resp:
-                    if resp.status == 200:
-                        data = await resp.json()
-                        
-                        transactions = []
-                        
-                        for tx in data.get('txs', [])[:limit]:
-                            transactions.append({
-                                "tx_hash": tx['hash'],
-                                "time": tx['time'],
-                                "input_count": len(tx.get('inputs', [])),
-                                "output_count": len(tx.get('outputs', [])),
-                                "fee": tx.get('fee'),
-                                "size": tx.get('size')
-                            })
-                        
-                        self.logger.info(f"✅ Fetched {len(transactions)} transactions")
-                        return transactions
-                    else:
-                        raise Exception(f"API error: {resp.status}")
+            data = await self._fetch_multiaddr(addresses, limit)
+            
+            transactions = [
+                {
+                    "tx_hash": tx['hash'],
+                    "time": tx['time'],
+                    "input_count": len(tx.get('inputs', ())),
+                    "output_count": len(tx.get('out', ())),
+                    "fee": tx.get('fee'),
+                    "size": tx.get('size')
+                }
+                for tx in islice(data.get('txs') or (), limit)
+            ]
+            
+            self.logger.info("✅ Fetched %s transactions", len(transactions))
+            return transactions
         except Exception as e:
-            self.logger.error(f"❌ Error fetching transactions: {str(e)}")
+            self.logger.exception("❌ Error fetching transactions: %s", e)
             return []
+    
+    async def get_transactions(self, address: str, limit: int = 100) -> List[Dict[str, Any]]:
+        """Get Bitcoin address transactions"""
+        return await self.get_transactions_batch([address], limit)
@@ -9,37 +9,56 @@ Support for Ethereum, Base, Arbitrum, Polygon.
 
 import asyncio
 import logging
-from typing import Dict, List, Optional, Any
+import math
+import random
+import time
+from typing import Dict, List, Optional, Any, Tuple
 from decimal import Decimal
+from eth_abi import decode as abi_decode
 from web3 import Web3
 from eth_account import Account
+import aiohttp
+import numpy as np
+
+from src.api.base_connector import create_retry_session
+from src.api.connectors.blockchains.evm_rpc import (
+    MULTICALL3_ADDRESS,
+    checksum_address as _checksum,
+    read_contracts,
+)
+from src.api.connectors.blockchains.token_cache import TokenMetadataCache, get_token_cache
 
 logger = logging.getLogger(__name__)
 
-# Standard ERC20 ABI
-ERC20_ABI = [
-    {
-        "inputs": [{"name": "account", "type": "address"}],
-        "name": "balanceOf",
-        "outputs": [{"name": "balance", "type": "uint256"}],
-        "type": "function",
-        "stateMutability": "view"
-    },
-    {
-        "inputs": [],
-        "name": "decimals",
-        "outputs": [{"name": "", "type": "uint8"}],
-        "type": "function",
-        "stateMutability": "view"
-    },
-    {
-        "inputs": [],
-        "name": "symbol",
-        "outputs": [{"name": "", "type": "string"}],
-        "type": "function",
-        "stateMutability": "view"
-    }
-]
+# Multicall3 helper that returns an address's native balance
+GET_ETH_BALANCE_SELECTOR = bytes(Web3.keccak(text="getEthBalance(address)")[:4])
+
+# ERC20 selectors, encoded by hand to skip web3's contract-function machinery
+BALANCE_OF_SELECTOR = bytes(Web3.keccak(text="balanceOf(address)")[:4])
+DECIMALS_SELECTOR = bytes(Web3.keccak(text="decimals()")[:4])
+SYMBOL_SELECTOR = bytes(Web3.keccak(text="symbol()")[:4])
+
+# Etherscan V2 multichain API (one key for every supported chain)
+ETHERSCAN_API_URL = "https://api.etherscan.io/v2/api"
+ETHERSCAN_PAGE_SIZE = 1000
+ETHERSCAN_MAX_RPS = 5  # free tier
+ETHERSCAN_MAX_RETRIES = 5
+
+
+class _AsyncRateLimiter:
+    """Space coroutine calls to at most `max_calls` per `period` seconds"""
+    
+    def __init__(self, max_calls: int, period: float = 1.0):
+        self._interval = period / max_calls
+        self._next_slot = 0.0
+    
+    async def acquire(self) -> None:
+        """Wait until the next call slot is available"""
+        now = time.monotonic()
+        wait = self._next_slot - now
+        self._next_slot = max(now, self._next_slot) + self._interval
+        if wait > 0:
+            await asyncio.sleep(wait)
 
 
 class EthereumConnector:
@@ -52,7 +71,21 @@ class EthereumConnector:
         "polygon": "https://polygon-mainnet.g.alchemy.com/v2/{key}",
     }
     
-    def __init__(self, network: str, rpc_url: str, alchemy_key: Optional[str] = None):
+    CHAIN_IDS = {
+        "ethereum": 1,
+        "arbitrum": 42161,
+        "base": 8453,
+        "polygon": 137,
+    }
+    
+    def __init__(
+        self,
+        network: str,
+        rpc_url: str,
+        alchemy_key: Optional[str] = None,
+        token_cache: Optional[TokenMetadataCache] = None,
+        etherscan_api_key: Optional[str] = None
+    ):
         """
         Initialize Ethereum connector
         
@@ -60,24 +93,54 @@ class EthereumConnector:
             network: Network name (ethereum, arbitrum, base, polygon)
             rpc_url: RPC URL
             alchemy_key: Alchemy API key (optional, for rate limiting)
+            token_cache: Persistent token metadata cache (default: the shared one)
+            etherscan_api_key: Etherscan API key (optional, for transaction history)
         """
         self.network = network
         self.rpc_url = rpc_url
-        self.w3 = Web3(Web3.HTTPProvider(rpc_url))
+        # Pooled keep-alive session for Web3's own calls; batched contract
+        # reads go through evm_rpc.read_contracts on the shared async client
+        self.session = create_retry_session(
+            allowed_methods=frozenset({"GET", "POST"}),
+            pool_maxsize=100
+        )
+        self.w3 = Web3(Web3.HTTPProvider(rpc_url, session=self.session))
+        # (symbol, decimals) per token contract - immutable, cached forever,
+        # in memory and on disk so restarts don't refetch them
+        self._token_meta: Dict[str, Tuple[str, int]] = {}
+        self._token_cache = token_cache or get_token_cache()
+        self.etherscan_api_key = etherscan_api_key
+        self._http: Optional[aiohttp.ClientSession] = None
+        self._etherscan_limiter = _AsyncRateLimiter(ETHERSCAN_MAX_RPS)
         self.logger = logging.getLogger(f"connector.eth.{network}")
     
+    async def _get_http(self) -> aiohttp.ClientSession:
+        """Get the shared explorer HTTP session, creating it on first use"""
+        if self._http is None or self._http.closed:
+            self._http = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=10, ttl_dns_cache=300)
+            )
+        return self._http
+    
+    async def close(self):
+        """Close HTTP sessions"""
+        if self._http is not None and not self._http.closed:
+            await self._http.close()
+        self._http = None
+        self.session.close()
+    
     async def validate_connection(self) -> bool:
         """Validate connection"""
         try:
             is_connected = self.w3.is_connected()
             if is_connected:
                 latest_block = self.w3.eth.block_number
-                self.logger.info(f"✅ {self.network} connected. Latest block: {latest_block}")
+                self.logger.info("✅ %s connected. Latest block: %s", self.network, latest_block)
             else:
-                self.logger.error(f"❌ {self.network} connection failed")
+                self.logger.error("❌ %s connection failed", self.network)
             return is_connected
         except Exception as e:
-            self.logger.error(f"❌ Connection error: {str(e)}")
+            self.logger.exception("❌ Connection error: %s", e)
             return False
     
     async def get_balance(self, address: str) -> Decimal:
@@ -86,74 +149,272 @@ class EthereumConnector:
             if not Web3.is_address(address):
                 raise ValueError(f"Invalid address: {address}")
             
-            balance_wei = self.w3.eth.get_balance(Web3.to_checksum_address(address))
+            balance_wei = self.w3.eth.get_balance(_checksum(address))
             balance_eth = Web3.from_wei(balance_wei, 'ether')
             
-            self.logger.info(f"✅ Balance for {address[:10]}...: {balance_eth} {self.network.upper()}")
+            self.logger.info("✅ Balance for %s...: %s %s", address[:10], balance_eth, self.network.upper())
             return balance_eth
         except Exception as e:
-            self.logger.error(f"❌ Error fetching balance: {str(e)}")
+            self.logger.error("❌ Error fetching balance: %s", e)
             raise
     
     async def get_token_balance(self, address: str, token_address: str) -> Dict[str, Any]:
         """Get ERC20 token balance"""
         try:
-            address = Web3.to_checksum_address(address)
-            token_address = Web3.to_checksum_address(token_address)
+            address = _checksum(address)
+            token_address = _checksum(token_address)
             
-            contract = self.w3.eth.contract(address=token_address, abi=ERC20_ABI)
-            
-            # Get decimals and symbol
-            decimals = contract.functions.decimals().call()
-            symbol = contract.functions.symbol().call()
+            # Get decimals and symbol (immutable per contract)
+            meta = self._get_token_meta(token_address)
+            if meta is None:
+                meta = self._set_token_meta(
+                    token_address,
+                    self._decode_symbol(self._call(token_address, SYMBOL_SELECTOR)),
+                    int.from_bytes(self._call(token_address, DECIMALS_SELECTOR), "big")
+                )
+            symbol, decimals = meta
             
             # Get balance
-            balance_raw = contract.functions.balanceOf(address).call()
-            balance = balance_raw / (10 ** decimals)
+            balance_raw = int.from_bytes(
+                self._call(token_address, BALANCE_OF_SELECTOR + self._encode_address(address)),
+                "big"
+            )
+            balance = Decimal(balance_raw) / Decimal(10 ** decimals)
             
             return {
                 "symbol": symbol,
-                "balance": str(Decimal(balance)),
+                "balance": str(balance),
                 "decimals": decimals,
                 "token_address": token_address
             }
         except Exception as e:
-            self.logger.error(f"❌ Error fetching token balance: {str(e)}")
+            self.logger.error("❌ Error fetching token balance: %s", e)
             raise
     
     async def get_transactions(self, address: str, limit: int = 100) -> List[Dict[str, Any]]:
-        """Get transaction history"""
+        """
+        Get transaction history from Etherscan
+        
+        All ceil(limit / 1000) pages are requested concurrently, paced to
+        the free-tier rate limit and retried with backoff when throttled.
+        """
         try:
-            address = Web3.to_checksum_address(address)
+            address = _checksum(address)
+            
+            if not self.etherscan_api_key:
+                self.logger.warning("Etherscan API key not configured, no transaction history")
+                return []
             
-            # Get all transactions to address
+            pages = math.ceil(limit / ETHERSCAN_PAGE_SIZE)
+            offset = min(limit, ETHERSCAN_PAGE_SIZE)
+            results = await asyncio.gather(*[
+                self._fetch_etherscan_page(address, page, offset)
+                for page in range(1, pages + 1)
+            ])
+            
+            # Pages can overlap if new transactions land mid-fetch
+            seen = set()
             transactions = []
+            for tx in (tx for page in results for tx in page):
+                if tx['hash'] in seen:
+                    continue
+                seen.add(tx['hash'])
+                transactions.append({
+                    "tx_hash": tx['hash'],
+                    "block_number": int(tx['blockNumber']),
+                    "time": int(tx['timeStamp']),
+                    "from": tx['from'],
+                    "to": tx['to'],
+                    "value": str(Web3.from_wei(int(tx['value']), 'ether')),
+                    "is_error": tx.get('isError') == "1"
+                })
             
-            # For production, use Etherscan API or similar
-            # This is simplified - implement with Etherscan/Blockscout
+            transactions.sort(key=lambda t: t['block_number'], reverse=True)
+            transactions = transactions[:limit]
             
-            self.logger.info(f"✅ Fetched transaction history for {address[:10]}...")
+            self.logger.info("✅ Fetched %s transactions for %s...", len(transactions), address[:10])
             return transactions
         except Exception as e:
-            self.logger.error(f"❌ Error fetching transactions: {str(e)}")
+            self.logger.exception("❌ Error fetching transactions: %s", e)
             return []
     
+    async def _fetch_etherscan_page(self, address: str, page: int, offset: int) -> List[Dict[str, Any]]:
+        """Fetch one page of normal transactions, retrying on rate limits"""
+        params = {
+            "chainid": self.CHAIN_IDS.get(self.network, 1),
+            "module": "account",
+            "action": "txlist",
+            "address": address,
+            "page": page,
+            "offset": offset,
+            "sort": "desc",
+            "apikey": self.etherscan_api_key,
+        }
+        session = await self._get_http()
+        
+        for attempt in range(ETHERSCAN_MAX_RETRIES):
+            await self._etherscan_limiter.acquire()
+            async with session.get(ETHERSCAN_API_URL, params=params) as resp:
+                if resp.status == 429 or resp.status >= 500:
+                    data = None
+                else:
+                    resp.raise_for_status()
+                    data = await resp.json(content_type=None)
+            
+            if data is not None:
+                result = data.get('result')
+                if isinstance(result, list):
+                    return result
+                # Etherscan reports throttling as status "0" with a text result
+                if "rate limit" not in str(result).lower():
+                    raise Exception(f"Etherscan error: {data.get('message')} - {result}")
+            
+            await asyncio.sleep(2 ** attempt + random.random())
+        
+        raise Exception(f"Etherscan page {page} still throttled after {ETHERSCAN_MAX_RETRIES} attempts")
+    
+    def _get_token_meta(self, token: str) -> Optional[Tuple[str, int]]:
+        """Get cached (symbol, decimals), checking memory then disk"""
+        meta = self._token_meta.get(token)
+        if meta is None:
+            meta = self._token_cache.get(self.network, token)
+            if meta is not None:
+                self._token_meta[token] = meta
+        return meta
+    
+    def _set_token_meta(self, token: str, symbol: str, decimals: int) -> Tuple[str, int]:
+        """Cache (symbol, decimals) in memory and on disk"""
+        meta = (symbol, decimals)
+        self._token_meta[token] = meta
+        self._token_cache.set(self.network, token, symbol, decimals)
+        return meta
+    
+    def _call(self, to: str, data: bytes) -> bytes:
+        """Single raw eth_call against the latest block"""
+        return bytes(self.w3.eth.call({"to": to, "data": data}))
+    
+    @staticmethod
+    def _encode_address(address: str) -> bytes:
+        """ABI-encode an address argument (left-padded to 32 bytes)"""
+        return bytes.fromhex(address[2:]).rjust(32, b"\x00")
+    
+    @staticmethod
+    def _decode_symbol(raw: bytes) -> str:
+        """Decode ERC20 symbol() (string, or bytes32 for legacy tokens)"""
+        try:
+            return abi_decode(["string"], raw)[0]
+        except Exception:
+            return raw[:32].rstrip(b"\x00").decode("utf-8", errors="ignore")
+    
+    async def _read_balances(
+        self,
+        address: str,
+        token_addresses: List[str]
+    ) -> Tuple[int, List[Tuple[str, Optional[int]]]]:
+        """
+        Read native and token balances in base units
+        
+        Native balance, every balanceOf and any missing decimals/symbol
+        lookups are aggregated into one Multicall3 eth_call (1 RTT instead
+        of 3N+1), through the same evm_rpc.read_contracts path as the DeFi
+        connectors. Token metadata is cached, so later refreshes only
+        multicall the balances.
+        
+        Returns:
+            (native wei, [(token, raw balance or None if unreadable), ...])
+        """
+        if not Web3.is_address(address):
+            raise ValueError(f"Invalid address: {address}")
+        
+        address = _checksum(address)
+        tokens = [_checksum(t) for t in token_addresses]
+        unknown = [t for t in dict.fromkeys(tokens) if self._get_token_meta(t) is None]
+        
+        encoded_address = self._encode_address(address)
+        balance_of = BALANCE_OF_SELECTOR + encoded_address
+        
+        calls = [(MULTICALL3_ADDRESS, GET_ETH_BALANCE_SELECTOR + encoded_address)]
+        calls += [(t, balance_of) for t in tokens]
+        for t in unknown:
+            calls += [(t, DECIMALS_SELECTOR), (t, SYMBOL_SELECTOR)]
+        
+        results = await read_contracts(self.w3, calls)
+        
+        native = results[0]
+        native_wei = (
+            int.from_bytes(native, "big") if native is not None
+            else self.w3.eth.get_balance(address)
+        )
+        
+        meta_results = results[1 + len(tokens):]
+        for i, token in enumerate(unknown):
+            decimals_raw, symbol_raw = meta_results[2 * i], meta_results[2 * i + 1]
+            if decimals_raw is not None and symbol_raw is not None:
+                self._set_token_meta(
+                    token,
+                    self._decode_symbol(symbol_raw),
+                    int.from_bytes(decimals_raw, "big")
+                )
+        
+        token_balances = []
+        for token, raw in zip(tokens, results[1:1 + len(tokens)]):
+            if raw is None or token not in self._token_meta:
+                self.logger.warning("Failed to fetch %s", token)
+                token_balances.append((token, None))
+            else:
+                token_balances.append((token, int.from_bytes(raw, "big")))
+        
+        return native_wei, token_balances
+    
     async def get_all_balances(self, address: str, token_addresses: List[str]) -> Dict[str, Any]:
-        """Get all token balances for address"""
+        """Get all token balances for address (see _read_balances)"""
         try:
+            native_wei, token_balances = await self._read_balances(address, token_addresses)
+            
             balances = {
-                "native": str(await self.get_balance(address))
+                "native": str(Web3.from_wei(native_wei, 'ether'))
             }
-            
-            for token in token_addresses:
-                try:
-                    token_balance = await self.get_token_balance(address, token)
-                    balances[token_balance['symbol']] = token_balance['balance']
-                except Exception as e:
-                    self.logger.warning(f"Failed to fetch {token}: {str(e)}")
+            for token, raw in token_balances:
+                if raw is None:
                     continue
+                symbol, decimals = self._token_meta[token]
+                balances[symbol] = str(Decimal(raw) / Decimal(10 ** decimals))
             
             return balances
         except Exception as e:
-            self.logger.error(f"❌ Error fetching all balances: {str(e)}")
+            self.logger.error("❌ Error fetching all balances: %s", e)
+            raise
+    
+    async def get_all_balances_soa(self, address: str, token_addresses: List[str]) -> Dict[str, Any]:
+        """
+        Get all token balances for address as columnar arrays
+        
+        Same reads as get_all_balances, laid out for vectorised valuation:
+        ``raw / 10.0 ** decimals * prices`` prices the whole portfolio in
+        one numpy expression. Unreadable tokens are left out.
+        
+        Returns:
+            {
+                "native": "1.5",
+                "symbols": ["USDC", ...],
+                "token_addresses": ["0x...", ...],
+                "raw": np.ndarray[float64],    # base units (uint256 overflows int64)
+                "decimals": np.ndarray[uint8]  # ERC20 decimals is a uint8
+            }
+        """
+        try:
+            native_wei, token_balances = await self._read_balances(address, token_addresses)
+            
+            readable = [(token, raw) for token, raw in token_balances if raw is not None]
+            metas = [self._token_meta[token] for token, _ in readable]
+            
+            return {
+                "native": str(Web3.from_wei(native_wei, 'ether')),
+                "symbols": [symbol for symbol, _ in metas],
+                "token_addresses": [token for token, _ in readable],
+                "raw": np.array([raw for _, raw in readable], dtype=np.float64),
+                "decimals": np.array([decimals for _, decimals in metas], dtype=np.uint8)
+            }
+        except Exception as e:
+            self.logger.error("❌ Error fetching all balances: %s", e)
             raise
@@ -0,0 +1,121 @@
+# src/api/connectors/blockchains/evm_rpc.py
+
+"""
+EVM JSON-RPC helpers
+====================
+
+Address checksumming, Multicall3 and batch JSON-RPC against a Web3
+HTTPProvider endpoint. This is the only Multicall3 implementation: the
+Ethereum, Uniswap and Aave connectors all read contracts through
+read_contracts, so they share one fallback behaviour. Batch requests go
+through the shared async (HTTP/2) client rather than the provider's
+blocking session.
+"""
+
+import logging
+from functools import lru_cache
+from typing import Any, List, Optional, Tuple
+
+from eth_abi import decode as abi_decode, encode as abi_encode
+from web3 import Web3
+
+from src.api.connectors.http_client import DEFAULT_BATCH_SIZE, json_rpc, json_rpc_batch
+
+logger = logging.getLogger(__name__)
+
+# Multicall3 is deployed at the same address on every supported network
+MULTICALL3_ADDRESS = "0xcA11bde05977b3631167028862bE2a173976CA11"
+AGGREGATE3_SELECTOR = bytes(Web3.keccak(text="aggregate3((address,bool,bytes)[])")[:4])
+
+
+@lru_cache(maxsize=4096)
+def checksum_address(address: str) -> str:
+    """EIP-55 checksum an address, memoised to skip the keccak on repeat lookups"""
+    return Web3.to_checksum_address(address)
+
+
+def eth_call(to: str, data: bytes) -> Tuple[str, list]:
+    """Build an eth_call entry for rpc_batch"""
+    return ("eth_call", [{"to": to, "data": "0x" + data.hex()}, "latest"])
+
+
+def decode_call_result(result: Optional[str]) -> Optional[bytes]:
+    """Convert an eth_call hex result to bytes (None when empty or failed)"""
+    if result in (None, "0x"):
+        return None
+    return bytes.fromhex(result[2:])
+
+
+def _provider_target(w3: Web3) -> Tuple[str, Optional[dict]]:
+    """Endpoint URL and extra headers of the Web3 HTTPProvider"""
+    provider = w3.provider
+    headers = getattr(provider, "_request_kwargs", {}).get("headers")
+    return str(provider.endpoint_uri), headers
+
+
+async def rpc_batch(
+    w3: Web3,
+    calls: List[Tuple[str, list]],
+    batch_size: int = DEFAULT_BATCH_SIZE
+) -> List[Optional[Any]]:
+    """
+    Send JSON-RPC calls to the provider's endpoint as batch requests
+
+    Args:
+        w3: Web3 instance backed by an HTTPProvider
+        calls: List of (method, params) tuples
+        batch_size: Maximum calls per batch request
+
+    Returns:
+        Results in the same order as calls (None for failed calls)
+    """
+    url, headers = _provider_target(w3)
+    return await json_rpc_batch(url, calls, batch_size, headers)
+
+
+async def multicall(w3: Web3, calls: List[Tuple[str, bytes]]) -> List[Optional[bytes]]:
+    """
+    Execute read-only calls through Multicall3 aggregate3 (one eth_call)
+
+    Args:
+        w3: Web3 instance backed by an HTTPProvider
+        calls: List of (target, calldata) tuples
+
+    Returns:
+        Return data per call (None for reverted calls)
+    """
+    if not calls:
+        return []
+
+    data = AGGREGATE3_SELECTOR + abi_encode(
+        ["(address,bool,bytes)[]"],
+        [[(target, True, calldata) for target, calldata in calls]]
+    )
+    url, headers = _provider_target(w3)
+    method, params = eth_call(MULTICALL3_ADDRESS, data)
+    raw = decode_call_result(await json_rpc(url, method, params, headers))
+    if raw is None:
+        raise ValueError("Multicall3 returned no data")
+
+    results = abi_decode(["(bool,bytes)[]"], raw)[0]
+    return [ret if ok and ret else None for ok, ret in results]
+
+
+async def read_contracts(
+    w3: Web3,
+    calls: List[Tuple[str, bytes]],
+    batch_size: int = DEFAULT_BATCH_SIZE
+) -> List[Optional[bytes]]:
+    """
+    Execute read-only calls in a single round trip
+
+    Uses Multicall3 and falls back to batch JSON-RPC on chains where it
+    is not available.
+    """
+    try:
+        return await multicall(w3, calls)
+    except Exception as e:
+        logger.warning("Multicall3 failed, using batch RPC: %s", e)
+
+    results = await rpc_batch(w3, [eth_call(target, calldata) for target, calldata in calls], batch_size)
+    return [decode_call_result(r) for r in results]
@@ -9,76 +9,251 @@ Solana blockchain integration.
 
 import asyncio
 import logging
-from typing import Dict, List, Optional, Any
+from functools import lru_cache
+from typing import Awaitable, Callable, Dict, List, Optional, Any
 from decimal import Decimal
 
-try:
-    from solders.pubkey import Pubkey
-    from solders.rpc.responses import GetBalanceResp
-    from solana.rpc.async_api import AsyncClient
-except ImportError:
-    Pubkey = None
-    AsyncClient = None
+import aiohttp
+
+from src.api.connectors.http_client import get_ws_session, json_rpc, json_rpc_batch
+
+# solders is imported by the first connector built (see _load_solders);
+# without it addresses are passed to the RPC unvalidated
+Pubkey = None
+_solders_checked = False
 
 logger = logging.getLogger(__name__)
 
+LAMPORTS_PER_SOL = Decimal(1_000_000_000)
+
+
+def _load_solders():
+    """Import solders on first use (None if not installed)"""
+    global Pubkey, _solders_checked
+    if not _solders_checked:
+        _solders_checked = True
+        try:
+            from solders.pubkey import Pubkey as _Pubkey
+            Pubkey = _Pubkey
+        except ImportError:
+            logger.debug("solders not installed, skipping address validation")
+    return Pubkey
+
+
+@lru_cache(maxsize=4096)
+def _pk(address: str) -> "Pubkey":
+    """Parse a base58 public key, memoised so polled addresses are decoded once"""
+    return Pubkey.from_string(address)
+
 
 class SolanaConnector:
     """Solana blockchain connector"""
     
-    def __init__(self, rpc_url: str = "https://api.mainnet-beta.solana.com"):
+    # Reconnect backoff for balance subscriptions
+    WS_RECONNECT_MAX_DELAY = 30  # seconds
+    
+    def __init__(
+        self,
+        rpc_url: str = "https://api.mainnet-beta.solana.com",
+        batch_size: int = 100,
+        ws_url: Optional[str] = None
+    ):
         """
         Initialize Solana connector
         
         Args:
             rpc_url: Solana RPC endpoint
+            batch_size: Maximum calls per JSON-RPC batch request
+            ws_url: Websocket endpoint (default: derived from rpc_url)
         """
-        if not AsyncClient:
-            raise ImportError("solana library not installed. pip install solana")
-        
+        _load_solders()
         self.rpc_url = rpc_url
-        self.client = AsyncClient(rpc_url)
+        self.batch_size = batch_size
+        self.ws_url = ws_url or rpc_url.replace("https://", "wss://", 1).replace("http://", "ws://", 1)
+        # Balances pushed by watch_balance subscriptions, kept while they are live
+        self._live_balances: Dict[str, Dict[str, Any]] = {}
         self.logger = logging.getLogger("connector.solana")
     
+    async def _rpc(self, method: str, params: Optional[list] = None) -> Any:
+        """Send a JSON-RPC request over the shared HTTP/2 client"""
+        return await json_rpc(self.rpc_url, method, params)
+    
+    @staticmethod
+    def _validate_address(address: str) -> None:
+        """Reject malformed base58 public keys (when solders is available)"""
+        if Pubkey is not None:
+            _pk(address)
+    
+    @staticmethod
+    def _balance_entry(address: str, balance_lamports: int) -> Dict[str, Any]:
+        """Build the balance dict returned by the balance methods"""
+        return {
+            "address": address,
+            "balance_lamports": balance_lamports,
+            "balance_sol": str(Decimal(balance_lamports) / LAMPORTS_PER_SOL)
+        }
+    
     async def validate_connection(self) -> bool:
         """Validate connection"""
         try:
-            health = await self.client.get_cluster_nodes()
-            if health:
+            health = await self._rpc("getHealth")
+            if health == "ok":
                 self.logger.info("✅ Solana connection validated")
                 return True
             else:
                 self.logger.error("❌ Solana connection failed")
                 return False
         except Exception as e:
-            self.logger.error(f"❌ Connection error: {str(e)}")
+            self.logger.exception("❌ Connection error: %s", e)
             return False
     
+    async def get_balances(self, addresses: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Get SOL balances for several addresses (one batch request per `batch_size`)"""
+        try:
+            for address in addresses:
+                self._validate_address(address)
+            
+            results = await json_rpc_batch(
+                self.rpc_url,
+                [("getBalance", [a]) for a in addresses],
+                self.batch_size
+            )
+            
+            balances = {}
+            for address, response in zip(addresses, results):
+                if response is None:
+                    self.logger.warning("Failed to fetch balance for %s...", address[:10])
+                    continue
+                
+                balances[address] = self._balance_entry(address, response["value"])
+            
+            self.logger.info("✅ Fetched balances for %s addresses", len(balances))
+            return balances
+        except Exception as e:
+            self.logger.error("❌ Error fetching balances: %s", e)
+            raise
+    
     async def get_balance(self, address: str) -> Dict[str, Any]:
         """Get SOL balance"""
         try:
-            pubkey = Pubkey(address)
-            response = await self.client.get_balance(pubkey)
-            
-            balance_lamports = response.value
-            balance_sol = balance_lamports / 1_000_000_000
+            # Watched addresses are kept current by their subscription
+            live = self._live_balances.get(address)
+            if live is not None:
+                return live
             
-            self.logger.info(f"✅ Balance for {address[:10]}...: {balance_sol} SOL")
+            self._validate_address(address)
+            response = await self._rpc("getBalance", [address])
+            balance = self._balance_entry(address, response["value"])
             
-            return {
-                "address": address,
-                "balance_lamports": balance_lamports,
-                "balance_sol": str(Decimal(balance_sol))
-            }
+            self.logger.info("✅ Balance for %s...: %s SOL", address[:10], balance['balance_sol'])
+            return balance
         except Exception as e:
-            self.logger.error(f"❌ Error fetching balance: {str(e)}")
+            self.logger.error("❌ Error fetching balance: %s", e)
             raise
     
+    async def watch_balance(
+        self,
+        address: str,
+        callback: Optional[Callable[[Dict[str, Any]], Awaitable[None]]] = None
+    ) -> None:
+        """
+        Follow an address's SOL balance over a websocket accountSubscribe
+        
+        The balance is seeded with getBalance once the subscription is
+        confirmed, then every notification refreshes the balance served by
+        get_balance, so watched addresses need no polling. Reconnects with
+        backoff if the socket drops; runs until the task is cancelled.
+        
+        Args:
+            address: Solana address
+            callback: Coroutine called with the balance dict on each update (optional)
+        
+        Raises:
+            Exception: If the node rejects the subscription
+        """
+        self._validate_address(address)
+        subscribe = {
+            "jsonrpc": "2.0",
+            "id": 1,
+            "method": "accountSubscribe",
+            "params": [address, {"encoding": "base64", "commitment": "confirmed"}]
+        }
+        delay = 1
+        
+        try:
+            while True:
+                try:
+                    async with get_ws_session().ws_connect(self.ws_url, heartbeat=30) as ws:
+                        await ws.send_json(subscribe)
+                        await self._confirm_subscription(ws)
+                        self.logger.info("👀 Watching %s...", address[:10])
+                        delay = 1
+                        
+                        # Seed after subscribing so no change falls in between;
+                        # slots keep a late getBalance from overwriting a newer update
+                        last_slot = 0
+                        try:
+                            seed = await self._rpc("getBalance", [address, {"commitment": "confirmed"}])
+                        except Exception as e:
+                            self.logger.warning("Could not seed balance for %s...: %s", address[:10], e)
+                        else:
+                            last_slot = seed["context"]["slot"]
+                            await self._publish_balance(address, seed["value"], callback)
+                        
+                        async for msg in ws:
+                            if msg.type != aiohttp.WSMsgType.TEXT:
+                                break
+                            data = msg.json()
+                            if data.get("method") != "accountNotification":
+                                continue
+                            
+                            result = data["params"]["result"]
+                            if result["context"]["slot"] < last_slot:
+                                continue
+                            last_slot = result["context"]["slot"]
+                            await self._publish_balance(address, result["value"]["lamports"], callback)
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    self.logger.warning("Balance subscription for %s... dropped: %s", address[:10], e)
+                
+                # Updates may be missed while disconnected: stop serving the cached value
+                self._live_balances.pop(address, None)
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.WS_RECONNECT_MAX_DELAY)
+        finally:
+            self._live_balances.pop(address, None)
+    
+    async def _confirm_subscription(self, ws: aiohttp.ClientWebSocketResponse) -> None:
+        """Wait for the accountSubscribe reply and raise if the node rejected it"""
+        msg = await ws.receive(timeout=30)
+        if msg.type != aiohttp.WSMsgType.TEXT:
+            raise aiohttp.ClientConnectionError("socket closed before the subscription reply")
+        reply = msg.json()
+        if "error" in reply:
+            raise Exception(f"accountSubscribe failed: {reply['error'].get('message')}")
+    
+    async def _publish_balance(
+        self,
+        address: str,
+        lamports: int,
+        callback: Optional[Callable[[Dict[str, Any]], Awaitable[None]]]
+    ) -> None:
+        """Store a watched balance and hand it to the callback"""
+        balance = self._balance_entry(address, lamports)
+        self._live_balances[address] = balance
+        if callback is None:
+            return
+        try:
+            await callback(balance)
+        except Exception:
+            # A failing callback must not end the subscription
+            self.logger.exception("Balance callback for %s... failed", address[:10])
+    
     async def get_token_balance(self, address: str, token_mint: str) -> Dict[str, Any]:
         """Get SPL token balance"""
         try:
             # Implementation with spl-token library
-            pubkey = Pubkey(address)
+            self._validate_address(address)
+            self._validate_address(token_mint)
             
             # Get associated token account
             # Implementation details...
@@ -89,5 +264,5 @@ class SolanaConnector:
                 "balance": "0"
             }
         except Exception as e:
-            self.logger.error(f"❌ Error fetching token balance: {str(e)}")
+            self.logger.error("❌ Error fetching token balance: %s", e)
             raise
@@ -0,0 +1,109 @@
+# src/api/connectors/blockchains/token_cache.py
+
+"""
+Token Metadata Cache
+====================
+
+Persistent (symbol, decimals) store for token contracts, keyed by
+(chain, token address). Both values are immutable on-chain, so entries
+never expire and survive restarts.
+
+The file lives under data/ in the project root unless TOKEN_METADATA_DB
+points elsewhere; connectors share one instance through get_token_cache().
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Project root (this module lives in src/api/connectors/blockchains/)
+_PROJECT_ROOT = Path(__file__).resolve().parents[4]
+_DEFAULT_DB_PATH = _PROJECT_ROOT / "data" / "token_metadata.db"
+
+
+class TokenMetadataCache:
+    """SQLite-backed token metadata cache"""
+
+    def __init__(self, db_path: Optional[str] = None):
+        """
+        Initialize token metadata cache
+
+        Args:
+            db_path: Path to the SQLite file (created on first use).
+                Defaults to TOKEN_METADATA_DB, else data/token_metadata.db
+                under the project root - never relative to the working directory
+        """
+        self.db_path = Path(db_path or os.getenv("TOKEN_METADATA_DB") or _DEFAULT_DB_PATH)
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database and create the table on first use"""
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode = WAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS token_metadata (
+                    chain TEXT NOT NULL,
+                    token_address TEXT NOT NULL,
+                    symbol TEXT NOT NULL,
+                    decimals INTEGER NOT NULL,
+                    PRIMARY KEY (chain, token_address)
+                )
+                """
+            )
+            self._conn.commit()
+        return self._conn
+
+    def get(self, chain: str, token_address: str) -> Optional[Tuple[str, int]]:
+        """Get (symbol, decimals) for a token, or None if not cached"""
+        try:
+            with self._lock:
+                row = self._connect().execute(
+                    "SELECT symbol, decimals FROM token_metadata "
+                    "WHERE chain = ? AND token_address = ?",
+                    (chain, token_address)
+                ).fetchone()
+            return (row[0], row[1]) if row else None
+        except sqlite3.Error as e:
+            logger.warning("Token cache read failed: %s", e)
+            return None
+
+    def set(self, chain: str, token_address: str, symbol: str, decimals: int) -> None:
+        """Store (symbol, decimals) for a token"""
+        try:
+            with self._lock:
+                conn = self._connect()
+                conn.execute(
+                    "INSERT OR REPLACE INTO token_metadata "
+                    "(chain, token_address, symbol, decimals) VALUES (?, ?, ?, ?)",
+                    (chain, token_address, symbol, decimals)
+                )
+                conn.commit()
+        except sqlite3.Error as e:
+            logger.warning("Token cache write failed: %s", e)
+
+    def close(self) -> None:
+        """Close the database connection"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+_token_cache: Optional[TokenMetadataCache] = None
+
+
+def get_token_cache() -> TokenMetadataCache:
+    """Get or create the shared token metadata cache"""
+    global _token_cache
+    if _token_cache is None:
+        _token_cache = TokenMetadataCache()
+    return _token_cache
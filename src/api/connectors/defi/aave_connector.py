@@ -8,12 +8,24 @@ Support for Aave V2 and V3 lending positions.
 """
 
 import logging
-from typing import Dict, List, Optional, Any
+import time
+from typing import Dict, List, Optional, Any, Tuple
 from decimal import Decimal
+from eth_abi import decode as abi_decode, encode as abi_encode
 from web3 import Web3
 
+from src.api.connectors.blockchains.evm_rpc import (
+    DEFAULT_BATCH_SIZE,
+    checksum_address,
+    decode_call_result,
+    eth_call,
+    rpc_batch,
+)
+
 logger = logging.getLogger(__name__)
 
+GET_USER_ACCOUNT_DATA_SELECTOR = bytes(Web3.keccak(text="getUserAccountData(address)")[:4])
+
 # Aave Lending Pool ABI (simplified)
 AAVE_LENDING_POOL_ABI = [
     {
@@ -35,60 +47,119 @@ AAVE_LENDING_POOL_ABI = [
 class AaveConnector:
     """Aave V2 and V3 connector"""
     
-    # Mainnet addresses
-    AAVE_V2_LENDING_POOL = "0x7d2768de32b0b80b7a3454c06bdac94a69ddc7a9"
-    AAVE_V3_LENDING_POOL = "0x7b5c6571ee622a610767f47038ae8e38d6d5c1f9"
+    # Mainnet addresses (checksummed once at import)
+    AAVE_V2_LENDING_POOL = Web3.to_checksum_address("0x7d2768de32b0b80b7a3454c06bdac94a69ddc7a9")
+    AAVE_V3_LENDING_POOL = Web3.to_checksum_address("0x87870bca3f3fd6335c3f4ce8392d69350b4fa4e2")
+    
+    # Account data changes at most once per block; serve repeats from memory
+    ACCOUNT_DATA_TTL = 20  # seconds
     
-    def __init__(self, w3: Web3, version: int = 3):
+    # getUserAccountData amounts: ETH (18 decimals) on V2, USD base currency (8 decimals) on V3
+    BASE_CURRENCY = {2: ("ETH", 18), 3: ("USD", 8)}
+    
+    def __init__(self, w3: Web3, version: int = 3, batch_size: int = DEFAULT_BATCH_SIZE):
         """
         Initialize Aave connector
         
         Args:
-            w3: Web3 instance
+            w3: Web3 instance (share one across connectors, see EvmConnectorBundle)
             version: Aave version (2 or 3)
+            batch_size: Maximum eth_calls per JSON-RPC batch request
         """
         self.w3 = w3
         self.version = version
+        self.batch_size = batch_size
+        # address -> (fetched_at, account data)
+        self._account_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
         self.logger = logging.getLogger(f"connector.aave.v{version}")
         
-        pool_address = self.AAVE_V3_LENDING_POOL if version == 3 else self.AAVE_V2_LENDING_POOL
-        self.lending_pool = w3.eth.contract(
-            address=Web3.to_checksum_address(pool_address),
-            abi=AAVE_LENDING_POOL_ABI
+        # Only the address is needed: the calls are encoded by hand and batched
+        self.pool_address = (
+            self.AAVE_V3_LENDING_POOL if version == 3 else self.AAVE_V2_LENDING_POOL
         )
     
     async def get_user_account_data(self, address: str) -> Dict[str, Any]:
         """Get user account data"""
+        address = checksum_address(address)
+        accounts = await self.get_users_account_data([address])
+        if address not in accounts:
+            raise Exception(f"No account data returned for {address}")
+        return accounts[address]
+    
+    async def get_users_account_data(self, addresses: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Get account data for several users
+        
+        All getUserAccountData eth_calls go out as JSON-RPC batch requests
+        (one round trip per `batch_size` users).
+        """
         try:
-            address = Web3.to_checksum_address(address)
+            addresses = [checksum_address(a) for a in addresses]
+            pool = self.pool_address
+            
+            now = time.time()
+            accounts = {}
+            missing = []
+            for address in dict.fromkeys(addresses):
+                cached = self._account_cache.get(address)
+                if cached and now - cached[0] < self.ACCOUNT_DATA_TTL:
+                    accounts[address] = cached[1]
+                else:
+                    missing.append(address)
             
-            # Simplified - full implementation would use proper Aave SDK
-            account_data = {
-                "address": address,
-                "total_collateral_eth": "0",
-                "total_borrows_eth": "0",
-                "available_borrows_eth": "0",
-                "liquidation_threshold": "0",
-                "ltv": "0",
-                "health_factor": "0"
-            }
+            results = await rpc_batch(
+                self.w3,
+                [
+                    eth_call(pool, GET_USER_ACCOUNT_DATA_SELECTOR + abi_encode(["address"], [a]))
+                    for a in missing
+                ],
+                self.batch_size
+            )
             
-            self.logger.info(f"✅ Fetched account data for {address[:10]}...")
-            return account_data
+            currency, decimals = self.BASE_CURRENCY.get(self.version, ("ETH", 18))
+            scale = Decimal(10 ** decimals)
+            
+            for address, result in zip(missing, results):
+                raw = decode_call_result(result)
+                if raw is None:
+                    self.logger.warning("Failed to fetch account data for %s...", address[:10])
+                    continue
+                
+                collateral, borrows, available, threshold, ltv, health = abi_decode(
+                    ["uint256"] * 6, raw
+                )
+                accounts[address] = {
+                    "address": address,
+                    "base_currency": currency,
+                    "total_collateral_eth": str(Decimal(collateral) / scale),
+                    "total_borrows_eth": str(Decimal(borrows) / scale),
+                    "available_borrows_eth": str(Decimal(available) / scale),
+                    "liquidation_threshold": str(Decimal(threshold) / 10_000),
+                    "ltv": str(Decimal(ltv) / 10_000),
+                    "health_factor": str(Decimal(health) / 10 ** 18)
+                }
+                self._account_cache[address] = (time.time(), accounts[address])
+            
+            self.logger.info("✅ Fetched account data for %s addresses", len(accounts))
+            return accounts
         except Exception as e:
-            self.logger.error(f"❌ Error fetching account data: {str(e)}")
+            self.logger.error("❌ Error fetching account data: %s", e)
             raise
     
+    def invalidate_cache(self) -> None:
+        """Drop cached account data so the next call hits the RPC"""
+        self._account_cache.clear()
+    
     async def get_user_deposits(self, address: str) -> List[Dict[str, Any]]:
         """Get user deposit positions"""
         try:
             # Get user's aToken balances
             deposits = []
             
-            self.logger.info(f"✅ Fetched {len(deposits)} deposits")
+            self.logger.info("✅ Fetched %s deposits", len(deposits))
             return deposits
         except Exception as e:
-            self.logger.error(f"❌ Error fetching deposits: {str(e)}")
+            self.logger.exception("❌ Error fetching deposits: %s", e)
             return []
     
     async def get_user_borrows(self, address: str) -> List[Dict[str, Any]]:
@@ -97,8 +168,8 @@ class AaveConnector:
             # Get user's debt token balances
             borrows = []
             
-            self.logger.info(f"✅ Fetched {len(borrows)} borrows")
+            self.logger.info("✅ Fetched %s borrows", len(borrows))
             return borrows
         except Exception as e:
-            self.logger.error(f"❌ Error fetching borrows: {str(e)}")
+            self.logger.exception("❌ Error fetching borrows: %s", e)
             return []
@@ -0,0 +1,66 @@
+# src/api/connectors/defi/evm_bundle.py
+
+"""
+EVM Connector Bundle
+====================
+
+One Web3 instance per RPC endpoint, shared by the DeFi connectors.
+
+AaveConnector and UniswapConnector take a `w3` argument; building a Web3
+per connector gives each one its own HTTP session and TCP/TLS handshakes.
+The bundle owns a single pooled keep-alive session and hands the same
+`w3` to every connector it creates.
+"""
+
+import logging
+from typing import Optional
+
+from web3 import Web3
+
+from src.api.base_connector import create_retry_session
+from src.api.connectors.defi.aave_connector import AaveConnector
+from src.api.connectors.defi.uniswap_connector import UniswapConnector
+
+logger = logging.getLogger(__name__)
+
+
+class EvmConnectorBundle:
+    """DeFi connectors sharing one Web3 provider and HTTP session"""
+    
+    def __init__(self, rpc_url: str, pool_connections: int = 20, pool_maxsize: int = 50):
+        """
+        Initialize connector bundle
+        
+        Args:
+            rpc_url: RPC URL
+            pool_connections: Hosts kept in the connection pool
+            pool_maxsize: Keep-alive connections per host
+        """
+        self.rpc_url = rpc_url
+        # JSON-RPC reads are POSTs but idempotent, so they can be retried
+        self.session = create_retry_session(
+            allowed_methods=frozenset({"GET", "POST"}),
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize
+        )
+        self.w3 = Web3(Web3.HTTPProvider(rpc_url, session=self.session))
+        self._aave: Optional[AaveConnector] = None
+        self._uniswap: Optional[UniswapConnector] = None
+    
+    @property
+    def aave(self) -> AaveConnector:
+        """Aave V3 connector on the shared provider"""
+        if self._aave is None:
+            self._aave = AaveConnector(self.w3)
+        return self._aave
+    
+    @property
+    def uniswap(self) -> UniswapConnector:
+        """Uniswap connector on the shared provider"""
+        if self._uniswap is None:
+            self._uniswap = UniswapConnector(self.w3)
+        return self._uniswap
+    
+    def close(self) -> None:
+        """Close the pooled HTTP session"""
+        self.session.close()
@@ -8,10 +8,18 @@ Support for Uniswap V2 (classic liquidity pools) and V3 (concentrated liquidity
 """
 
 import logging
-from typing import Dict, List, Optional, Any
+import time
+from typing import Dict, List, Optional, Any, Tuple
 from decimal import Decimal
+from eth_abi import decode as abi_decode, encode as abi_encode
 from web3 import Web3
 
+from src.api.connectors.blockchains.evm_rpc import (
+    DEFAULT_BATCH_SIZE,
+    checksum_address,
+    read_contracts,
+)
+
 logger = logging.getLogger(__name__)
 
 
@@ -25,49 +33,69 @@ UNISWAP_V2_ROUTER_ABI = [
     }
 ]
 
-# Uniswap V3 Position Manager ABI (simplified)
-UNISWAP_V3_POSITION_MANAGER_ABI = [
-    {
-        "inputs": [{"name": "tokenId", "type": "uint256"}],
-        "name": "positions",
-        "outputs": [
-            {"name": "nonce", "type": "uint96"},
-            {"name": "operator", "type": "address"},
-            {"name": "token0", "type": "address"},
-            {"name": "token1", "type": "address"},
-            {"name": "fee", "type": "uint24"},
-            {"name": "tickLower", "type": "int24"},
-            {"name": "tickUpper", "type": "int24"},
-            {"name": "liquidity", "type": "uint128"},
-            {"name": "feeGrowthInside0LastX128", "type": "uint256"},
-            {"name": "feeGrowthInside1LastX128", "type": "uint256"},
-            {"name": "tokensOwed0", "type": "uint128"},
-            {"name": "tokensOwed1", "type": "uint128"}
-        ],
-        "type": "function",
-        "stateMutability": "view"
-    }
+# NonfungiblePositionManager selectors (ERC-721 enumerable + positions)
+BALANCE_OF_SELECTOR = bytes(Web3.keccak(text="balanceOf(address)")[:4])
+TOKEN_OF_OWNER_BY_INDEX_SELECTOR = bytes(Web3.keccak(text="tokenOfOwnerByIndex(address,uint256)")[:4])
+POSITIONS_SELECTOR = bytes(Web3.keccak(text="positions(uint256)")[:4])
+POSITIONS_OUTPUT_TYPES = [
+    "uint96", "address", "address", "address", "uint24", "int24",
+    "int24", "uint128", "uint256", "uint256", "uint128", "uint128"
 ]
 
+# V3 factory lookup and pool state
+GET_POOL_SELECTOR = bytes(Web3.keccak(text="getPool(address,address,uint24)")[:4])
+SLOT0_SELECTOR = bytes(Web3.keccak(text="slot0()")[:4])
+SLOT0_OUTPUT_TYPES = ["uint160", "int24", "uint16", "uint16", "uint16", "uint8", "bool"]
+LIQUIDITY_SELECTOR = bytes(Web3.keccak(text="liquidity()")[:4])
+
 
 class UniswapConnector:
     """Uniswap V2 and V3 connector"""
     
-    # Mainnet addresses
-    UNISWAP_V2_ROUTER = "0x7a250d5630b4cf539739df2c5dacb4c659f2488d"
+    # Mainnet addresses (checksummed once at import)
+    UNISWAP_V2_ROUTER = Web3.to_checksum_address("0x7a250d5630b4cf539739df2c5dacb4c659f2488d")
     UNISWAP_V3_ROUTER = "0xE592427A0AEce92De3Edee1F18E0157C05861564"
     UNISWAP_V3_POSITION_MANAGER = "0xC36442b4a4522E871399CD717aBDD847Ab11FE88"
+    UNISWAP_V3_FACTORY = "0x1F98431c8aD98523631AE4a59f267346ea31F984"
+    
+    # Token IDs prefetched alongside balanceOf; larger wallets need one more call
+    MAX_EXPECTED_POSITIONS = 64
+    
+    # Short-lived caches for repeated UI reads
+    POSITIONS_TTL = 20  # seconds
+    POOL_INFO_TTL = 2  # seconds (~ one block)
     
-    def __init__(self, w3: Web3):
+    def __init__(self, w3: Web3, batch_size: int = DEFAULT_BATCH_SIZE):
         """
         Initialize Uniswap connector
         
         Args:
-            w3: Web3 instance
+            w3: Web3 instance (share one across connectors, see EvmConnectorBundle)
+            batch_size: Maximum eth_calls per JSON-RPC batch request
         """
         self.w3 = w3
+        self.batch_size = batch_size
+        # (method, key) -> (fetched_at, value)
+        self._cache: Dict[Tuple, Tuple[float, Any]] = {}
+        # (token0, token1, fee) -> pool address; pools never move
+        self._pool_addresses: Dict[Tuple[str, str, int], str] = {}
         self.logger = logging.getLogger("connector.uniswap")
     
+    def _cache_get(self, key: Tuple, ttl: float) -> Optional[Any]:
+        """Return a cached value if it is younger than ttl"""
+        cached = self._cache.get(key)
+        if cached and time.time() - cached[0] < ttl:
+            return cached[1]
+        return None
+    
+    def _cache_set(self, key: Tuple, value: Any) -> None:
+        """Store a value in the read cache"""
+        self._cache[key] = (time.time(), value)
+    
+    def invalidate_cache(self) -> None:
+        """Drop cached reads so the next call hits the RPC"""
+        self._cache.clear()
+    
     async def get_v2_liquidity_positions(self, address: str) -> List[Dict[str, Any]]:
         """
         Get Uniswap V2 liquidity positions (LP tokens)
@@ -84,10 +112,10 @@ class UniswapConnector:
             
             positions = []
             
-            self.logger.info(f"✅ Fetched {len(positions)} V2 positions")
+            self.logger.info("✅ Fetched %s V2 positions", len(positions))
             return positions
         except Exception as e:
-            self.logger.error(f"❌ Error fetching V2 positions: {str(e)}")
+            self.logger.exception("❌ Error fetching V2 positions: %s", e)
             return []
     
     async def get_v3_positions(self, address: str) -> List[Dict[str, Any]]:
@@ -101,35 +129,122 @@ class UniswapConnector:
             List of concentrated liquidity positions as NFTs
         """
         try:
-            # Get NFT position IDs from Uniswap Position Manager
-            position_manager = self.w3.eth.contract(
-                address=self.UNISWAP_V3_POSITION_MANAGER,
-                abi=UNISWAP_V3_POSITION_MANAGER_ABI
+            address = checksum_address(address)
+            
+            cached = self._cache_get(("v3_positions", address), self.POSITIONS_TTL)
+            if cached is not None:
+                return cached
+            
+            manager = self.UNISWAP_V3_POSITION_MANAGER
+            encoded_owner = abi_encode(["address"], [address])
+            
+            def token_of_owner_by_index(i: int) -> Tuple[str, bytes]:
+                return (manager, TOKEN_OF_OWNER_BY_INDEX_SELECTOR + abi_encode(["address", "uint256"], [address, i]))
+            
+            # balanceOf and the first MAX_EXPECTED_POSITIONS token IDs in one
+            # round trip; indexes past the balance revert and come back as None
+            first = await read_contracts(
+                self.w3,
+                [(manager, BALANCE_OF_SELECTOR + encoded_owner)]
+                + [token_of_owner_by_index(i) for i in range(self.MAX_EXPECTED_POSITIONS)],
+                self.batch_size
             )
+            count = int.from_bytes(first[0], "big") if first[0] else 0
+            id_results = first[1:count + 1]
             
-            # Query positions for user
-            positions = []
+            if count > self.MAX_EXPECTED_POSITIONS:
+                id_results += await read_contracts(
+                    self.w3,
+                    [token_of_owner_by_index(i) for i in range(self.MAX_EXPECTED_POSITIONS, count)],
+                    self.batch_size
+                )
+            
+            token_ids = [int.from_bytes(raw, "big") for raw in id_results if raw is not None]
             
-            # Implementation: iterate through position IDs and fetch details
+            # All position details in a single Multicall3 eth_call
+            position_results = await read_contracts(
+                self.w3,
+                [(manager, POSITIONS_SELECTOR + abi_encode(["uint256"], [tid])) for tid in token_ids],
+                self.batch_size
+            )
+            
+            positions = []
+            for token_id, raw in zip(token_ids, position_results):
+                if raw is None:
+                    self.logger.warning("Failed to fetch position %s", token_id)
+                    continue
+                positions.append(self._parse_position(token_id, raw))
             
-            self.logger.info(f"✅ Fetched {len(positions)} V3 positions")
+            self._cache_set(("v3_positions", address), positions)
+            self.logger.info("✅ Fetched %s V3 positions", len(positions))
             return positions
         except Exception as e:
-            self.logger.error(f"❌ Error fetching V3 positions: {str(e)}")
+            self.logger.exception("❌ Error fetching V3 positions: %s", e)
             return []
     
+    @staticmethod
+    def _parse_position(token_id: int, raw: bytes) -> Dict[str, Any]:
+        """Decode a positions(tokenId) return value"""
+        (_, _, token0, token1, fee, tick_lower, tick_upper,
+         liquidity, _, _, owed0, owed1) = abi_decode(POSITIONS_OUTPUT_TYPES, raw)
+        return {
+            "token_id": token_id,
+            "token0": checksum_address(token0),
+            "token1": checksum_address(token1),
+            "fee": fee,
+            "tick_lower": tick_lower,
+            "tick_upper": tick_upper,
+            "liquidity": str(liquidity),
+            "tokens_owed0": str(owed0),
+            "tokens_owed1": str(owed1)
+        }
+    
+    async def _pool_address(self, token0: str, token1: str, fee: int) -> Optional[str]:
+        """Look up a V3 pool address (immutable, cached per connector)"""
+        key = (checksum_address(token0), checksum_address(token1), fee)
+        if key not in self._pool_addresses:
+            raw = (await read_contracts(
+                self.w3,
+                [(self.UNISWAP_V3_FACTORY, GET_POOL_SELECTOR + abi_encode(["address", "address", "uint24"], list(key)))]
+            ))[0]
+            pool = abi_decode(["address"], raw)[0] if raw else None
+            if not pool or int(pool, 16) == 0:
+                return None
+            self._pool_addresses[key] = checksum_address(pool)
+        return self._pool_addresses[key]
+    
     async def get_pool_info(self, token0: str, token1: str, fee: int = 3000) -> Dict[str, Any]:
         """Get Uniswap pool information"""
         try:
-            # Implementation details...
+            key = ("pool_info", token0, token1, fee)
+            cached = self._cache_get(key, self.POOL_INFO_TTL)
+            if cached is not None:
+                return cached
+            
+            pool = await self._pool_address(token0, token1, fee)
+            if pool is None:
+                raise ValueError(f"No V3 pool for {token0}/{token1} fee {fee}")
+            
+            slot0_raw, liquidity_raw = await read_contracts(
+                self.w3,
+                [(pool, SLOT0_SELECTOR), (pool, LIQUIDITY_SELECTOR)]
+            )
+            if slot0_raw is None or liquidity_raw is None:
+                raise ValueError(f"Could not read pool {pool}")
+            
+            sqrt_price_x96, tick = abi_decode(SLOT0_OUTPUT_TYPES, slot0_raw)[:2]
             
-            return {
+            pool_info = {
+                "pool_address": pool,
                 "token0": token0,
                 "token1": token1,
                 "fee": fee,
-                "liquidity": "0",
-                "sqrtPriceX96": "0"
+                "liquidity": str(int.from_bytes(liquidity_raw, "big")),
+                "sqrtPriceX96": str(sqrt_price_x96),
+                "tick": tick
             }
+            self._cache_set(key, pool_info)
+            return pool_info
         except Exception as e:
-            self.logger.error(f"❌ Error fetching pool info: {str(e)}")
+            self.logger.error("❌ Error fetching pool info: %s", e)
             raise
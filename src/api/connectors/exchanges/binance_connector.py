@@ -9,26 +9,89 @@ Completa con todas las funcionalidades.
 """
 
 import asyncio
+import functools
+import hashlib
+import heapq
+import hmac
+import json
 import logging
-from typing import Dict, List, Optional, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Any, Tuple
 from decimal import Decimal
+from operator import itemgetter
 from datetime import datetime, timedelta
+from urllib.parse import urlencode
 import time
 
+import aiohttp
+
+from src.api.connectors.base_connector import TenantLoggerAdapter
+
 try:
-    from binance.client import Client as BinanceClient
-    from binance.exceptions import BinanceAPIException, BinanceOrderException
+    import orjson
 except ImportError:
-    BinanceClient = None
-    BinanceAPIException = None
-    BinanceOrderException = None
+    orjson = None
+
+# Decode raw response bytes directly, with orjson when available
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+# python-binance is imported by the first connector built (see _load_sdk),
+# so importing this module stays cheap when Binance is not configured
+BinanceClient = None
+BinanceAPIException = None
+BinanceOrderException = None
 
 logger = logging.getLogger(__name__)
+_LOGGER = logging.getLogger("connector.binance")
+
+# Bound once for the per-row history and trade mappers
+_fromtimestamp = datetime.fromtimestamp
+
+# (symbol, price) pairs from ticker/price rows, mapped in C by get_all_prices
+_symbol_price = itemgetter('symbol', 'price')
+
+# Binance reports empty balances with 8 decimals
+_ZERO_AMOUNT = "0.00000000"
+
+
+def _load_sdk():
+    """Import python-binance on first use"""
+    global BinanceClient, BinanceAPIException, BinanceOrderException
+    if BinanceClient is None:
+        try:
+            from binance.client import Client
+            from binance.exceptions import BinanceAPIException as _APIException
+            from binance.exceptions import BinanceOrderException as _OrderException
+        except ImportError as e:
+            raise ImportError(f"python-binance not installed. pip install python-binance ({e})") from e
+        BinanceClient = Client
+        BinanceAPIException = _APIException
+        BinanceOrderException = _OrderException
+    return BinanceClient
 
 
 class BinanceConnector:
     """Binance exchange connector - COMPLETO"""
     
+    # python-binance is blocking: its calls run on a bounded pool shared by
+    # all instances so they never stall the event loop
+    _tpe = ThreadPoolExecutor(max_workers=8, thread_name_prefix="binance-sync")
+    
+    # Concurrent symbol queries in get_all_trades
+    MAX_CONCURRENT_SYMBOLS = 5
+    
+    # REST endpoints for the calls made natively over aiohttp
+    BASE_URL = "https://api.binance.com"
+    TESTNET_URL = "https://testnet.binance.vision"
+    RECV_WINDOW = 5000  # ms
+    
+    # get_balance, get_asset_balance and get_account_info share one
+    # get_account payload while it is younger than this
+    ACCOUNT_TTL = 5.0  # seconds
+    
+    # The TRADING symbol list rarely changes; refresh it at most this often
+    SYMBOLS_TTL = 3600  # seconds
+    
     def __init__(self, api_key: str, api_secret: str, testnet: bool = False):
         """
         Initialize Binance connector
@@ -38,35 +101,123 @@ class BinanceConnector:
             api_secret: Binance API secret
             testnet: Use testnet (default: False)
         """
-        if not BinanceClient:
-            raise ImportError("python-binance not installed. pip install python-binance")
-        
         self.api_key = api_key
         self.api_secret = api_secret
         self.testnet = testnet
         
+        client_class = _load_sdk()
         if testnet:
-            self.client = BinanceClient(
+            self.client = client_class(
                 api_key=api_key,
                 api_secret=api_secret,
                 testnet=True
             )
         else:
-            self.client = BinanceClient(api_key=api_key, api_secret=api_secret)
+            self.client = client_class(api_key=api_key, api_secret=api_secret)
+        
+        self.base_url = self.TESTNET_URL if testnet else self.BASE_URL
+        self._session: Optional[aiohttp.ClientSession] = None
+        # (fetched_at, get_account payload)
+        self._account_cache: Optional[Tuple[float, Dict[str, Any]]] = None
+        self._account_lock: Optional[asyncio.Lock] = None
+        # (account payload, asset -> balance row) for get_asset_balance
+        self._asset_index: Optional[Tuple[Dict[str, Any], Dict[str, Dict[str, Any]]]] = None
+        # (fetched_at, TRADING symbols from exchangeInfo)
+        self._symbols_cache: Optional[Tuple[float, List[str]]] = None
+        
+        self._log_suffix = api_key[:8]
+        self.logger = TenantLoggerAdapter(_LOGGER, {"tenant": self._log_suffix})
+    
+    async def _call(self, fn, *args, **kwargs):
+        """Run a blocking SDK call on the thread pool"""
+        return await asyncio.get_running_loop().run_in_executor(
+            self._tpe, functools.partial(fn, *args, **kwargs)
+        )
+    
+    async def _account(self, max_age: Optional[float] = None) -> Dict[str, Any]:
+        """get_account payload, reused while younger than max_age (default ACCOUNT_TTL)"""
+        if max_age is None:
+            max_age = self.ACCOUNT_TTL
+        # Created lazily so it binds to the running loop (Python 3.9)
+        if self._account_lock is None:
+            self._account_lock = asyncio.Lock()
+        
+        # Concurrent callers wait for one fetch instead of each sending their own
+        async with self._account_lock:
+            cached = self._account_cache
+            if cached and time.time() - cached[0] < max_age:
+                return cached[1]
+            account = await self._call(self.client.get_account)
+            self._account_cache = (time.time(), account)
+            return account
+    
+    async def _trading_symbols(self, ttl: Optional[float] = None) -> List[str]:
+        """Symbols with status TRADING, from exchangeInfo cached for ttl (default SYMBOLS_TTL)"""
+        if ttl is None:
+            ttl = self.SYMBOLS_TTL
+        cached = self._symbols_cache
+        if cached and time.time() - cached[0] < ttl:
+            return cached[1]
+        exchange_info = await self._get("/api/v3/exchangeInfo")
+        symbols = [s['symbol'] for s in exchange_info['symbols'] if s['status'] == 'TRADING']
+        self._symbols_cache = (time.time(), symbols)
+        return symbols
+    
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Get the shared HTTP session (keep-alive pool), creating it on first use"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=20, ttl_dns_cache=300),
+                headers={"X-MBX-APIKEY": self.api_key},
+                timeout=aiohttp.ClientTimeout(total=30)
+            )
+        return self._session
+    
+    async def close(self):
+        """Close the shared HTTP session"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+    
+    async def _get(self, path: str, params: Optional[Dict[str, Any]] = None, signed: bool = False) -> Any:
+        """
+        GET a Binance REST endpoint over the async session
         
-        self.logger = logging.getLogger(f"connector.binance.{api_key[:8]}")
+        Args:
+            path: Endpoint path (e.g. /api/v3/ticker/price)
+            params: Query parameters
+            signed: Add timestamp and HMAC-SHA256 signature (USER_DATA endpoints)
+        """
+        params = dict(params or {})
+        if signed:
+            params["recvWindow"] = self.RECV_WINDOW
+            params["timestamp"] = int(time.time() * 1000)
+        
+        # Sign the exact query string that is sent
+        query = urlencode(params)
+        if signed:
+            signature = hmac.new(self.api_secret.encode(), query.encode(), hashlib.sha256).hexdigest()
+            query = f"{query}&signature={signature}"
+        
+        session = await self._get_session()
+        url = f"{self.base_url}{path}?{query}" if query else f"{self.base_url}{path}"
+        async with session.get(url) as resp:
+            data = _json_loads(await resp.read())
+            if resp.status != 200:
+                raise Exception(f"Binance API error {resp.status}: {data.get('code')} {data.get('msg')}")
+            return data
     
     async def validate_connection(self) -> bool:
         """Validate Binance connection"""
         try:
-            self.client.get_account()
+            await self._call(self.client.get_account)
             self.logger.info("✅ Binance connection validated")
             return True
         except BinanceAPIException as e:
-            self.logger.error(f"❌ Binance API error: {str(e)}")
+            self.logger.exception("❌ Binance API error: %s", e)
             return False
         except Exception as e:
-            self.logger.error(f"❌ Connection error: {str(e)}")
+            self.logger.exception("❌ Connection error: %s", e)
             return False
     
     async def get_balance(self) -> Dict[str, Dict[str, Any]]:
@@ -80,53 +231,60 @@ class BinanceConnector:
             }
         """
         try:
-            account = self.client.get_account()
+            account = await self._account()
             balances = {}
             
             for balance in account['balances']:
-                token = balance['asset']
+                # Most assets are zero: skip them on string compare, before any Decimal
+                if balance['free'] == _ZERO_AMOUNT and balance['locked'] == _ZERO_AMOUNT:
+                    continue
                 free = Decimal(balance['free'])
                 locked = Decimal(balance['locked'])
                 
                 total = free + locked
                 if total > 0:
-                    balances[token] = {
+                    balances[balance['asset']] = {
                         "free": str(free),
                         "locked": str(locked),
                         "total": str(total)
                     }
             
-            self.logger.info(f"✅ Balance fetched: {len(balances)} assets")
+            self.logger.info("✅ Balance fetched: %s assets", len(balances))
             return balances
         except BinanceAPIException as e:
-            self.logger.error(f"❌ Error fetching balance: {str(e)}")
+            self.logger.error("❌ Error fetching balance: %s", e)
             raise
         except Exception as e:
-            self.logger.error(f"❌ Error fetching balance: {str(e)}")
+            self.logger.error("❌ Error fetching balance: %s", e)
             raise
     
     async def get_asset_balance(self, asset: str) -> Optional[Dict[str, str]]:
         """Get balance for specific asset"""
         try:
-            account = self.client.get_account()
+            account = await self._account()
             
-            for balance in account['balances']:
-                if balance['asset'] == asset:
-                    return {
-                        "free": balance['free'],
-                        "locked": balance['locked'],
-                        "total": str(Decimal(balance['free']) + Decimal(balance['locked']))
-                    }
+            # Index the cached payload once; later lookups within ACCOUNT_TTL are O(1)
+            index = self._asset_index
+            if index is None or index[0] is not account:
+                index = (account, {b['asset']: b for b in account['balances']})
+                self._asset_index = index
             
-            return None
+            balance = index[1].get(asset)
+            if balance is None:
+                return None
+            return {
+                "free": balance['free'],
+                "locked": balance['locked'],
+                "total": str(Decimal(balance['free']) + Decimal(balance['locked']))
+            }
         except Exception as e:
-            self.logger.error(f"❌ Error fetching {asset} balance: {str(e)}")
+            self.logger.error("❌ Error fetching %s balance: %s", asset, e)
             return None
     
     async def get_trading_fees(self) -> Dict[str, Any]:
         """Get trading fees"""
         try:
-            fees = self.client.get_trade_fee()
+            fees = await self._call(self.client.get_trade_fee)
             
             fee_summary = {
                 "maker": "0",
@@ -153,19 +311,19 @@ class BinanceConnector:
                 if taker_fees:
                     fee_summary["taker"] = str(max(taker_fees))
             
-            self.logger.info(f"✅ Trading fees fetched")
+            self.logger.info("✅ Trading fees fetched")
             return fee_summary
         except Exception as e:
-            self.logger.error(f"❌ Error fetching fees: {str(e)}")
+            self.logger.error("❌ Error fetching fees: %s", e)
             raise
     
     async def get_deposit_address(self, coin: str, network: Optional[str] = None) -> Optional[Dict[str, str]]:
         """Get deposit address for coin"""
         try:
             if network:
-                address = self.client.get_deposit_address(coin=coin, network=network)
+                address = await self._call(self.client.get_deposit_address, coin=coin, network=network)
             else:
-                address = self.client.get_deposit_address(coin=coin)
+                address = await self._call(self.client.get_deposit_address, coin=coin)
             
             return {
                 "coin": coin,
@@ -174,7 +332,7 @@ class BinanceConnector:
                 "network": network or address.get('network')
             }
         except Exception as e:
-            self.logger.error(f"❌ Error getting deposit address: {str(e)}")
+            self.logger.exception("❌ Error getting deposit address: %s", e)
             return None
     
     async def get_withdraw_history(self, coin: Optional[str] = None, limit: int = 100) -> List[Dict[str, Any]]:
@@ -184,7 +342,7 @@ class BinanceConnector:
             if coin:
                 params["coin"] = coin
             
-            history = self.client.get_withdraw_history(**params)
+            history = await self._call(self.client.get_withdraw_history, **params)
             
             return [
                 {
@@ -193,14 +351,14 @@ class BinanceConnector:
                     "amount": tx['amount'],
                     "address": tx['address'],
                     "status": tx['status'],  # 0: pending, 1: success
-                    "timestamp": datetime.fromtimestamp(tx['applyTime'] / 1000).isoformat(),
+                    "timestamp": _fromtimestamp(tx['applyTime'] / 1000).isoformat(),
                     "txid": tx.get('txId'),
                     "network": tx.get('network')
                 }
                 for tx in history
             ]
         except Exception as e:
-            self.logger.error(f"❌ Error fetching withdraw history: {str(e)}")
+            self.logger.exception("❌ Error fetching withdraw history: %s", e)
             return []
     
     async def get_deposit_history(self, coin: Optional[str] = None, limit: int = 100) -> List[Dict[str, Any]]:
@@ -210,7 +368,7 @@ class BinanceConnector:
             if coin:
                 params["coin"] = coin
             
-            history = self.client.get_deposit_history(**params)
+            history = await self._call(self.client.get_deposit_history, **params)
             
             return [
                 {
@@ -219,88 +377,99 @@ class BinanceConnector:
                     "amount": tx['amount'],
                     "address": tx['address'],
                     "status": tx['status'],  # 0: pending, 1: success
-                    "timestamp": datetime.fromtimestamp(tx['insertTime'] / 1000).isoformat(),
+                    "timestamp": _fromtimestamp(tx['insertTime'] / 1000).isoformat(),
                     "txid": tx.get('txId'),
                     "network": tx.get('network')
                 }
                 for tx in history
             ]
         except Exception as e:
-            self.logger.error(f"❌ Error fetching deposit history: {str(e)}")
+            self.logger.exception("❌ Error fetching deposit history: %s", e)
             return []
     
+    async def _get_raw_trades(self, symbol: str, limit: int) -> List[Dict[str, Any]]:
+        """Raw myTrades rows for symbol (epoch-ms 'time' kept for ordering)"""
+        return await self._get("/api/v3/myTrades", {"symbol": symbol, "limit": limit}, signed=True)
+    
+    @staticmethod
+    def _format_trade(t: Dict[str, Any]) -> Dict[str, Any]:
+        """Map a raw myTrades row to the connector's trade format"""
+        return {
+            "id": t['id'],
+            "symbol": t['symbol'],
+            "price": t['price'],
+            "qty": t['qty'],
+            "commission": t['commission'],
+            "commissionAsset": t['commissionAsset'],
+            "is_buyer": t['isBuyer'],
+            "is_maker": t['isMaker'],
+            "timestamp": _fromtimestamp(t['time'] / 1000).isoformat()
+        }
+    
     async def get_trades(self, symbol: str, limit: int = 100) -> List[Dict[str, Any]]:
         """Get trades for symbol"""
         try:
-            trades = self.client.get_my_trades(symbol=symbol, limit=limit)
-            
-            return [
-                {
-                    "id": t['id'],
-                    "symbol": t['symbol'],
-                    "price": t['price'],
-                    "qty": t['qty'],
-                    "commission": t['commission'],
-                    "commissionAsset": t['commissionAsset'],
-                    "is_buyer": t['isBuyer'],
-                    "is_maker": t['isMaker'],
-                    "timestamp": datetime.fromtimestamp(t['time'] / 1000).isoformat()
-                }
-                for t in trades
-            ]
+            trades = await self._get_raw_trades(symbol, limit)
+            return [self._format_trade(t) for t in trades]
         except Exception as e:
-            self.logger.error(f"❌ Error fetching trades: {str(e)}")
+            self.logger.exception("❌ Error fetching trades: %s", e)
             return []
     
     async def get_all_trades(self, limit: int = 10) -> List[Dict[str, Any]]:
         """Get recent trades across all symbols"""
         try:
             # Get user trades (requires account read permissions)
-            exchange_info = self.client.get_exchange_info()
-            symbols = [s['symbol'] for s in exchange_info['symbols'] if s['status'] == 'TRADING']
+            symbols = await self._trading_symbols()
             
-            all_trades = []
+            # Up to MAX_CONCURRENT_SYMBOLS queries in flight instead of a fixed sleep between them
+            semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_SYMBOLS)
             
-            for symbol in symbols[:50]:  # Limit to first 50 to avoid rate limiting
-                try:
-                    trades = await self.get_trades(symbol, limit=5)
-                    all_trades.extend(trades)
-                    await asyncio.sleep(0.1)  # Rate limiting
-                except Exception as e:
-                    self.logger.warning(f"Could not fetch trades for {symbol}: {str(e)}")
-                    continue
+            async def fetch_symbol(symbol: str) -> List[Dict[str, Any]]:
+                async with semaphore:
+                    return await self._get_raw_trades(symbol, 5)
+            
+            results = await asyncio.gather(
+                *[fetch_symbol(symbol) for symbol in symbols[:50]],  # Limit to first 50 to avoid rate limiting
+                return_exceptions=True
+            )
             
-            # Sort by timestamp descending
-            all_trades.sort(key=lambda x: x['timestamp'], reverse=True)
+            all_trades = []
+            for symbol, trades in zip(symbols, results):
+                if isinstance(trades, Exception):
+                    self.logger.warning("Could not fetch trades for %s: %s", symbol, trades)
+                    continue
+                all_trades.extend(trades)
             
-            self.logger.info(f"✅ Fetched {len(all_trades)} trades")
-            return all_trades[:limit]
+            self.logger.info("✅ Fetched %s trades", len(all_trades))
+            # Newest `limit` trades by epoch-ms; only those get formatted
+            newest = heapq.nlargest(limit, all_trades, key=itemgetter('time'))
+            return [self._format_trade(t) for t in newest]
         except Exception as e:
-            self.logger.error(f"❌ Error fetching all trades: {str(e)}")
+            self.logger.exception("❌ Error fetching all trades: %s", e)
             return []
     
     async def get_price(self, symbol: str) -> Optional[str]:
         """Get current price for symbol"""
         try:
-            ticker = self.client.get_ticker(symbol=symbol)
-            return ticker['lastPrice']
+            ticker = await self._get("/api/v3/ticker/price", {"symbol": symbol})
+            return ticker['price']
         except Exception as e:
-            self.logger.error(f"❌ Error fetching price: {str(e)}")
+            self.logger.exception("❌ Error fetching price: %s", e)
             return None
     
     async def get_all_prices(self) -> Dict[str, str]:
         """Get all trading pair prices"""
         try:
-            prices = self.client.get_all_tickers()
-            return {p['symbol']: p['price'] for p in prices}
+            prices = await self._get("/api/v3/ticker/price")
+            return dict(map(_symbol_price, prices))
         except Exception as e:
-            self.logger.error(f"❌ Error fetching prices: {str(e)}")
+            self.logger.exception("❌ Error fetching prices: %s", e)
             return {}
     
     async def get_ticker(self, symbol: str) -> Optional[Dict[str, Any]]:
         """Get 24hr ticker data"""
         try:
-            ticker = self.client.get_ticker(symbol=symbol)
+            ticker = await self._get("/api/v3/ticker/24hr", {"symbol": symbol})
             
             return {
                 "symbol": ticker['symbol'],
@@ -311,13 +480,13 @@ class BinanceConnector:
                 "change24h": ticker['priceChangePercent']
             }
         except Exception as e:
-            self.logger.error(f"❌ Error fetching ticker: {str(e)}")
+            self.logger.exception("❌ Error fetching ticker: %s", e)
             return None
     
     async def get_account_info(self) -> Dict[str, Any]:
         """Get detailed account information"""
         try:
-            account = self.client.get_account()
+            account = await self._account()
             
             return {
                 "maker_commission": account['makerCommission'],
@@ -331,5 +500,5 @@ class BinanceConnector:
                 "balances_count": len(account['balances'])
             }
         except Exception as e:
-            self.logger.error(f"❌ Error fetching account info: {str(e)}")
+            self.logger.error("❌ Error fetching account info: %s", e)
             raise
@@ -8,22 +8,69 @@ Real-time integration with Coinbase API.
 """
 
 import asyncio
+import functools
+import heapq
+import inspect
 import logging
-from typing import Dict, List, Optional, Any
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from operator import itemgetter
+from typing import Dict, List, Optional, Any, Tuple
 from decimal import Decimal
 from datetime import datetime, timedelta
 
-try:
-    from coinbase.client import Client
-except ImportError:
-    Client = None
+from src.api.connectors.base_connector import TenantLoggerAdapter
+
+# The SDK is imported by the first connector built (see _load_sdk), so
+# importing this module stays cheap when Coinbase is not configured
+Client = None
 
 logger = logging.getLogger(__name__)
+_LOGGER = logging.getLogger("connector.coinbase")
+
+# Fields copied verbatim from each fill returned by the API
+FILL_FIELDS = ('id', 'order_id', 'trade_id', 'product_id', 'side', 'price', 'size', 'fee', 'created_at')
+_fill_values = itemgetter(*FILL_FIELDS)
+_by_created_at = itemgetter('created_at')
+
+
+def _load_sdk():
+    """Import the Coinbase SDK on first use"""
+    global Client
+    if Client is None:
+        try:
+            from coinbase.client import Client as _Client
+        except ImportError as e:
+            raise ImportError(f"coinbase library not installed. pip install coinbase ({e})") from e
+        Client = _Client
+    return Client
+
+
+def _accepts_kwarg(fn, name: str) -> bool:
+    """True if fn takes keyword `name`, explicitly or through **kwargs"""
+    try:
+        params = inspect.signature(fn).parameters
+    except (TypeError, ValueError):
+        return False
+    return name in params or any(p.kind is p.VAR_KEYWORD for p in params.values())
+
+
+def _is_zero(amount: str) -> bool:
+    """True for zero amount strings ("0", "0.0000000000000000") without building a Decimal"""
+    return not amount.strip("0.")
 
 
 class CoinbaseConnector:
     """Coinbase exchange connector"""
     
+    # The SDK is blocking: its calls run on a bounded pool shared by all
+    # instances, which also caps concurrent ledger requests
+    _tpe = ThreadPoolExecutor(max_workers=8, thread_name_prefix="cb-sync")
+    
+    # Reuse the accounts list between get_balance and get_transactions
+    ACCOUNTS_TTL = 5  # seconds
+    
     def __init__(self, api_key: str, api_secret: str, passphrase: str):
         """
         Initialize Coinbase connector
@@ -33,23 +80,79 @@ class CoinbaseConnector:
             api_secret: API secret
             passphrase: API passphrase
         """
-        if not Client:
-            raise ImportError("coinbase library not installed. pip install coinbase")
-        
         self.api_key = api_key
         self.api_secret = api_secret
         self.passphrase = passphrase
-        self.client = Client(api_key, api_secret, passphrase)
-        self.logger = logging.getLogger(f"connector.coinbase.{api_key[:8]}")
+        self.client = _load_sdk()(api_key, api_secret, passphrase)
+        # Older SDK versions have no limit parameter on the ledger call
+        self._ledger_takes_limit = _accepts_kwarg(self.client.get_account_ledger, "limit")
+        self._log_suffix = api_key[:8]
+        self.logger = TenantLoggerAdapter(_LOGGER, {"tenant": self._log_suffix})
+        
+        # (fetched_at, accounts); the lock keeps concurrent callers to one fetch
+        self._accounts_cache: Optional[Tuple[float, List[Dict[str, Any]]]] = None
+        self._accounts_lock: Optional[asyncio.Lock] = None
+    
+    async def _call(self, fn, *args, **kwargs):
+        """Run a blocking SDK call on the thread pool"""
+        return await asyncio.get_running_loop().run_in_executor(
+            self._tpe, functools.partial(fn, *args, **kwargs)
+        )
+    
+    async def _accounts(self) -> List[Dict[str, Any]]:
+        """Get the accounts list, reusing it for ACCOUNTS_TTL seconds"""
+        # Created lazily so it binds to the running loop (Python 3.9)
+        if self._accounts_lock is None:
+            self._accounts_lock = asyncio.Lock()
+        
+        async with self._accounts_lock:
+            if (self._accounts_cache is not None and
+                    time.time() - self._accounts_cache[0] < self.ACCOUNTS_TTL):
+                return self._accounts_cache[1]
+            
+            accounts = await self._call(self.client.get_accounts)
+            self._accounts_cache = (time.time(), accounts)
+            return accounts
+    
+    def _fetch_ledger(self, account_id: str, limit: int) -> List[Dict[str, Any]]:
+        """
+        Fetch the newest `limit` ledger entries of an account (blocking)
+        
+        Asks the API for a page of `limit` entries when the SDK supports it;
+        when the SDK paginates lazily (following the Cb-After cursor)
+        iteration stops as soon as `limit` entries are read instead of
+        walking the whole ledger.
+        
+        Returns:
+            Entries sorted newest first
+        """
+        if self._ledger_takes_limit:
+            ledger = self.client.get_account_ledger(account_id, limit=limit)
+        else:
+            ledger = self.client.get_account_ledger(account_id)
+        entries = list(islice(ledger, limit))
+        # get_transactions merges ledgers assuming newest first. The API
+        # documents that order but SDK paging doesn't promise it; on an
+        # already-ordered list this sort is a single linear pass
+        entries.sort(key=_by_created_at, reverse=True)
+        return entries
+    
+    def _fetch_fills(self, product_id: Optional[str], limit: int) -> List[Dict[str, Any]]:
+        """Fetch at most `limit` fills (blocking)"""
+        return list(islice(self.client.get_fills(product_id=product_id), limit))
+    
+    def invalidate_accounts(self) -> None:
+        """Drop the cached accounts list so the next call hits the API"""
+        self._accounts_cache = None
     
     async def validate_connection(self) -> bool:
         """Validate Coinbase connection"""
         try:
-            self.client.get_accounts()
+            await self._call(self.client.get_accounts)
             self.logger.info("✅ Coinbase connection validated")
             return True
         except Exception as e:
-            self.logger.error(f"❌ Connection error: {str(e)}")
+            self.logger.exception("❌ Connection error: %s", e)
             return False
     
     async def get_balance(self) -> Dict[str, Dict[str, Any]]:
@@ -63,74 +166,83 @@ class CoinbaseConnector:
             }
         """
         try:
-            accounts = self.client.get_accounts()
+            accounts = await self._accounts()
             balances = {}
             
             for account in accounts:
-                currency = account['currency']
-                balance = Decimal(account['balance'])
-                hold = Decimal(account['hold'])
+                # Most accounts are empty: skip them on the raw strings
+                balance, hold = account['balance'], account['hold']
+                balance_zero, hold_zero = _is_zero(balance), _is_zero(hold)
+                if balance_zero and hold_zero:
+                    continue
                 
-                if balance > 0 or hold > 0:
-                    balances[currency] = {
-                        "balance": str(balance),
-                        "hold": str(hold),
-                        "total": str(balance + hold)
-                    }
+                if hold_zero:
+                    total = balance
+                elif balance_zero:
+                    total = hold
+                else:
+                    total = str(Decimal(balance) + Decimal(hold))
+                
+                balances[account['currency']] = {
+                    "balance": balance,
+                    "hold": hold,
+                    "total": total
+                }
             
-            self.logger.info(f"✅ Balance fetched: {len(balances)} assets")
+            self.logger.info("✅ Balance fetched: %s assets", len(balances))
             return balances
         except Exception as e:
-            self.logger.error(f"❌ Error fetching balance: {str(e)}")
+            self.logger.error("❌ Error fetching balance: %s", e)
             raise
     
     async def get_transactions(self, limit: int = 100) -> List[Dict[str, Any]]:
-        """Get transaction history"""
+        """
+        Get transaction history
+        
+        Args:
+            limit: Maximum ledger entries per account
+        
+        Returns:
+            Up to `limit` entries from each non-empty account, newest first
+        """
         try:
-            accounts = self.client.get_accounts()
-            transactions = []
+            accounts = [
+                account for account in await self._accounts()
+                if not (_is_zero(account['balance']) and _is_zero(account['hold']))
+            ]
             
-            for account in accounts:
-                if account['balance'] == '0' and account['hold'] == '0':
-                    continue
-                
-                ledger = self.client.get_account_ledger(account['id'])
-                
-                for entry in ledger[:limit]:
-                    transactions.append({
-                        "id": entry.get('id'),
-                        "type": entry.get('type'),
-                        "amount": entry.get('amount'),
-                        "currency": entry.get('currency'),
-                        "created_at": entry.get('created_at'),
-                        "details": entry.get('details', {})
-                    })
+            # Ledgers are independent: fetch them concurrently off the event loop
+            ledgers = await asyncio.gather(
+                *[self._call(self._fetch_ledger, a['id'], limit) for a in accounts]
+            )
             
-            self.logger.info(f"✅ Fetched {len(transactions)} transactions")
-            return sorted(transactions, key=lambda x: x['created_at'], reverse=True)
+            # Precondition: each ledger is newest first (_fetch_ledger sorts
+            # it), so a K-way merge orders them without re-sorting everything
+            merged = heapq.merge(*ledgers, key=_by_created_at, reverse=True)
+            transactions = [
+                {
+                    "id": entry['id'],
+                    "type": entry['type'],
+                    "amount": entry['amount'],
+                    "currency": entry.get('currency'),
+                    "created_at": entry['created_at'],
+                    "details": entry.get('details', {})
+                }
+                for entry in merged
+            ]
+            
+            self.logger.info("✅ Fetched %s transactions", len(transactions))
+            return transactions
         except Exception as e:
-            self.logger.error(f"❌ Error fetching transactions: {str(e)}")
+            self.logger.exception("❌ Error fetching transactions: %s", e)
             return []
     
     async def get_fills(self, product_id: Optional[str] = None, limit: int = 100) -> List[Dict]:
         """Get trading fills"""
         try:
-            fills = self.client.get_fills(product_id=product_id)
+            fills = await self._call(self._fetch_fills, product_id, limit)
             
-            return [
-                {
-                    "id": f['id'],
-                    "order_id": f['order_id'],
-                    "trade_id": f['trade_id'],
-                    "product_id": f['product_id'],
-                    "side": f['side'],
-                    "price": f['price'],
-                    "size": f['size'],
-                    "fee": f['fee'],
-                    "created_at": f['created_at']
-                }
-                for f in fills[:limit]
-            ]
+            return [dict(zip(FILL_FIELDS, _fill_values(f))) for f in fills]
         except Exception as e:
-            self.logger.error(f"❌ Error fetching fills: {str(e)}")
+            self.logger.exception("❌ Error fetching fills: %s", e)
             return []
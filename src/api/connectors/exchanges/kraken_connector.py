@@ -7,23 +7,54 @@ Kraken Exchange Connector
 Real-time integration with Kraken API.
 """
 
-import asyncio
+import base64
+import hashlib
+import heapq
+import hmac
+import json
 import logging
 from typing import Dict, List, Optional, Any
 from decimal import Decimal
+from datetime import datetime
+from urllib.parse import urlencode
 import time
 
+import aiohttp
+
+from src.api.connectors.base_connector import TenantLoggerAdapter
+
 try:
-    import krakenex
+    import orjson
 except ImportError:
-    krakenex = None
+    orjson = None
+
+# Decode raw response bytes directly, with orjson when available
+_json_loads = orjson.loads if orjson is not None else json.loads
 
 logger = logging.getLogger(__name__)
+_LOGGER = logging.getLogger("connector.kraken")
+
+_ASSET_PREFIXES = frozenset("XZ")
+
+
+def _clean_asset(asset: str) -> str:
+    """
+    Drop Kraken's legacy asset-class prefix ('X' crypto, 'Z' fiat)
+    
+    Only 4-letter codes carry it (XXBT -> XBT, ZUSD -> USD); a character
+    strip would also eat real leading letters (XXBT -> BT).
+    """
+    if len(asset) == 4 and asset[0] in _ASSET_PREFIXES:
+        return asset[1:]
+    return asset
 
 
 class KrakenConnector:
     """Kraken exchange connector"""
     
+    API_URL = "https://api.kraken.com"
+    API_VERSION = "0"
+    
     def __init__(self, api_key: str, api_secret: str):
         """
         Initialize Kraken connector
@@ -32,26 +63,75 @@ class KrakenConnector:
             api_key: API key
             api_secret: API secret
         """
-        if not krakenex:
-            raise ImportError("krakenex library not installed. pip install krakenex")
-        
         self.api_key = api_key
         self.api_secret = api_secret
-        self.client = krakenex.API(key=api_key, secret=api_secret)
-        self.logger = logging.getLogger(f"connector.kraken.{api_key[:8]}")
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._last_nonce = 0
+        self._log_suffix = api_key[:8]
+        self.logger = TenantLoggerAdapter(_LOGGER, {"tenant": self._log_suffix})
+    
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Get the shared HTTP session (keep-alive pool), creating it on first use"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=10, ttl_dns_cache=300),
+                timeout=aiohttp.ClientTimeout(total=30)
+            )
+        return self._session
+    
+    async def close(self):
+        """Close the shared HTTP session"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+    
+    def _nonce(self) -> int:
+        """Strictly increasing nonce, even for calls in the same millisecond"""
+        self._last_nonce = max(self._last_nonce + 1, int(time.time() * 1000))
+        return self._last_nonce
+    
+    async def _query_private(self, method: str, data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        POST a signed request to a private Kraken endpoint
+        
+        Args:
+            method: API method (e.g. Balance, QueryLedgers)
+            data: Request parameters
+        
+        Returns:
+            Raw response ({"error": [...], "result": {...}}), as krakenex returns it
+        """
+        urlpath = f"/{self.API_VERSION}/private/{method}"
+        data = dict(data or {})
+        data["nonce"] = self._nonce()
+        postdata = urlencode(data)
+        
+        # API-Sign = HMAC-SHA512(path + SHA256(nonce + postdata)) keyed with the decoded secret
+        message = urlpath.encode() + hashlib.sha256((str(data["nonce"]) + postdata).encode()).digest()
+        signature = hmac.new(base64.b64decode(self.api_secret), message, hashlib.sha512)
+        headers = {
+            "API-Key": self.api_key,
+            "API-Sign": base64.b64encode(signature.digest()).decode(),
+            "Content-Type": "application/x-www-form-urlencoded; charset=utf-8"
+        }
+        
+        session = await self._get_session()
+        async with session.post(f"{self.API_URL}{urlpath}", data=postdata, headers=headers) as resp:
+            resp.raise_for_status()
+            return _json_loads(await resp.read())
     
     async def validate_connection(self) -> bool:
         """Validate Kraken connection"""
         try:
-            result = self.client.query_private('Balance')
-            if result:  # Check for errors
-                self.logger.error(f"❌ Kraken error: {result}")
+            response = await self._query_private('Balance')
+            if response.get('error'):
+                self.logger.error("❌ Kraken error: %s", response['error'])
                 return False
             
             self.logger.info("✅ Kraken connection validated")
             return True
         except Exception as e:
-            self.logger.error(f"❌ Connection error: {str(e)}")
+            self.logger.exception("❌ Connection error: %s", e)
             return False
     
     async def get_balance(self) -> Dict[str, Dict[str, Any]]:
@@ -64,16 +144,16 @@ class KrakenConnector:
         }
         """
         try:
-            result = self.client.query_private('Balance')
+            response = await self._query_private('Balance')
             
-            if result:
-                raise Exception(f"Kraken error: {result}")
+            if response.get('error'):
+                raise Exception(f"Kraken error: {response['error']}")
+            result = response['result']
             
             balances = {}
             
             for asset, balance in result.items():
-                # Kraken uses prefixes like 'X' for crypto, 'Z' for fiat
-                clean_asset = asset.lstrip('XZ')
+                clean_asset = _clean_asset(asset)
                 balance_value = Decimal(balance)
                 
                 if balance_value > 0:
@@ -81,24 +161,26 @@ class KrakenConnector:
                         "balance": str(balance_value)
                     }
             
-            self.logger.info(f"✅ Balance fetched: {len(balances)} assets")
+            self.logger.info("✅ Balance fetched: %s assets", len(balances))
             return balances
         except Exception as e:
-            self.logger.error(f"❌ Error fetching balance: {str(e)}")
+            self.logger.error("❌ Error fetching balance: %s", e)
             raise
     
     async def get_transactions(self, limit: int = 100) -> List[Dict[str, Any]]:
         """Get ledger entries"""
         try:
-            result = self.client.query_private('QueryLedgers', {'trades': True})
+            response = await self._query_private('QueryLedgers', {'trades': True})
             
-            if result:
-                raise Exception(f"Kraken error: {result}")
+            if response.get('error'):
+                raise Exception(f"Kraken error: {response['error']}")
+            result = response['result']
             
-            transactions = []
+            # Newest `limit` entries by epoch time; only those get formatted
+            newest = heapq.nlargest(limit, result['ledger'].items(), key=lambda item: item[1].get('time'))
             
-            for ledger_id, entry in result.items():
-                transactions.append({
+            transactions = [
+                {
                     "id": ledger_id,
                     "type": entry.get('type'),
                     "asset": entry.get('asset'),
@@ -106,29 +188,29 @@ class KrakenConnector:
                     "fee": entry.get('fee'),
                     "balance": entry.get('balance'),
                     "timestamp": datetime.fromtimestamp(entry.get('time')).isoformat()
-                })
+                }
+                for ledger_id, entry in newest
+            ]
             
-            # Sort by timestamp descending
-            transactions.sort(key=lambda x: x['timestamp'], reverse=True)
-            
-            self.logger.info(f"✅ Fetched {len(transactions[:limit])} transactions")
-            return transactions[:limit]
+            self.logger.info("✅ Fetched %s transactions", len(transactions))
+            return transactions
         except Exception as e:
-            self.logger.error(f"❌ Error fetching transactions: {str(e)}")
+            self.logger.exception("❌ Error fetching transactions: %s", e)
             return []
     
     async def get_trades(self, limit: int = 100) -> List[Dict[str, Any]]:
         """Get trading history"""
         try:
-            result = self.client.query_private('TradesHistory')
+            response = await self._query_private('TradesHistory')
             
-            if result:
-                raise Exception(f"Kraken error: {result}")
+            if response.get('error'):
+                raise Exception(f"Kraken error: {response['error']}")
+            result = response['result']
             
-            trades = []
+            newest = heapq.nlargest(limit, result['trades'].items(), key=lambda item: item[1].get('time'))
             
-            for trade_id, trade in result.items():
-                trades.append({
+            trades = [
+                {
                     "id": trade_id,
                     "pair": trade.get('pair'),
                     "type": trade.get('type'),
@@ -138,12 +220,12 @@ class KrakenConnector:
                     "fee": trade.get('fee'),
                     "vol": trade.get('vol'),
                     "time": datetime.fromtimestamp(trade.get('time')).isoformat()
-                })
-            
-            trades.sort(key=lambda x: x['time'], reverse=True)
+                }
+                for trade_id, trade in newest
+            ]
             
-            self.logger.info(f"✅ Fetched {len(trades[:limit])} trades")
-            return trades[:limit]
+            self.logger.info("✅ Fetched %s trades", len(trades))
+            return trades
         except Exception as e:
-            self.logger.error(f"❌ Error fetching trades: {str(e)}")
+            self.logger.exception("❌ Error fetching trades: %s", e)
             return []
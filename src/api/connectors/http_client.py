@@ -0,0 +1,148 @@
+# src/api/connectors/http_client.py
+
+"""
+Shared HTTP Client
+==================
+
+One pooled async HTTP client for the RPC connectors (Solana, Aave,
+Uniswap), plus JSON-RPC single and batch helpers on top of it. With
+HTTP/2 many in-flight RPC calls share a single connection per endpoint
+as multiplexed streams. httpx has no websocket client, so subscriptions
+share one aiohttp session instead (get_ws_session).
+"""
+
+import asyncio
+import itertools
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+import aiohttp
+import httpx
+
+try:
+    import h2  # noqa: F401  (enables httpx HTTP/2 support)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 100
+
+_client: Optional[httpx.AsyncClient] = None
+_ws_session: Optional[aiohttp.ClientSession] = None
+_request_ids = itertools.count(1)
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Get the shared async client, creating it on first use"""
+    global _client
+    if _client is None or _client.is_closed:
+        if not HTTP2_AVAILABLE:
+            logger.warning("h2 not installed, RPC calls fall back to HTTP/1.1. pip install httpx[http2]")
+        _client = httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+            timeout=30.0
+        )
+    return _client
+
+
+def get_ws_session() -> aiohttp.ClientSession:
+    """Get the shared websocket session, creating it on first use"""
+    global _ws_session
+    if _ws_session is None or _ws_session.closed:
+        _ws_session = aiohttp.ClientSession()
+    return _ws_session
+
+
+async def close_http_client():
+    """Close the shared async client and websocket session"""
+    global _client, _ws_session
+    if _client is not None and not _client.is_closed:
+        await _client.aclose()
+    _client = None
+    if _ws_session is not None and not _ws_session.closed:
+        await _ws_session.close()
+    _ws_session = None
+
+
+async def json_rpc(
+    url: str,
+    method: str,
+    params: Optional[list] = None,
+    headers: Optional[Dict[str, str]] = None
+) -> Any:
+    """Send one JSON-RPC request and return its result"""
+    payload = {
+        "jsonrpc": "2.0",
+        "id": next(_request_ids),
+        "method": method,
+        "params": params or []
+    }
+    resp = await get_http_client().post(url, json=payload, headers=headers)
+    resp.raise_for_status()
+    data = resp.json()
+
+    if "error" in data:
+        raise Exception(f"RPC error: {data['error'].get('message')}")
+    return data["result"]
+
+
+async def _json_rpc_chunk(
+    url: str,
+    calls: List[Tuple[str, list]],
+    headers: Optional[Dict[str, str]]
+) -> List[Optional[Any]]:
+    """Send one batch array, falling back to parallel single calls if rejected"""
+    payload = [
+        {"jsonrpc": "2.0", "id": i, "method": method, "params": params}
+        for i, (method, params) in enumerate(calls)
+    ]
+
+    try:
+        resp = await get_http_client().post(url, json=payload, headers=headers)
+        resp.raise_for_status()
+        data = resp.json()
+
+        if not isinstance(data, list):
+            # Providers that refuse batches answer with a single error object
+            raise Exception(f"Batch rejected: {data.get('error')}")
+
+        # Batch responses may come back in any order: match them by id
+        by_id = {r.get("id"): r for r in data}
+        return [by_id.get(i, {}).get("result") for i in range(len(calls))]
+    except Exception as e:
+        logger.warning("Batch JSON-RPC failed, using parallel calls: %s", e)
+
+    results = await asyncio.gather(
+        *[json_rpc(url, method, params, headers) for method, params in calls],
+        return_exceptions=True
+    )
+    return [None if isinstance(r, Exception) else r for r in results]
+
+
+async def json_rpc_batch(
+    url: str,
+    calls: List[Tuple[str, list]],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    headers: Optional[Dict[str, str]] = None
+) -> List[Optional[Any]]:
+    """
+    Send JSON-RPC calls as batch requests (one round trip per chunk)
+
+    Args:
+        url: RPC endpoint
+        calls: List of (method, params) tuples
+        batch_size: Maximum calls per batch request
+        headers: Extra request headers (optional)
+
+    Returns:
+        Results in the same order as calls (None for failed calls)
+    """
+    if not calls:
+        return []
+
+    chunks = [calls[i:i + batch_size] for i in range(0, len(calls), batch_size)]
+    results = await asyncio.gather(*[_json_rpc_chunk(url, chunk, headers) for chunk in chunks])
+    return [r for chunk in results for r in chunk]
@@ -7,11 +7,12 @@ Connector Manager
 Orchestrates all connector instances.
 """
 
+import asyncio
 import logging
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from enum import Enum
-from src.api.connectors.tokens.bridged_token_detector import BridgedTokenDetector
-from src.api.connectors.tokens.wrapped_token_detector import WrappedTokenDetector
+from src.api.connectors.tokens.bridged_token_detector import get_bridged_detector
+from src.api.connectors.tokens.wrapped_token_detector import get_wrapped_detector
 
 logger = logging.getLogger(__name__)
 
@@ -30,46 +31,55 @@ class ConnectorManager:
     
     def __init__(self):
         """Initialize connector manager"""
-        self.connectors = {}
-        self.bridged_detector = BridgedTokenDetector()
-        self.wrapped_detector = WrappedTokenDetector()
+        # (connector_type, name) -> connector
+        self.connectors: Dict[Tuple[str, str], Any] = {}
+        self.bridged_detector = get_bridged_detector()
+        self.wrapped_detector = get_wrapped_detector()
         self.logger = logging.getLogger("connector.manager")
     
     def register_exchange(self, name: str, connector):
         """Register exchange connector"""
-        self.connectors[f"exchange:{name}"] = connector
-        self.logger.info(f"✅ Registered exchange: {name}")
+        self.connectors[("exchange", name)] = connector
+        self.logger.info("✅ Registered exchange: %s", name)
     
     def register_blockchain(self, name: str, connector):
         """Register blockchain connector"""
-        self.connectors[f"blockchain:{name}"] = connector
-        self.logger.info(f"✅ Registered blockchain: {name}")
+        self.connectors[("blockchain", name)] = connector
+        self.logger.info("✅ Registered blockchain: %s", name)
     
     def register_wallet(self, name: str, connector):
         """Register wallet connector"""
-        self.connectors[f"wallet:{name}"] = connector
-        self.logger.info(f"✅ Registered wallet: {name}")
+        self.connectors[("wallet", name)] = connector
+        self.logger.info("✅ Registered wallet: %s", name)
     
     def register_defi(self, name: str, connector):
         """Register DeFi connector"""
-        self.connectors[f"defi:{name}"] = connector
-        self.logger.info(f"✅ Registered DeFi: {name}")
+        self.connectors[("defi", name)] = connector
+        self.logger.info("✅ Registered DeFi: %s", name)
     
     def get_connector(self, connector_type: str, name: str):
         """Get connector by type and name"""
-        key = f"{connector_type}:{name}"
-        return self.connectors.get(key)
+        return self.connectors.get((connector_type, name))
     
     async def get_all_balances(self) -> Dict[str, Dict[str, Any]]:
         """Get all balances from all connectors"""
         all_balances = {}
+        if not self.connectors:
+            return all_balances
         
-        for key, connector in self.connectors.items():
-            try:
-                balances = await connector.get_balance()
-                all_balances[key] = balances
-            except Exception as e:
-                self.logger.error(f"Error getting balance from {key}: {str(e)}")
+        # Connectors are independent: query them concurrently
+        keys, connectors = zip(*self.connectors.items())
+        results = await asyncio.gather(
+            *(connector.get_balance() for connector in connectors),
+            return_exceptions=True
+        )
+        
+        for (connector_type, name), result in zip(keys, results):
+            if isinstance(result, Exception):
+                self.logger.error("Error getting balance from %s:%s: %s", connector_type, name, result)
+            else:
+                # Result keys stay "type:name" strings so the mapping is JSON-serialisable
+                all_balances[f"{connector_type}:{name}"] = result
         
         return all_balances
     
@@ -85,27 +95,25 @@ class ConnectorManager:
             Analysis with categorized tokens
         """
         try:
+            # Bridged and wrapped detection are independent: run them concurrently
+            bridged, wrapped = await asyncio.gather(
+                self.bridged_detector.detect_all_bridged_tokens(balances, network),
+                self.wrapped_detector.detect_all_wrapped_tokens(balances, network)
+            )
+            
             analysis = {
                 "canonical": {},
-                "bridged": {},
-                "wrapped": {},
-                "other": balances
+                "bridged": bridged,
+                "wrapped": wrapped,
+                # Built fresh so the caller's balances are never mutated
+                "other": {
+                    addr: balance for addr, balance in balances.items()
+                    if addr not in bridged and addr not in wrapped
+                }
             }
             
-            # Detect bridged tokens
-            bridged = await self.bridged_detector.detect_all_bridged_tokens(balances, network)
-            analysis["bridged"] = bridged
-            
-            # Detect wrapped tokens
-            wrapped = await self.wrapped_detector.detect_all_wrapped_tokens(balances, network)
-            analysis["wrapped"] = wrapped
-            
-            # Remove detected tokens from "other"
-            for addr in list(bridged.keys()) + list(wrapped.keys()):
-                analysis["other"].pop(addr, None)
-            
-            self.logger.info(f"✅ Token analysis complete")
+            self.logger.info("✅ Token analysis complete")
             return analysis
         except Exception as e:
-            self.logger.error(f"❌ Error analyzing tokens: {str(e)}")
+            self.logger.exception("❌ Error analyzing tokens: %s", e)
             return {"error": str(e)}        
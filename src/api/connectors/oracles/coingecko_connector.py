@@ -8,99 +8,214 @@ Real-time price data and market data from CoinGecko.
 """
 
 import asyncio
+import json
 import logging
-from typing import Dict, List, Optional, Any
+import time
+from typing import Dict, List, Optional, Any, Tuple
 from decimal import Decimal
 import aiohttp
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Decode raw response bytes directly, with orjson when available
+_json_loads = orjson.loads if orjson is not None else json.loads
+
 logger = logging.getLogger(__name__)
 
 
 class CoinGeckoOracle:
     """CoinGecko price oracle"""
     
+    # get_price calls arriving within BATCH_WINDOW share one /simple/price
+    # request; a batch is sent early once it holds BATCH_MAX_IDS ids
+    BATCH_WINDOW = 0.02  # seconds
+    BATCH_MAX_IDS = 50
+    
+    # get_prices_batch splits larger id lists into concurrent requests of
+    # at most PRICE_CHUNK_IDS ids, keeping URLs well under CoinGecko's limit
+    PRICE_CHUNK_IDS = 100
+    
     def __init__(self):
         """Initialize CoinGecko oracle"""
         self.base_url = "https://api.coingecko.com/api/v3"
         self.logger = logging.getLogger("oracle.coingecko")
-        self.cache = {}
+        # (token_id, vs_currency) -> (fetched_at, price)
+        self.cache: Dict[Tuple[str, str], Tuple[float, Decimal]] = {}
         self.cache_ttl = 300  # 5 minutes
+        # Requests in flight, so concurrent callers for a price share one GET
+        self._inflight: Dict[Tuple[str, str], asyncio.Future] = {}
+        # vs_currency -> {token_id: future} waiting for the next batch
+        self._pending: Dict[str, Dict[str, asyncio.Future]] = {}
+        self._batch_tasks: set = set()
+        self._session: Optional[aiohttp.ClientSession] = None
+    
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Get the shared HTTP session (keep-alive pool), creating it on first use"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=32,
+                    ttl_dns_cache=300,
+                    keepalive_timeout=60
+                ),
+                timeout=aiohttp.ClientTimeout(total=30)
+            )
+        return self._session
+    
+    async def close(self):
+        """Close the shared HTTP session"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+    
+    async def __aenter__(self) -> "CoinGeckoOracle":
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+    
+    def _cached_price(self, token_id: str, vs_currency: str) -> Optional[Decimal]:
+        """Return a cached price if it is younger than cache_ttl"""
+        cached = self.cache.get((token_id, vs_currency))
+        if cached and time.time() - cached[0] < self.cache_ttl:
+            return cached[1]
+        return None
     
     async def get_price(self, token_id: str, vs_currency: str = "usd") -> Optional[Decimal]:
-        """Get token price"""
+        """Get token price (cached for cache_ttl seconds)"""
+        price = self._cached_price(token_id, vs_currency)
+        if price is not None:
+            return price
+        
+        key = (token_id, vs_currency)
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            return await asyncio.shield(inflight)
+        
+        future = self._enqueue(token_id, vs_currency)
+        self._inflight[key] = future
+        future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(future)
+    
+    def _enqueue(self, token_id: str, vs_currency: str) -> asyncio.Future:
+        """Add a token to the pending batch for vs_currency"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        pending = self._pending.setdefault(vs_currency, {})
+        pending[token_id] = future
+        
+        if len(pending) >= self.BATCH_MAX_IDS:
+            self._start_flush(vs_currency)
+        elif len(pending) == 1:
+            loop.call_later(self.BATCH_WINDOW, self._start_flush, vs_currency)
+        return future
+    
+    def _start_flush(self, vs_currency: str) -> None:
+        """Send the pending batch for vs_currency in the background"""
+        pending = self._pending.pop(vs_currency, None)
+        if not pending:
+            return
+        task = asyncio.ensure_future(self._flush(pending, vs_currency))
+        self._batch_tasks.add(task)
+        task.add_done_callback(self._batch_tasks.discard)
+    
+    async def _flush(self, pending: Dict[str, asyncio.Future], vs_currency: str) -> None:
+        """Fetch a batch of prices and resolve the waiting futures"""
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    f"{self.base_url}/simple/price",
-                    params={
-                        "ids": token_id,
-                        "vs_currencies": vs_currency,
-                        "include_market_cap": "true",
-                        "include_24hr_vol": "true"
-                    }
-                ) as resp:
-                    if resp.status == 200:
-                        data = await resp.json()
-                        price = data.get(token_id, {}).get(vs_currency)
-                        
-                        if price:
-                            self.logger.info(f"✅ {token_id.upper()}: ${price}")
-                            return Decimal(str(price))
-                        else:
-                            raise Exception(f"Price not found for {token_id}")
-                    else:
-                        raise Exception(f"API error: {resp.status}")
+            prices = await self.get_prices_batch(list(pending), vs_currency)
+        except asyncio.CancelledError:
+            for future in pending.values():
+                future.cancel()
+            raise
         except Exception as e:
-            self.logger.error(f"❌ Error fetching price: {str(e)}")
-            return None
+            # Every caller waiting on this batch gets the failure, none hangs
+            for future in pending.values():
+                if not future.done():
+                    future.set_exception(e)
+            return
+        
+        for token_id, future in pending.items():
+            if not future.done():
+                if token_id not in prices:
+                    self.logger.warning("Price not found for %s", token_id)
+                future.set_result(prices.get(token_id))
     
     async def get_prices_batch(self, token_ids: List[str], vs_currency: str = "usd") -> Dict[str, Decimal]:
-        """Get multiple token prices"""
+        """Get multiple token prices (only uncached ones are requested)"""
+        prices = {}
+        stale = []
+        for token_id in token_ids:
+            price = self._cached_price(token_id, vs_currency)
+            if price is not None:
+                prices[token_id] = price
+            else:
+                stale.append(token_id)
+        
+        if not stale:
+            return prices
+        
+        # Chunks keep each URL short; they are requested concurrently
+        chunk = self.PRICE_CHUNK_IDS
+        results = await asyncio.gather(
+            *(self._fetch_prices(stale[i:i + chunk], vs_currency) for i in range(0, len(stale), chunk))
+        )
+        for fetched in results:
+            prices.update(fetched)
+        
+        self.logger.info("✅ Fetched %s prices (%s cached)", len(prices), len(token_ids) - len(stale))
+        return prices
+    
+    async def _fetch_prices(self, token_ids: List[str], vs_currency: str) -> Dict[str, Decimal]:
+        """Request one /simple/price chunk and cache the prices it returns"""
+        prices = {}
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    f"{self.base_url}/simple/price",
-                    params={
-                        "ids": ",".join(token_ids),
-                        "vs_currencies": vs_currency
-                    }
-                ) as resp:
-                    if resp.status == 200:
-                        data = await resp.json()
-                        
-                        prices = {
-                            token_id: Decimal(str(data[token_id][vs_currency]))
-                            for token_id in token_ids
-                            if token_id in data
-                        }
-                        
-                        self.logger.info(f"✅ Fetched {len(prices)} prices")
-                        return prices
-                    else:
-                        raise Exception(f"API error: {resp.status}")
+            session = await self._get_session()
+            async with session.get(
+                f"{self.base_url}/simple/price",
+                params={
+                    "ids": ",".join(token_ids),
+                    "vs_currencies": vs_currency
+                }
+            ) as resp:
+                if resp.status == 200:
+                    data = _json_loads(await resp.read())
+                    now = time.time()
+                    
+                    for token_id in token_ids:
+                        if token_id in data:
+                            price = Decimal(str(data[token_id][vs_currency]))
+                            self.cache[(token_id, vs_currency)] = (now, price)
+                            prices[token_id] = price
+                    
+                    return prices
+                else:
+                    raise Exception(f"API error: {resp.status}")
         except Exception as e:
-            self.logger.error(f"❌ Error fetching prices: {str(e)}")
-            return {}
+            self.logger.exception("❌ Error fetching prices: %s", e)
+            return prices
     
     async def get_market_cap(self, token_id: str) -> Optional[Dict[str, Any]]:
         """Get market cap data"""
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    f"{self.base_url}/simple/price",
-                    params={
-                        "ids": token_id,
-                        "vs_currencies": "usd",
-                        "include_market_cap": "true",
-                        "include_24hr_vol": "true",
-                        "include_24hr_change": "true"
-                    }
-                ) as resp:
-                    if resp.status == 200:
-                        data = await resp.json()
-                        return data.get(token_id)
-                    else:
-                        raise Exception(f"API error: {resp.status}")
+            session = await self._get_session()
+            async with session.get(
+                f"{self.base_url}/simple/price",
+                params={
+                    "ids": token_id,
+                    "vs_currencies": "usd",
+                    "include_market_cap": "true",
+                    "include_24hr_vol": "true",
+                    "include_24hr_change": "true"
+                }
+            ) as resp:
+                if resp.status == 200:
+                    data = _json_loads(await resp.read())
+                    return data.get(token_id)
+                else:
+                    raise Exception(f"API error: {resp.status}")
         except Exception as e:
-            self.logger.error(f"❌ Error fetching market data: {str(e)}")
+            self.logger.exception("❌ Error fetching market data: %s", e)
             return None
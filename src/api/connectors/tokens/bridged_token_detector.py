@@ -9,14 +9,23 @@ Maps bridge addresses and confirms authenticity.
 """
 
 import logging
-from typing import Dict, List, Optional, Any
+import sys
+from typing import Dict, List, Optional, Any, Tuple
 from decimal import Decimal
 from dataclasses import dataclass
+from types import MappingProxyType
 
 logger = logging.getLogger(__name__)
 
+# One instance per detected token: drop the per-instance __dict__ where
+# dataclasses support it (Python 3.10+)
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
 
-@dataclass
+# Fee reported for bridged tokens, shared instead of parsed per detection
+_DEFAULT_FEE_PCT = Decimal("0.01")
+
+
+@dataclass(frozen=True, **_DATACLASS_SLOTS)
 class BridgeMetadata:
     """Bridged token metadata"""
     original_token: str
@@ -32,27 +41,28 @@ class BridgeMetadata:
 class BridgedTokenDetector:
     """Detects and manages bridged tokens"""
     
-    # Known bridge protocols
+    # Known bridge protocols (tuples: shared, read-only; get_bridge_info
+    # hands out list copies)
     BRIDGE_PROTOCOLS = {
         "circle": {
             "name": "Circle Bridge (CCTP)",
-            "tokens": ["USDC"],
-            "chains": ["ethereum", "arbitrum", "base", "polygon", "optimism", "avalanche"],
+            "tokens": ("USDC",),
+            "chains": ("ethereum", "arbitrum", "base", "polygon", "optimism", "avalanche"),
         },
         "stargate": {
             "name": "Stargate",
-            "tokens": ["USDC", "USDT"],
-            "chains": ["ethereum", "arbitrum", "base", "polygon", "optimism"],
+            "tokens": ("USDC", "USDT"),
+            "chains": ("ethereum", "arbitrum", "base", "polygon", "optimism"),
         },
         "synapse": {
             "name": "Synapse Protocol",
-            "tokens": ["USDC", "USDT", "DAI"],
-            "chains": ["ethereum", "arbitrum", "base", "polygon", "optimism", "avalanche"],
+            "tokens": ("USDC", "USDT", "DAI"),
+            "chains": ("ethereum", "arbitrum", "base", "polygon", "optimism", "avalanche"),
         },
         "celer": {
             "name": "Celer Bridge",
-            "tokens": ["USDC", "USDT", "USDE"],
-            "chains": ["ethereum", "arbitrum", "base", "polygon", "optimism"],
+            "tokens": ("USDC", "USDT", "USDE"),
+            "chains": ("ethereum", "arbitrum", "base", "polygon", "optimism"),
         }
     }
     
@@ -98,13 +108,49 @@ class BridgedTokenDetector:
         }
     }
     
+    # (network, bridged address) -> (ethereum address, token data);
+    # filled from KNOWN_BRIDGED_TOKENS by _build_index()
+    _BRIDGE_INDEX: Dict[Tuple[str, str], Tuple[str, Dict[str, Any]]] = {}
+    # network -> bridged addresses known on it
+    _BY_NETWORK: Dict[str, frozenset] = {}
+    # token symbol -> first BRIDGE_PROTOCOLS entry that carries it
+    _SYMBOL_INDEX: Dict[str, Tuple[str, Dict[str, Any]]] = {}
+    
+    # (lowercased address, network) -> detected token, shared by all
+    # instances; hits are frozen, so callers share the one instance.
+    # Only hits are stored, so the cache is bounded by KNOWN_BRIDGED_TOKENS:
+    # a miss is one index lookup and arbitrary addresses never accumulate
+    _detect_cache: Dict[Tuple[str, str], BridgeMetadata] = {}
+    
+    @classmethod
+    def _build_index(cls) -> None:
+        """Index KNOWN_BRIDGED_TOKENS by (network, bridged address) and BRIDGE_PROTOCOLS by symbol"""
+        cls._BRIDGE_INDEX = {
+            (network, bridged_addr): (eth_token, data)
+            for eth_token, data in cls.KNOWN_BRIDGED_TOKENS.items()
+            for network, bridged_addr in data["bridges"].items()
+        }
+        by_network: Dict[str, set] = {}
+        for network, bridged_addr in cls._BRIDGE_INDEX:
+            by_network.setdefault(network, set()).add(bridged_addr)
+        cls._BY_NETWORK = {network: frozenset(addrs) for network, addrs in by_network.items()}
+        
+        cls._SYMBOL_INDEX = {}
+        for protocol, data in cls.BRIDGE_PROTOCOLS.items():
+            for token in data["tokens"]:
+                cls._SYMBOL_INDEX.setdefault(token, (protocol, data))
+    
     def __init__(self):
         """Initialize bridged token detector"""
         self.logger = logging.getLogger("detector.bridged_tokens")
     
-    async def detect_bridged_token(self, 
-                                   token_address: str,
-                                   network: str) -> Optional[BridgeMetadata]:
+    def _lookup_entry(self, token_address: str, network: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """(ethereum address, token data) for a lowercased bridged address, or None"""
+        return self._BRIDGE_INDEX.get((network, token_address))
+    
+    def detect_bridged_token(self,
+                             token_address: str,
+                             network: str) -> Optional[BridgeMetadata]:
         """
         Detect if token is bridged and get metadata
         
@@ -115,30 +161,36 @@ class BridgedTokenDetector:
         Returns:
             BridgeMetadata or None
         """
-        try:
-            # Check if token matches known bridged patterns
-            token_address = token_address.lower()
-            
-            # Look up in known bridged tokens
-            for eth_token, data in self.KNOWN_BRIDGED_TOKENS.items():
-                if data["bridges"].get(network) == token_address:
-                    self.logger.info(f"✅ Detected bridged token: {data['name']} on {network}")
-                    
-                    return BridgeMetadata(
-                        original_token=data["name"],
-                        original_chain="ethereum",
-                        bridge_address=eth_token,
-                        bridge_protocol=self._detect_bridge_protocol(token_address, network),
-                        canonical_address=token_address,
-                        wrapped_address=token_address,
-                        fee_percentage=Decimal("0.01"),
-                        is_canonical=False
-                    )
-            
-            return None
-        except Exception as e:
-            self.logger.error(f"❌ Error detecting bridged token: {str(e)}")
+        return self._detect_lowered(token_address.lower(), network)
+    
+    def _detect_lowered(self, token_address: str, network: str) -> Optional[BridgeMetadata]:
+        """detect_bridged_token for an address that is already lowercased"""
+        key = (token_address, network)
+        metadata = self._detect_cache.get(key)
+        if metadata is not None:
+            return metadata
+        
+        # Look up in known bridged tokens
+        hit = self._lookup_entry(token_address, network)
+        if hit is None:
             return None
+        
+        eth_token, data = hit
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info("✅ Detected bridged token: %s on %s", data['name'], network)
+        
+        metadata = BridgeMetadata(
+            original_token=data["name"],
+            original_chain="ethereum",
+            bridge_address=eth_token,
+            bridge_protocol=self._detect_bridge_protocol(token_address, network),
+            canonical_address=token_address,
+            wrapped_address=token_address,
+            fee_percentage=_DEFAULT_FEE_PCT,
+            is_canonical=False
+        )
+        self._detect_cache[key] = metadata
+        return metadata
     
     async def detect_all_bridged_tokens(self, 
                                        balances: Dict[str, Any],
@@ -154,22 +206,24 @@ class BridgedTokenDetector:
             Dict of detected bridged tokens
         """
         try:
-            bridged_tokens = {}
-            
-            for token_address, balance_info in balances.items():
-                metadata = await self.detect_bridged_token(token_address, network)
-                if metadata:
-                    bridged_tokens[token_address] = metadata
+            # Lowercase each address once; only those in this network's
+            # bridge set need a lookup
+            lowered = {token_address.lower(): token_address for token_address in balances}
+            hits = lowered.keys() & self._BY_NETWORK.get(network, frozenset())
+            bridged_tokens = {
+                lowered[address]: self._detect_lowered(address, network)
+                for address in hits
+            }
             
-            self.logger.info(f"✅ Detected {len(bridged_tokens)} bridged tokens")
+            self.logger.info("✅ Detected %s bridged tokens", len(bridged_tokens))
             return bridged_tokens
         except Exception as e:
-            self.logger.error(f"❌ Error detecting bridged tokens: {str(e)}")
+            self.logger.exception("❌ Error detecting bridged tokens: %s", e)
             return {}
     
-    async def get_canonical_token(self, 
-                                 token_address: str,
-                                 network: str) -> Optional[Dict[str, str]]:
+    def get_canonical_token(self,
+                           token_address: str,
+                           network: str) -> Optional[Dict[str, str]]:
         """
         Get canonical (original) token information
         
@@ -180,41 +234,68 @@ class BridgedTokenDetector:
         Returns:
             Canonical token info or None
         """
-        try:
-            metadata = await self.detect_bridged_token(token_address, network)
-            
-            if metadata:
-                return {
-                    "name": metadata.original_token,
-                    "chain": metadata.original_chain,
-                    "address": metadata.bridge_address,
-                    "is_canonical": metadata.is_canonical
-                }
-            
-            return None
-        except Exception as e:
-            self.logger.error(f"❌ Error getting canonical token: {str(e)}")
+        # Straight from the index: no BridgeMetadata is needed for these fields
+        hit = self._lookup_entry(token_address.lower(), network)
+        if hit is None:
             return None
+        
+        eth_token, data = hit
+        return {
+            "name": data["name"],
+            "chain": "ethereum",
+            "address": eth_token,
+            "is_canonical": False
+        }
     
-    async def get_bridge_info(self, token_symbol: str) -> Optional[Dict[str, Any]]:
+    def get_bridge_info(self, token_symbol: str) -> Optional[Dict[str, Any]]:
         """Get bridge information for token"""
-        try:
-            for protocol, data in self.BRIDGE_PROTOCOLS.items():
-                if token_symbol in data["tokens"]:
-                    return {
-                        "protocol": protocol,
-                        "name": data["name"],
-                        "supported_chains": data["chains"],
-                        "tokens": data["tokens"]
-                    }
-            
-            return None
-        except Exception as e:
-            self.logger.error(f"❌ Error getting bridge info: {str(e)}")
+        hit = self._SYMBOL_INDEX.get(token_symbol)
+        if hit is None:
             return None
+        
+        protocol, data = hit
+        return {
+            "protocol": protocol,
+            "name": data["name"],
+            "supported_chains": list(data["chains"]),
+            "tokens": list(data["tokens"])
+        }
     
     def _detect_bridge_protocol(self, token_address: str, network: str) -> str:
         """Infer bridge protocol from token characteristics"""
         # This would use more sophisticated detection
         # For now, return generic bridge
         return "cross-chain-bridge"
+
+
+# Addresses are matched lowercased, so the table is normalised once at import.
+#
+# Both tables are exposed read-only, since the indexes share their entries.
+#
+# The indexes are derived from these in-code tables and are ready as soon as
+# the module loads. The only runtime state is _detect_cache, which holds
+# BridgeMetadata for table entries already queried; misses are not kept. It
+# refills with one index lookup per token, so nothing is persisted.
+BridgedTokenDetector.KNOWN_BRIDGED_TOKENS = MappingProxyType({
+    eth_token.lower(): MappingProxyType({
+        **data,
+        "bridges": MappingProxyType({network: addr.lower() for network, addr in data["bridges"].items()})
+    })
+    for eth_token, data in BridgedTokenDetector.KNOWN_BRIDGED_TOKENS.items()
+})
+BridgedTokenDetector.BRIDGE_PROTOCOLS = MappingProxyType({
+    protocol: MappingProxyType(data)
+    for protocol, data in BridgedTokenDetector.BRIDGE_PROTOCOLS.items()
+})
+BridgedTokenDetector._build_index()
+
+
+_bridged_detector = None
+
+
+def get_bridged_detector() -> BridgedTokenDetector:
+    """Get or create the shared bridged token detector"""
+    global _bridged_detector
+    if _bridged_detector is None:
+        _bridged_detector = BridgedTokenDetector()
+    return _bridged_detector
@@ -9,13 +9,24 @@ Maps wrapper contracts and underlying tokens.
 """
 
 import logging
-from typing import Dict, List, Optional, Any
+import sys
+from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass
+from types import MappingProxyType
 
 logger = logging.getLogger(__name__)
 
+# dataclass(slots=True) needs Python 3.10+; 3.9 keeps the instance __dict__
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
 
-@dataclass
+
+def _lookup_key(address: str) -> str:
+    """Key an address is matched on: hex (EVM) addresses are case-insensitive,
+    base58 ones (Solana mints) are not and are kept as given"""
+    return address.lower() if address.startswith(("0x", "0X")) else address
+
+
+@dataclass(frozen=True, **_DATACLASS_SLOTS)
 class WrappedTokenInfo:
     """Wrapped token information"""
     wrapper_address: str
@@ -103,13 +114,39 @@ class WrappedTokenDetector:
         "w-": {"type": "wrapped", "example": "W-ETH"},
     }
     
+    # network -> {lowercased underlying symbol: first wrapper address};
+    # filled from STANDARD_WRAPPED_TOKENS by _build_index()
+    _UNDERLYING_INDEX: Dict[str, Dict[str, str]] = {}
+    
+    # network -> {_lookup_key(address): (address as listed, token data)};
+    # filled from STANDARD_WRAPPED_TOKENS by _build_index()
+    _ADDRESS_INDEX: Dict[str, Dict[str, Tuple[str, Any]]] = {}
+    
+    # (_lookup_key(address), network) -> detected token; class-level so every
+    # instance reuses the same detections. Only hits are stored, so the
+    # cache is bounded by STANDARD_WRAPPED_TOKENS: a miss is one dict lookup
+    # and arbitrary addresses never accumulate
+    _detect_cache: Dict[Tuple[str, str], WrappedTokenInfo] = {}
+    
+    @classmethod
+    def _build_index(cls) -> None:
+        """Index STANDARD_WRAPPED_TOKENS by network, address and underlying symbol"""
+        cls._UNDERLYING_INDEX = {}
+        cls._ADDRESS_INDEX = {}
+        for network, tokens in cls.STANDARD_WRAPPED_TOKENS.items():
+            by_underlying = cls._UNDERLYING_INDEX[network] = {}
+            by_address = cls._ADDRESS_INDEX[network] = {}
+            for wrapper_addr, data in tokens.items():
+                by_underlying.setdefault(data["underlying"].lower(), wrapper_addr)
+                by_address[_lookup_key(wrapper_addr)] = (wrapper_addr, data)
+    
     def __init__(self):
         """Initialize wrapped token detector"""
         self.logger = logging.getLogger("detector.wrapped_tokens")
     
-    async def detect_wrapped_token(self, 
-                                  token_address: str,
-                                  network: str) -> Optional[WrappedTokenInfo]:
+    def detect_wrapped_token(self,
+                            token_address: str,
+                            network: str) -> Optional[WrappedTokenInfo]:
         """
         Detect if token is wrapped
         
@@ -120,32 +157,35 @@ class WrappedTokenDetector:
         Returns:
             WrappedTokenInfo or None
         """
-        try:
-            token_address = token_address.lower()
-            
-            # Check in known wrapped tokens
-            if network in self.STANDARD_WRAPPED_TOKENS:
-                tokens = self.STANDARD_WRAPPED_TOKENS[network]
-                
-                if token_address in tokens:
-                    data = tokens[token_address]
-                    
-                    self.logger.info(f"✅ Detected wrapped token: {data['symbol']} on {network}")
-                    
-                    return WrappedTokenInfo(
-                        wrapper_address=token_address,
-                        wrapper_symbol=data["symbol"],
-                        underlying_token=data["underlying"],
-                        underlying_symbol=data["underlying"],
-                        chain=network,
-                        wrap_ratio=1.0,
-                        is_standard=True
-                    )
-            
-            return None
-        except Exception as e:
-            self.logger.error(f"❌ Error detecting wrapped token: {str(e)}")
+        return self._detect_by_key(_lookup_key(token_address), network)
+    
+    def _detect_by_key(self, lookup_key: str, network: str) -> Optional[WrappedTokenInfo]:
+        """detect_wrapped_token for an address already passed through _lookup_key"""
+        key = (lookup_key, network)
+        wrapped_info = self._detect_cache.get(key)
+        if wrapped_info is not None:
+            return wrapped_info
+        
+        # Check in known wrapped tokens
+        entry = self._ADDRESS_INDEX.get(network, {}).get(lookup_key)
+        if entry is None:
             return None
+        wrapper_address, data = entry
+        
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info("✅ Detected wrapped token: %s on %s", data['symbol'], network)
+        
+        wrapped_info = WrappedTokenInfo(
+            wrapper_address=wrapper_address,
+            wrapper_symbol=data["symbol"],
+            underlying_token=data["underlying"],
+            underlying_symbol=data["underlying"],
+            chain=network,
+            wrap_ratio=1.0,
+            is_standard=True
+        )
+        self._detect_cache[key] = wrapped_info
+        return wrapped_info
     
     async def detect_all_wrapped_tokens(self,
                                        balances: Dict[str, Any],
@@ -161,23 +201,25 @@ class WrappedTokenDetector:
             Dict of detected wrapped tokens
         """
         try:
-            wrapped_tokens = {}
-            
-            for token_address, balance_info in balances.items():
-                wrapped_info = await self.detect_wrapped_token(token_address, network)
-                if wrapped_info:
-                    wrapped_tokens[token_address] = wrapped_info
+            # Key each address once; only those among this network's
+            # wrappers need a lookup
+            keyed = {_lookup_key(token_address): token_address for token_address in balances}
+            hits = keyed.keys() & self._ADDRESS_INDEX.get(network, {}).keys()
+            wrapped_tokens = {
+                keyed[key]: self._detect_by_key(key, network)
+                for key in hits
+            }
             
-            self.logger.info(f"✅ Detected {len(wrapped_tokens)} wrapped tokens")
+            self.logger.info("✅ Detected %s wrapped tokens", len(wrapped_tokens))
             return wrapped_tokens
         except Exception as e:
-            self.logger.error(f"❌ Error detecting wrapped tokens: {str(e)}")
+            self.logger.exception("❌ Error detecting wrapped tokens: %s", e)
             return {}
     
-    async def unwrap_value(self, 
-                          token_address: str,
-                          amount: float,
-                          network: str) -> Optional[Dict[str, float]]:
+    def unwrap_value(self,
+                    token_address: str,
+                    amount: float,
+                    network: str) -> Optional[Dict[str, float]]:
         """
         Calculate unwrapped token value
         
@@ -189,60 +231,65 @@ class WrappedTokenDetector:
         Returns:
             Unwrapped value dict or None
         """
-        try:
-            wrapped = await self.detect_wrapped_token(token_address, network)
-            
-            if wrapped:
-                unwrapped_amount = amount * wrapped.wrap_ratio
-                
-                return {
-                    "wrapped_token": wrapped.wrapper_symbol,
-                    "wrapped_amount": amount,
-                    "underlying_token": wrapped.underlying_symbol,
-                    "underlying_amount": unwrapped_amount,
-                    "ratio": wrapped.wrap_ratio
-                }
+        wrapped = self.detect_wrapped_token(token_address, network)
+        
+        if wrapped:
+            unwrapped_amount = amount * wrapped.wrap_ratio
             
-            return None
-        except Exception as e:
-            self.logger.error(f"❌ Error unwrapping value: {str(e)}")
-            return None
+            return {
+                "wrapped_token": wrapped.wrapper_symbol,
+                "wrapped_amount": amount,
+                "underlying_token": wrapped.underlying_symbol,
+                "underlying_amount": unwrapped_amount,
+                "ratio": wrapped.wrap_ratio
+            }
+        
+        return None
     
-    async def get_wrapper_contract(self, 
-                                  underlying_token: str,
-                                  network: str) -> Optional[str]:
+    def get_wrapper_contract(self,
+                            underlying_token: str,
+                            network: str) -> Optional[str]:
         """Get wrapper contract address for underlying token"""
-        try:
-            if network in self.STANDARD_WRAPPED_TOKENS:
-                tokens = self.STANDARD_WRAPPED_TOKENS[network]
-                
-                for wrapper_addr, data in tokens.items():
-                    if data["underlying"].lower() == underlying_token.lower():
-                        return wrapper_addr
-            
-            return None
-        except Exception as e:
-            self.logger.error(f"❌ Error getting wrapper contract: {str(e)}")
-            return None
+        return self._UNDERLYING_INDEX.get(network, {}).get(underlying_token.lower())
     
-    async def get_all_wrappers_for_network(self, network: str) -> List[WrappedTokenInfo]:
+    def get_all_wrappers_for_network(self, network: str) -> List[WrappedTokenInfo]:
         """Get all wrapper tokens available on network"""
-        try:
-            wrappers = []
-            
-            if network in self.STANDARD_WRAPPED_TOKENS:
-                tokens = self.STANDARD_WRAPPED_TOKENS[network]
-                
-                for wrapper_addr, data in tokens.items():
-                    wrappers.append(WrappedTokenInfo(
-                        wrapper_address=wrapper_addr,
-                        wrapper_symbol=data["symbol"],
-                        underlying_token=data["underlying"],
-                        underlying_symbol=data["underlying"],
-                        chain=network
-                    ))
+        wrappers = []
+        
+        if network in self.STANDARD_WRAPPED_TOKENS:
+            tokens = self.STANDARD_WRAPPED_TOKENS[network]
             
-            return wrappers
-        except Exception as e:
-            self.logger.error(f"❌ Error getting wrappers: {str(e)}")
-            return []
+            for wrapper_addr, data in tokens.items():
+                wrappers.append(WrappedTokenInfo(
+                    wrapper_address=wrapper_addr,
+                    wrapper_symbol=data["symbol"],
+                    underlying_token=data["underlying"],
+                    underlying_symbol=data["underlying"],
+                    chain=network
+                ))
+        
+        return wrappers
+
+
+# Every level is read-only so shared lookups cannot be altered by callers.
+# Addresses keep their listed form; matching goes through _ADDRESS_INDEX,
+# which lowercases hex keys only (so the mixed-case polygon WETH matches and
+# the base58 wSOL mint stays valid).
+WrappedTokenDetector.STANDARD_WRAPPED_TOKENS = MappingProxyType({
+    network: MappingProxyType({addr: MappingProxyType(data) for addr, data in tokens.items()})
+    for network, tokens in WrappedTokenDetector.STANDARD_WRAPPED_TOKENS.items()
+})
+# As with the bridged detector, the indexes are rebuilt from code on load and
+# _detect_cache only holds hits for table entries, so nothing is persisted.
+WrappedTokenDetector._build_index()
+
+
+_wrapped_detector = None
+
+
+def get_wrapped_detector() -> WrappedTokenDetector:
+    """Get or create the shared wrapped token detector"""
+    global _wrapped_detector
+    if _wrapped_detector is None:
+        _wrapped_detector = WrappedTokenDetector()
+    return _wrapped_detector
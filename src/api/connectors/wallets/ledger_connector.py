@@ -8,9 +8,11 @@ Integration with Ledger Nano S Plus and Ledger Live.
 Supports multiple networks: Ethereum, Bitcoin, Solana, Polygon.
 """
 
+import asyncio
 import logging
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from enum import Enum
+from functools import lru_cache
 from decimal import Decimal
 
 logger = logging.getLogger(__name__)
@@ -38,6 +40,25 @@ class LedgerNetwork(str, Enum):
     OPTIMISM = "optimism"
 
 
+# Native token per network
+_NETWORK_TOKEN_MAP = {
+    LedgerNetwork.BITCOIN: "BTC",
+    LedgerNetwork.ETHEREUM: "ETH",
+    LedgerNetwork.SOLANA: "SOL",
+    LedgerNetwork.POLYGON: "MATIC",
+}
+
+# Standard BIP44 derivation path per network, as components after "m/";
+# paths are only joined into strings at the device boundary
+_STANDARD_PATH_MAP = {
+    LedgerNetwork.BITCOIN: ("44'", "0'", "0'", "0", "0"),
+    LedgerNetwork.ETHEREUM: ("44'", "60'", "0'", "0", "0"),
+    LedgerNetwork.SOLANA: ("44'", "501'", "0'", "0'"),
+    LedgerNetwork.POLYGON: ("44'", "60'", "0'", "0", "0"),  # Same as Ethereum
+}
+_DEFAULT_PATH = _STANDARD_PATH_MAP[LedgerNetwork.ETHEREUM]
+
+
 class LedgerConnector:
     """Ledger hardware wallet connector"""
     
@@ -57,6 +78,10 @@ class LedgerConnector:
         self.network = network
         self.account_index = account_index
         self.addresses: Dict[str, str] = {}
+        # Address at the standard path, read from the device once
+        self._default_address: Optional[str] = None
+        # The device handles one APDU exchange at a time over USB
+        self._device_sem: Optional[asyncio.Semaphore] = None
         self.logger = logging.getLogger(f"connector.ledger.{network.value}")
         
         try:
@@ -64,16 +89,16 @@ class LedgerConnector:
             # self.ledger_device = LedgerDevice(device_path)
             pass
         except Exception as e:
-            self.logger.error(f"❌ Ledger device not found: {str(e)}")
+            self.logger.error("❌ Ledger device not found: %s", e)
     
     async def validate_connection(self) -> bool:
         """Validate Ledger device connection"""
         try:
             # Check if device is connected and unlocked
-            self.logger.info(f"✅ Ledger device connected ({self.network.value})")
+            self.logger.info("✅ Ledger device connected (%s)", self.network.value)
             return True
         except Exception as e:
-            self.logger.error(f"❌ Connection error: {str(e)}")
+            self.logger.exception("❌ Connection error: %s", e)
             return False
     
     async def get_address(self, derivation_path: Optional[str] = None) -> str:
@@ -92,39 +117,50 @@ class LedgerConnector:
             if not derivation_path:
                 derivation_path = self._get_standard_path()
             
-            # In production, would get address from Ledger
-            # address = self.ledger_device.get_address(derivation_path)
+            # Created lazily so it binds to the running loop (Python 3.9)
+            if self._device_sem is None:
+                self._device_sem = asyncio.Semaphore(1)
             
-            address = "0x" + "0" * 40  # Placeholder
+            async with self._device_sem:
+                # In production, would get address from Ledger
+                # address = self.ledger_device.get_address(derivation_path)
+                
+                address = "0x" + "0" * 40  # Placeholder
             self.addresses[derivation_path] = address
             
-            self.logger.info(f"✅ Address retrieved: {address[:10]}...")
+            # Guarded: runs once per address in get_addresses
+            if self.logger.isEnabledFor(logging.INFO):
+                self.logger.info("✅ Address retrieved: %s...", address[:10])
             return address
         except Exception as e:
-            self.logger.error(f"❌ Error getting address: {str(e)}")
+            self.logger.error("❌ Error getting address: %s", e)
             raise
     
+    async def _get_default_address(self) -> str:
+        """Read the standard-path address from the device and keep it"""
+        self._default_address = await self.get_address()
+        return self._default_address
+    
     async def get_addresses(self, count: int = 5) -> List[str]:
         """Get multiple addresses from Ledger"""
         try:
-            addresses = []
+            # Requested together. _device_sem still runs the device exchanges
+            # one at a time, so on a single connector this only overlaps the
+            # work around them; connectors for other networks overlap fully
+            paths = [self._get_derivation_path(i) for i in range(count)]
+            addresses = await asyncio.gather(*(self.get_address(path) for path in paths))
             
-            for i in range(count):
-                path = self._get_derivation_path(i)
-                addr = await self.get_address(path)
-                addresses.append(addr)
-            
-            self.logger.info(f"✅ Retrieved {len(addresses)} addresses")
+            self.logger.info("✅ Retrieved %s addresses", len(addresses))
             return addresses
         except Exception as e:
-            self.logger.error(f"❌ Error getting addresses: {str(e)}")
+            self.logger.exception("❌ Error getting addresses: %s", e)
             return []
     
     async def get_balance(self, address: Optional[str] = None) -> Dict[str, Any]:
         """Get balance for address on Ledger network"""
         try:
             if not address:
-                address = await self.get_address()
+                address = self._default_address or await self._get_default_address()
             
             # In production, would query blockchain RPC
             balance = {
@@ -134,26 +170,27 @@ class LedgerConnector:
                 "token": self._get_network_token()
             }
             
-            self.logger.info(f"✅ Balance retrieved for {address[:10]}...")
+            if self.logger.isEnabledFor(logging.INFO):
+                self.logger.info("✅ Balance retrieved for %s...", address[:10])
             return balance
         except Exception as e:
-            self.logger.error(f"❌ Error getting balance: {str(e)}")
+            self.logger.error("❌ Error getting balance: %s", e)
             raise
     
     async def get_transactions(self, address: Optional[str] = None, limit: int = 50) -> List[Dict[str, Any]]:
         """Get transaction history"""
         try:
             if not address:
-                address = await self.get_address()
+                address = self._default_address or await self._get_default_address()
             
             transactions = []
             
             # In production, would fetch from blockchain explorer
             
-            self.logger.info(f"✅ Fetched {len(transactions)} transactions")
+            self.logger.info("✅ Fetched %s transactions", len(transactions))
             return transactions
         except Exception as e:
-            self.logger.error(f"❌ Error getting transactions: {str(e)}")
+            self.logger.exception("❌ Error getting transactions: %s", e)
             return []
     
     async def sign_transaction(self, 
@@ -181,14 +218,14 @@ class LedgerConnector:
             self.logger.info("✅ Transaction signed by Ledger device")
             return signed_tx
         except Exception as e:
-            self.logger.error(f"❌ Error signing transaction: {str(e)}")
+            self.logger.error("❌ Error signing transaction: %s", e)
             raise
     
     async def sign_message(self, message: str, address: Optional[str] = None) -> str:
         """Sign message with Ledger device"""
         try:
             if not address:
-                address = await self.get_address()
+                address = self._default_address or await self._get_default_address()
             
             # In production, would sign with Ledger
             # signature = self.ledger_device.sign_message(message, address)
@@ -198,7 +235,7 @@ class LedgerConnector:
             self.logger.info("✅ Message signed by Ledger device")
             return signature
         except Exception as e:
-            self.logger.error(f"❌ Error signing message: {str(e)}")
+            self.logger.error("❌ Error signing message: %s", e)
             raise
     
     async def get_device_info(self) -> Dict[str, Any]:
@@ -215,28 +252,32 @@ class LedgerConnector:
     
     def _get_network_token(self) -> str:
         """Get native token for network"""
-        token_map = {
-            LedgerNetwork.BITCOIN: "BTC",
-            LedgerNetwork.ETHEREUM: "ETH",
-            LedgerNetwork.SOLANA: "SOL",
-            LedgerNetwork.POLYGON: "MATIC",
-        }
-        return token_map.get(self.network, "UNKNOWN")
+        return _NETWORK_TOKEN_MAP.get(self.network, "UNKNOWN")
     
     def _get_standard_path(self) -> str:
         """Get standard BIP44 derivation path for network"""
-        path_map = {
-            LedgerNetwork.BITCOIN: "m/44'/0'/0'/0/0",
-            LedgerNetwork.ETHEREUM: "m/44'/60'/0'/0/0",
-            LedgerNetwork.SOLANA: "m/44'/501'/0'/0'",
-            LedgerNetwork.POLYGON: "m/44'/60'/0'/0/0",  # Same as Ethereum
-        }
-        return path_map.get(self.network, "m/44'/60'/0'/0/0")
+        return _standard_path(self.network)
     
     def _get_derivation_path(self, index: int) -> str:
         """Get derivation path for given index"""
-        base_path = self._get_standard_path()
-        # Replace last index with variable index
-        parts = base_path.split('/')
-        parts[-1] = str(index)
-        return '/'.join(parts)
+        return _derivation_path(self.network, index)
+
+
+# Paths depend only on (network, index): build each one once per process
+
+def _format_path(components: Tuple[str, ...]) -> str:
+    """Derivation path string ("m/44'/60'/...") from its components"""
+    return "m/" + "/".join(components)
+
+
+@lru_cache(maxsize=None)
+def _standard_path(network: LedgerNetwork) -> str:
+    """Standard BIP44 derivation path for network"""
+    return _format_path(_STANDARD_PATH_MAP.get(network, _DEFAULT_PATH))
+
+
+@lru_cache(maxsize=256)
+def _derivation_path(network: LedgerNetwork, index: int) -> str:
+    """Standard path for network with its last component set to index"""
+    base = _STANDARD_PATH_MAP.get(network, _DEFAULT_PATH)
+    return _format_path(base[:-1] + (str(index),))
@@ -10,7 +10,10 @@ Integration with Metamask wallet (via WalletConnect or direct).
 import logging
 from typing import Dict, List, Optional, Any
 
+from src.api.connectors.base_connector import TenantLoggerAdapter
+
 logger = logging.getLogger(__name__)
+_LOGGER = logging.getLogger("connector.metamask")
 
 
 class MetamaskConnector:
@@ -24,7 +27,8 @@ class MetamaskConnector:
             wallet_address: Metamask wallet address
         """
         self.wallet_address = wallet_address
-        self.logger = logging.getLogger(f"connector.metamask.{wallet_address[:10]}")
+        self._log_suffix = wallet_address[:10]
+        self.logger = TenantLoggerAdapter(_LOGGER, {"tenant": self._log_suffix})
     
     async def get_addresses(self) -> List[str]:
         """Get all managed addresses"""
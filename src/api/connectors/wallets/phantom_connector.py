@@ -12,7 +12,10 @@ from typing import Dict, List, Optional, Any
 from decimal import Decimal
 import json
 
+from src.api.connectors.base_connector import TenantLoggerAdapter
+
 logger = logging.getLogger(__name__)
+_LOGGER = logging.getLogger("connector.phantom")
 
 
 class PhantomConnector:
@@ -35,7 +38,8 @@ class PhantomConnector:
         """
         self.wallet_address = wallet_address
         self.network = network
-        self.logger = logging.getLogger(f"connector.phantom.{wallet_address[:10]}")
+        self._log_suffix = wallet_address[:10]
+        self.logger = TenantLoggerAdapter(_LOGGER, {"tenant": self._log_suffix})
         
         if network not in self.SUPPORTED_NETWORKS:
             raise ValueError(f"Unsupported network: {network}")
@@ -45,13 +49,13 @@ class PhantomConnector:
         try:
             # In production, this would check if address exists via RPC
             if not self.wallet_address or len(self.wallet_address) < 32:
-                self.logger.error(f"❌ Invalid wallet address")
+                self.logger.error("❌ Invalid wallet address")
                 return False
             
-            self.logger.info(f"✅ Phantom wallet validated: {self.wallet_address[:10]}...")
+            self.logger.info("✅ Phantom wallet validated: %s...", self.wallet_address[:10])
             return True
         except Exception as e:
-            self.logger.error(f"❌ Connection error: {str(e)}")
+            self.logger.exception("❌ Connection error: %s", e)
             return False
     
     async def get_addresses(self) -> List[str]:
@@ -76,7 +80,7 @@ class PhantomConnector:
                 "network": "solana"
             }
         except Exception as e:
-            self.logger.error(f"❌ Error fetching Solana balance: {str(e)}")
+            self.logger.error("❌ Error fetching Solana balance: %s", e)
             raise
     
     async def get_spl_token_balance(self, token_mint: str) -> Dict[str, Any]:
@@ -89,7 +93,7 @@ class PhantomConnector:
                 "decimals": 0
             }
         except Exception as e:
-            self.logger.error(f"❌ Error fetching SPL token balance: {str(e)}")
+            self.logger.error("❌ Error fetching SPL token balance: %s", e)
             raise
     
     async def get_all_spl_tokens(self) -> List[Dict[str, Any]]:
@@ -98,10 +102,10 @@ class PhantomConnector:
             # Get token accounts for wallet
             tokens = []
             
-            self.logger.info(f"✅ Fetched {len(tokens)} SPL tokens")
+            self.logger.info("✅ Fetched %s SPL tokens", len(tokens))
             return tokens
         except Exception as e:
-            self.logger.error(f"❌ Error fetching SPL tokens: {str(e)}")
+            self.logger.exception("❌ Error fetching SPL tokens: %s", e)
             return []
     
     async def get_transactions(self, limit: int = 50) -> List[Dict[str, Any]]:
@@ -110,10 +114,10 @@ class PhantomConnector:
             # Get transaction signatures from Solana
             transactions = []
             
-            self.logger.info(f"✅ Fetched {len(transactions)} transactions")
+            self.logger.info("✅ Fetched %s transactions", len(transactions))
             return transactions
         except Exception as e:
-            self.logger.error(f"❌ Error fetching transactions: {str(e)}")
+            self.logger.exception("❌ Error fetching transactions: %s", e)
             return []
     
     async def get_nft_collection(self) -> List[Dict[str, Any]]:
@@ -123,10 +127,10 @@ class PhantomConnector:
             
             # Query Metaplex/Magic Eden for NFTs
             
-            self.logger.info(f"✅ Fetched {len(nfts)} NFTs")
+            self.logger.info("✅ Fetched %s NFTs", len(nfts))
             return nfts
         except Exception as e:
-            self.logger.error(f"❌ Error fetching NFTs: {str(e)}")
+            self.logger.exception("❌ Error fetching NFTs: %s", e)
             return []
     
     async def sign_and_send_transaction(self, transaction: Dict[str, Any]) -> Optional[str]:
@@ -144,7 +148,7 @@ class PhantomConnector:
             self.logger.info("Transaction signed via Phantom")
             return None
         except Exception as e:
-            self.logger.error(f"❌ Error signing transaction: {str(e)}")
+            self.logger.error("❌ Error signing transaction: %s", e)
             raise
     
     async def get_wallet_info(self) -> Dict[str, Any]:
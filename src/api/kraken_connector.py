@@ -17,20 +17,79 @@ License: MIT
 """
 
 import logging
+import json
 import hashlib
 import hmac
 import base64
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, Dict, Any, List
 from decimal import Decimal
 from urllib.parse import urlencode
-import requests
 
-from .base_connector import BaseConnector
+from .base_connector import BaseConnector, create_retry_session, parse_json
 
 
 logger = logging.getLogger(__name__)
 
+# Rutas privadas usadas en cada firma, ya codificadas a bytes
+_BALANCE_PATH = b"/0/private/Balance"
+_QUERY_USER_DATA_PATH = b"/0/private/QueryUserData"
+_TRADES_HISTORY_PATH = b"/0/private/TradesHistory"
+_ENCODED_PATHS = {
+    path.decode(): path
+    for path in (_BALANCE_PATH, _QUERY_USER_DATA_PATH, _TRADES_HISTORY_PATH)
+}
+
+# Símbolos propios de Kraken -> símbolo habitual
+_KRAKEN_ASSET_ALIASES = {"XBT": "BTC", "XDG": "DOGE"}
+
+
+def _canonical_asset(symbol: str) -> str:
+    """Símbolo habitual de un activo (XBT -> BTC)."""
+    return _KRAKEN_ASSET_ALIASES.get(symbol, symbol)
+
+
+def _balance_asset(code: str) -> str:
+    """
+    Símbolo habitual de un código de /0/private/Balance.
+    
+    Solo los códigos heredados de 4 letras llevan el prefijo de clase
+    ('X' cripto, 'Z' fiat): XXBT -> XBT -> BTC, ZUSD -> USD. Un lstrip('XZ')
+    se comería letras reales (XXBT -> BT, XTZ -> T).
+    """
+    if len(code) == 4 and code[0] in "XZ":
+        code = code[1:]
+    return _canonical_asset(code)
+
+
+def _match_pair(pair: str, requested: Dict[str, str]) -> Optional[str]:
+    """
+    Activo pedido al que corresponde una llave de par USD de Kraken.
+    
+    Prueba el par tal cual (XTZUSD -> XTZ) y la forma con prefijos
+    heredados (XXBTZUSD -> XXBT -> XBT).
+    
+    Args:
+        pair: Llave del par en la respuesta de Ticker
+        requested: Símbolo habitual -> símbolo pedido
+        
+    Returns:
+        Símbolo pedido o None
+    """
+    candidates = [pair[:-3]]
+    if pair.endswith("ZUSD"):
+        base = pair[:-4]
+        candidates.append(base)
+        if len(base) == 4 and base[0] in "XZ":
+            candidates.append(base[1:])
+    
+    for candidate in candidates:
+        asset = requested.get(_canonical_asset(candidate))
+        if asset is not None:
+            return asset
+    return None
+
 
 class KrakenConnector(BaseConnector):
     """Conector para API de Kraken."""
@@ -41,16 +100,79 @@ class KrakenConnector(BaseConnector):
     BASE_URL = "https://api.kraken.com"
     API_VERSION = "0"
     
-    def __init__(self, api_key: str, api_secret: str):
+    # Requests concurrentes (tickers por activo)
+    MAX_WORKERS = 16
+    
+    # Prefijos de las claves compartidas en Redis
+    REDIS_PRICE_KEY = "kraken:price:"
+    REDIS_BALANCE_KEY = "kraken:bal:"
+    
+    def __init__(self, api_key: str, api_secret: str, redis_client: Optional[Any] = None):
         """
         Inicializa conector de Kraken.
         
         Args:
             api_key: Kraken API key
             api_secret: Kraken API secret
+            redis_client: Cliente Redis (opcional) para compartir las cachés
+                entre workers; sin él se usa solo la caché del proceso
         """
         super().__init__(api_key, api_secret)
-        self.session = requests.Session()
+        self._redis = redis_client
+        
+        # HMAC-SHA512 ya inicializado con el secreto decodificado una vez;
+        # cada firma parte de una copia sin volver a procesar la clave
+        self._hmac_base = hmac.new(base64.b64decode(api_secret), digestmod=hashlib.sha512)
+        # La clave de saldos no expone la API key
+        self._balance_key = (
+            self.REDIS_BALANCE_KEY + hashlib.sha256(api_key.encode()).hexdigest()[:16]
+        )
+        
+        # Una sola sesión keep-alive compartida por todos los hilos de trabajo.
+        # Solo se reintentan los GET públicos: un POST privado reenviado
+        # repetiría un nonce ya usado
+        self.session = create_retry_session(pool_maxsize=self.MAX_WORKERS)
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.MAX_WORKERS,
+            thread_name_prefix="kraken"
+        )
+        
+        # Caché de precios por símbolo
+        self._price_cache: Dict[str, Decimal] = {}
+        self._cache_timestamp: Dict[str, float] = {}
+        self._cache_ttl = 5  # segundos
+        
+        # Caché de saldos (todos los activos con saldo > 0)
+        self._balances_cache: Optional[Dict[str, Decimal]] = None
+        self._balances_timestamp = 0.0
+        self._balances_ttl = 30  # segundos
+    
+    def _redis_get_many(self, keys: List[str]) -> List[Optional[Any]]:
+        """
+        Lee varias claves de Redis con un solo MGET.
+        
+        Si Redis no está configurado o falla, se comporta como un fallo de
+        caché (lista de None) y el conector sigue contra Kraken.
+        """
+        if self._redis is None or not keys:
+            return [None] * len(keys)
+        try:
+            return self._redis.mget(keys)
+        except Exception as e:
+            logger.warning(f"Redis read failed, using local cache: {e}")
+            return [None] * len(keys)
+    
+    def _redis_set_many(self, values: Dict[str, str], ttl: int) -> None:
+        """Escribe varias claves con TTL en un solo pipeline de SETEX."""
+        if self._redis is None or not values:
+            return
+        try:
+            pipe = self._redis.pipeline(transaction=False)
+            for key, value in values.items():
+                pipe.setex(key, ttl, value)
+            pipe.execute()
+        except Exception as e:
+            logger.warning(f"Redis write failed: {e}")
     
     def _generate_signature(self, urlpath: str, data: Dict[str, Any], nonce: str) -> str:
         """
@@ -65,14 +187,12 @@ class KrakenConnector(BaseConnector):
             Firma base64
         """
         postdata = urlencode(data)
-        encoded = (str(nonce) + postdata).encode()
-        message = urlpath.encode() + hashlib.sha256(encoded).digest()
+        encoded = f"{nonce}{postdata}".encode()
+        path_bytes = _ENCODED_PATHS.get(urlpath) or urlpath.encode()
         
-        signature = hmac.new(
-            base64.b64decode(self.api_secret),
-            message,
-            hashlib.sha512
-        )
+        signature = self._hmac_base.copy()
+        signature.update(path_bytes)
+        signature.update(hashlib.sha256(encoded).digest())
         signature_b64 = base64.b64encode(signature.digest()).decode()
         return signature_b64
     
@@ -133,7 +253,7 @@ class KrakenConnector(BaseConnector):
             )
             response.raise_for_status()
             
-            result = response.json()
+            result = parse_json(response)
             if result.get('error'):
                 logger.error(f"Kraken error: {result['error']}")
                 return {}
@@ -155,6 +275,41 @@ class KrakenConnector(BaseConnector):
             Dict símbolo -> saldo
         """
         try:
+            all_balances = self._get_all_balances()
+            if all_balances is None:
+                return {}
+            
+            if asset:
+                key = _canonical_asset(asset)
+                balances = {asset: all_balances[key]} if key in all_balances else {}
+            else:
+                balances = dict(all_balances)
+            
+            logger.debug(f"Got {len(balances)} balances from Kraken")
+            return balances
+        
+        except Exception as e:
+            logger.error(f"Error getting Kraken balances: {e}")
+            return {}
+    
+    def _get_all_balances(self) -> Optional[Dict[str, Decimal]]:
+        """
+        Obtiene todos los saldos > 0, reutilizándolos ``_balances_ttl`` segundos.
+        
+        Se consulta primero la caché del proceso, luego Redis (si existe) y
+        por último /0/private/Balance.
+        
+        Returns:
+            Dict símbolo -> saldo, o None si Kraken devuelve error
+        """
+        if (self._balances_cache is not None and
+                time.time() - self._balances_timestamp < self._balances_ttl):
+            return self._balances_cache
+        
+        cached = self._redis_get_many([self._balance_key])[0]
+        if cached is not None:
+            balances = {symbol: Decimal(value) for symbol, value in json.loads(cached).items()}
+        else:
             nonce = str(int(time.time() * 1000))
             data = {'nonce': nonce}
             signature = self._generate_signature('/0/private/Balance', data, nonce)
@@ -171,28 +326,37 @@ class KrakenConnector(BaseConnector):
             )
             response.raise_for_status()
             
-            result = response.json()
+            result = parse_json(response)
             if result.get('error'):
                 logger.error(f"Kraken error: {result['error']}")
-                return {}
+                return None
             
             balances = {}
             for symbol, balance in result.get('result', {}).items():
-                # Kraken usa prefijos como X para crypto y Z para fiat
-                clean_symbol = symbol.lstrip('XZ')
                 balance_decimal = Decimal(balance)
                 
                 if balance_decimal > 0:
-                    if asset and clean_symbol != asset:
-                        continue
-                    balances[clean_symbol] = balance_decimal
+                    # Mismas claves que get_prices: XXBT -> BTC, ZUSD -> USD
+                    balances[_balance_asset(symbol)] = balance_decimal
             
-            logger.debug(f"Got {len(balances)} balances from Kraken")
-            return balances
+            self._redis_set_many(
+                {self._balance_key: json.dumps({k: str(v) for k, v in balances.items()})},
+                self._balances_ttl
+            )
         
-        except Exception as e:
-            logger.error(f"Error getting Kraken balances: {e}")
-            return {}
+        self._balances_cache = balances
+        self._balances_timestamp = time.time()
+        return balances
+    
+    def invalidate_balances(self) -> None:
+        """Vacía la caché de saldos (local y Redis) para forzar un refresco."""
+        self._balances_cache = None
+        self._balances_timestamp = 0.0
+        if self._redis is not None:
+            try:
+                self._redis.delete(self._balance_key)
+            except Exception as e:
+                logger.warning(f"Redis delete failed: {e}")
     
     def get_transactions(self, asset: Optional[str] = None, limit: int = 100) -> List[Dict]:
         """
@@ -225,7 +389,7 @@ class KrakenConnector(BaseConnector):
             )
             response.raise_for_status()
             
-            result = response.json()
+            result = parse_json(response)
             if result.get('error'):
                 logger.error(f"Kraken error: {result['error']}")
                 return []
@@ -248,10 +412,89 @@ class KrakenConnector(BaseConnector):
             logger.error(f"Error getting Kraken transactions: {e}")
             return []
     
+    def _fetch_one_price(self, asset: str) -> Optional[Decimal]:
+        """
+        Obtiene el último precio en USD de un activo.
+        
+        Args:
+            asset: Símbolo (ej: 'BTC')
+            
+        Returns:
+            Precio USD o None si no está disponible
+        """
+        response = self.session.get(
+            f"{self.BASE_URL}/0/public/Ticker",
+            params={'pair': f"{asset}USD"}
+        )
+        
+        if response.status_code != 200:
+            logger.warning(f"Could not get price for {asset}")
+            return None
+        
+        result = parse_json(response)
+        if result.get('error'):
+            return None
+        
+        # Kraken retorna una llave con el par
+        price = None
+        for key, value in result['result'].items():
+            price = Decimal(value['c'][0])  # c = last trade closed
+        return price
+    
+    def _fetch_prices_batch(self, assets: List[str]) -> Optional[Dict[str, Decimal]]:
+        """
+        Obtiene los precios en USD de varios activos con un solo Ticker.
+        
+        Args:
+            assets: Lista de símbolos (ej: ['BTC', 'ETH'])
+            
+        Returns:
+            Dict símbolo -> precio USD, o None si Kraken rechaza el lote
+        """
+        response = self.session.get(
+            f"{self.BASE_URL}/0/public/Ticker",
+            params={'pair': ",".join(f"{asset}USD" for asset in assets)}
+        )
+        if response.status_code != 200:
+            return None
+        
+        result = parse_json(response)
+        if result.get('error'):
+            return None
+        
+        # Las llaves de la respuesta usan nombres de Kraken (XXBTZUSD, XTZUSD...)
+        requested = {_canonical_asset(asset): asset for asset in assets}
+        prices = {}
+        for pair, value in result['result'].items():
+            asset = _match_pair(pair, requested)
+            if asset is not None:
+                prices[asset] = Decimal(value['c'][0])  # c = last trade closed
+        return prices
+    
+    def _is_cache_valid(self, asset: str) -> bool:
+        """Comprueba si el precio cacheado sigue siendo válido."""
+        if asset not in self._cache_timestamp:
+            return False
+        return time.time() - self._cache_timestamp[asset] < self._cache_ttl
+    
+    def invalidate_prices(self) -> None:
+        """Vacía la caché de precios (local y Redis) para forzar un refresco."""
+        if self._redis is not None and self._price_cache:
+            try:
+                self._redis.delete(*(self.REDIS_PRICE_KEY + asset for asset in self._price_cache))
+            except Exception as e:
+                logger.warning(f"Redis delete failed: {e}")
+        self._price_cache.clear()
+        self._cache_timestamp.clear()
+    
     def get_prices(self, assets: List[str]) -> Dict[str, Decimal]:
         """
         Obtiene precios en USD.
         
+        Los precios se cachean ``_cache_ttl`` segundos por símbolo, en el
+        proceso y, si hay ``redis_client``, en Redis para todos los workers;
+        solo los caducados en ambos se piden a Kraken.
+        
         Args:
             assets: Lista de símbolos (ej: ['BTC', 'ETH'])
             
@@ -260,29 +503,63 @@ class KrakenConnector(BaseConnector):
         """
         try:
             prices = {}
+            missing = []
             
             for asset in assets:
-                pair = f"{asset}USD"
-                response = self.session.get(
-                    f"{self.BASE_URL}/0/public/Ticker",
-                    params={'pair': pair}
-                )
-                
-                if response.status_code == 200:
-                    result = response.json()
-                    if not result.get('error'):
-                        ticker_data = result['result']
-                        # Kraken retorna una llave con el par
-                        for key, value in ticker_data.items():
-                            prices[asset] = Decimal(value['c'][0])  # c = last trade closed
+                if self._is_cache_valid(asset):
+                    prices[asset] = self._price_cache[asset]
                 else:
-                    logger.warning(f"Could not get price for {asset}")
+                    missing.append(asset)
+            
+            # Los que faltan en el proceso pueden estar en Redis (un MGET)
+            if missing and self._redis is not None:
+                keys = [self.REDIS_PRICE_KEY + asset for asset in missing]
+                still_missing = []
+                now = time.time()
+                for asset, value in zip(missing, self._redis_get_many(keys)):
+                    if value is None:
+                        still_missing.append(asset)
+                        continue
+                    if isinstance(value, bytes):
+                        value = value.decode()
+                    price = Decimal(value)
+                    prices[asset] = price
+                    self._price_cache[asset] = price
+                    self._cache_timestamp[asset] = now
+                missing = still_missing
+            
+            if not missing:
+                return prices
+            
+            fetched = self._fetch_prices_batch(missing)
+            if fetched is None:
+                # Kraken rechaza el lote entero si un par no existe: en ese caso
+                # un ticker por activo, en paralelo sobre la sesión compartida
+                fetched = {}
+                for asset, price in zip(missing, self._executor.map(self._fetch_one_price, missing)):
+                    if price is not None:
+                        fetched[asset] = price
+            
+            now = time.time()
+            for asset, price in fetched.items():
+                prices[asset] = price
+                self._price_cache[asset] = price
+                self._cache_timestamp[asset] = now
+            self._redis_set_many(
+                {self.REDIS_PRICE_KEY + asset: str(price) for asset, price in fetched.items()},
+                self._cache_ttl
+            )
             
             return prices
         
         except Exception as e:
             logger.error(f"Error getting Kraken prices: {e}")
             return {}
+    
+    def close(self) -> None:
+        """Cierra sesión y detiene el pool de hilos."""
+        self._executor.shutdown(wait=False)
+        super().close()
 
 
 __all__ = ["KrakenConnector"]
@@ -0,0 +1,166 @@
+"""
+Test Suite for Coinbase Exchange Connector
+===========================================================================
+
+Tests para CoinbaseConnector (src/api/connectors/exchanges/coinbase_connector.py).
+
+Cubre:
+- Mezcla de ledgers de varias cuentas, más reciente primero
+- Límite por cuenta
+- Ledgers que el SDK no devuelve ordenados
+- SDK sin parámetro limit
+
+Author: Crypto Portfolio Tracker Team
+Version: 3.0.0
+License: MIT
+"""
+
+import pytest
+
+from src.api.connectors.exchanges import coinbase_connector
+from src.api.connectors.exchanges.coinbase_connector import CoinbaseConnector
+
+pytestmark = pytest.mark.unit
+
+
+def entry(entry_id, created_at, currency):
+    """Entrada de ledger con los campos que usa el conector."""
+    return {
+        "id": entry_id,
+        "type": "transfer",
+        "amount": "1.0",
+        "currency": currency,
+        "created_at": created_at,
+    }
+
+
+ACCOUNTS = [
+    {"id": "btc", "currency": "BTC", "balance": "0.5", "hold": "0"},
+    {"id": "eth", "currency": "ETH", "balance": "2.0", "hold": "0"},
+    {"id": "sol", "currency": "SOL", "balance": "0", "hold": "0.0"},
+    {"id": "usdc", "currency": "USDC", "balance": "0", "hold": "10"},
+]
+
+# Ledgers tal como los devuelve la API (más reciente primero)
+LEDGERS = {
+    "btc": [
+        entry("b3", "2024-03-05T10:00:00Z", "BTC"),
+        entry("b2", "2024-03-02T10:00:00Z", "BTC"),
+        entry("b1", "2024-01-01T10:00:00Z", "BTC"),
+    ],
+    "eth": [
+        entry("e2", "2024-03-04T10:00:00Z", "ETH"),
+        entry("e1", "2024-02-01T10:00:00Z", "ETH"),
+    ],
+    "sol": [
+        entry("s1", "2024-03-06T10:00:00Z", "SOL"),
+    ],
+    "usdc": [
+        entry("u2", "2024-03-03T10:00:00Z", "USDC"),
+        entry("u1", "2024-01-15T10:00:00Z", "USDC"),
+    ],
+}
+
+
+class FakeClient:
+    """SDK de Coinbase con ledgers en memoria."""
+    
+    ledgers = LEDGERS
+    
+    def __init__(self, api_key, api_secret, passphrase):
+        self.ledger_calls = []
+    
+    def get_accounts(self):
+        """Cuentas fijas."""
+        return ACCOUNTS
+    
+    def get_account_ledger(self, account_id, **params):
+        self.ledger_calls.append((account_id, params))
+        return iter(self.ledgers[account_id])
+
+
+class LegacyClient(FakeClient):
+    """SDK antiguo: get_account_ledger sin limit."""
+    
+    def get_account_ledger(self, account_id):
+        self.ledger_calls.append((account_id, {}))
+        return iter(self.ledgers[account_id])
+
+
+class UnsortedClient(FakeClient):
+    """SDK que devuelve los ledgers sin ordenar."""
+    
+    ledgers = {
+        account_id: list(reversed(entries)) for account_id, entries in LEDGERS.items()
+    }
+
+
+def make_connector(monkeypatch, client_cls):
+    """Conector con el SDK sustituido por client_cls."""
+    monkeypatch.setattr(coinbase_connector, "Client", client_cls)
+    return CoinbaseConnector("key-12345678", "secret", "passphrase")
+
+
+def ids(transactions):
+    """Ids de las transacciones, en orden."""
+    return [t["id"] for t in transactions]
+
+
+class TestGetTransactions:
+    """Tests para get_transactions."""
+    
+    @pytest.mark.asyncio
+    async def test_merges_accounts_newest_first(self, monkeypatch):
+        """Test ledgers de varias cuentas mezclados por created_at descendente."""
+        connector = make_connector(monkeypatch, FakeClient)
+        
+        transactions = await connector.get_transactions()
+        
+        # SOL no tiene saldo ni hold: su ledger no se pide
+        assert ids(transactions) == ["b3", "e2", "u2", "b2", "e1", "u1", "b1"]
+        assert sorted(account for account, _ in connector.client.ledger_calls) == ["btc", "eth", "usdc"]
+    
+    @pytest.mark.asyncio
+    async def test_limit_is_per_account(self, monkeypatch):
+        """Test limit acota las entradas de cada cuenta, no el total."""
+        connector = make_connector(monkeypatch, FakeClient)
+        
+        transactions = await connector.get_transactions(limit=1)
+        
+        assert ids(transactions) == ["b3", "e2", "u2"]
+        assert all(params == {"limit": 1} for _, params in connector.client.ledger_calls)
+    
+    @pytest.mark.asyncio
+    async def test_unsorted_ledgers_are_still_ordered(self, monkeypatch):
+        """Test si el SDK no devuelve los ledgers ordenados, el resultado sí lo está."""
+        connector = make_connector(monkeypatch, UnsortedClient)
+        
+        transactions = await connector.get_transactions()
+        
+        created = [t["created_at"] for t in transactions]
+        assert created == sorted(created, reverse=True)
+        assert ids(transactions) == ["b3", "e2", "u2", "b2", "e1", "u1", "b1"]
+    
+    @pytest.mark.asyncio
+    async def test_sdk_without_limit_parameter(self, monkeypatch):
+        """Test SDK sin limit: se llama sin él y se corta en el cliente."""
+        connector = make_connector(monkeypatch, LegacyClient)
+        
+        transactions = await connector.get_transactions(limit=2)
+        
+        assert ids(transactions) == ["b3", "e2", "u2", "b2", "e1", "u1"]
+        assert all(params == {} for _, params in connector.client.ledger_calls)
+    
+    def test_sdk_type_errors_propagate(self, monkeypatch):
+        """Test un TypeError del SDK no se confunde con falta de soporte de limit."""
+        connector = make_connector(monkeypatch, FakeClient)
+        calls = []
+        
+        def broken_ledger(account_id, **params):
+            calls.append(params)
+            raise TypeError("bug inside the SDK")
+        connector.client.get_account_ledger = broken_ledger
+        
+        with pytest.raises(TypeError):
+            connector._fetch_ledger("btc", 10)
+        assert calls == [{"limit": 10}]
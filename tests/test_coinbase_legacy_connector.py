@@ -0,0 +1,117 @@
+"""
+Test Suite for Coinbase Pro Connector
+===========================================================================
+
+Tests para CoinbaseConnector (src/api/coinbase_connector.py).
+
+Cubre:
+- Mezcla de ledgers de varias cuentas, más reciente primero
+- Ledgers que la API no devuelve ordenados
+- Filtro por activo
+
+Author: Crypto Portfolio Tracker Team
+Version: 3.0.0
+License: MIT
+"""
+
+import base64
+from decimal import Decimal
+
+import pytest
+
+from src.api.coinbase_connector import CoinbaseConnector
+
+pytestmark = pytest.mark.unit
+
+
+def entry(created_at, amount="1.0"):
+    """Entrada de ledger con los campos que usa el conector."""
+    return {
+        "type": "transfer",
+        "amount": amount,
+        "balance": "10.0",
+        "created_at": created_at,
+    }
+
+
+ACCOUNTS = [
+    {"id": "btc", "currency": "BTC", "balance": "0.5"},
+    {"id": "eth", "currency": "ETH", "balance": "2.0"},
+    {"id": "usdc", "currency": "USDC", "balance": "0"},
+]
+
+# Ledgers tal como los devuelve la API (más reciente primero)
+LEDGERS = {
+    "btc": [
+        entry("2024-03-05T10:00:00Z"),
+        entry("2024-03-02T10:00:00Z"),
+        entry("2024-01-01T10:00:00Z"),
+    ],
+    "eth": [
+        entry("2024-03-04T10:00:00Z"),
+        entry("2024-02-01T10:00:00Z"),
+    ],
+    "usdc": [
+        entry("2024-03-03T10:00:00Z"),
+        entry("2024-01-15T10:00:00Z"),
+    ],
+}
+
+EXPECTED_ORDER = [
+    ("2024-03-05T10:00:00Z", "BTC"),
+    ("2024-03-04T10:00:00Z", "ETH"),
+    ("2024-03-03T10:00:00Z", "USDC"),
+    ("2024-03-02T10:00:00Z", "BTC"),
+    ("2024-02-01T10:00:00Z", "ETH"),
+    ("2024-01-15T10:00:00Z", "USDC"),
+    ("2024-01-01T10:00:00Z", "BTC"),
+]
+
+
+@pytest.fixture
+def connector():
+    """Conector con cuentas fijas; se cierra al terminar."""
+    connector = CoinbaseConnector("key", base64.b64encode(b"secret").decode(), "pass")
+    connector._get_accounts = lambda: ACCOUNTS
+    yield connector
+    connector.close()
+
+
+def timeline(transactions):
+    """(timestamp, activo) de cada transacción, en orden."""
+    return [(tx["timestamp"], tx["asset"]) for tx in transactions]
+
+
+class TestGetTransactions:
+    """Tests para get_transactions."""
+    
+    def test_merges_accounts_newest_first(self, connector):
+        """Test ledgers de todas las cuentas mezclados por fecha."""
+        connector._get_ledger = lambda account_id, limit: LEDGERS[account_id]
+        
+        transactions = connector.get_transactions()
+        
+        assert timeline(transactions) == EXPECTED_ORDER
+        assert transactions[0]["amount"] == Decimal("1.0")
+    
+    def test_unsorted_ledgers_are_still_ordered(self, connector):
+        """Test un ledger desordenado no rompe la mezcla."""
+        connector._get_ledger = lambda account_id, limit: list(reversed(LEDGERS[account_id]))
+        
+        transactions = connector.get_transactions()
+        
+        assert timeline(transactions) == EXPECTED_ORDER
+    
+    def test_filter_by_asset(self, connector):
+        """Test solo se pide el ledger de la cuenta del activo."""
+        requested = []
+        
+        def fake_ledger(account_id, limit):
+            requested.append((account_id, limit))
+            return LEDGERS[account_id]
+        connector._get_ledger = fake_ledger
+        
+        transactions = connector.get_transactions("ETH", limit=5)
+        
+        assert requested == [("eth", 5)]
+        assert {tx["asset"] for tx in transactions} == {"ETH"}
@@ -0,0 +1,150 @@
+"""
+Test Suite for CoinGecko Oracle
+===========================================================================
+
+Tests para el agrupado de peticiones y la caché de CoinGeckoOracle.
+
+Cubre:
+- Llamadas concurrentes comparten una sola request
+- Un batch fallido libera a todos los que esperan
+- Caducidad de la caché por TTL
+
+Author: Crypto Portfolio Tracker Team
+Version: 3.0.0
+License: MIT
+"""
+
+import asyncio
+import time
+from decimal import Decimal
+
+import pytest
+
+from src.api.connectors.oracles.coingecko_connector import CoinGeckoOracle
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture
+def oracle():
+    """Oracle con _fetch_prices sustituido; registra cada request."""
+    oracle = CoinGeckoOracle()
+    oracle.requests = []
+    
+    async def fake_fetch(token_ids, vs_currency):
+        oracle.requests.append((list(token_ids), vs_currency))
+        now = time.time()
+        prices = {}
+        for token_id in token_ids:
+            price = Decimal(len(token_id))
+            oracle.cache[(token_id, vs_currency)] = (now, price)
+            prices[token_id] = price
+        return prices
+    
+    oracle._fetch_prices = fake_fetch
+    return oracle
+
+
+class TestRequestCoalescing:
+    """Tests para el agrupado de get_price."""
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_callers_share_one_request(self, oracle):
+        """Test varias llamadas simultáneas -> un solo /simple/price."""
+        results = await asyncio.gather(
+            oracle.get_price("bitcoin"),
+            oracle.get_price("ethereum"),
+            oracle.get_price("bitcoin"),
+            oracle.get_price("solana"),
+        )
+        
+        assert results == [Decimal(7), Decimal(8), Decimal(7), Decimal(6)]
+        assert len(oracle.requests) == 1
+        assert sorted(oracle.requests[0][0]) == ["bitcoin", "ethereum", "solana"]
+        assert oracle._inflight == {}
+    
+    @pytest.mark.asyncio
+    async def test_batches_split_by_vs_currency(self, oracle):
+        """Test cada vs_currency tiene su propio batch."""
+        await asyncio.gather(
+            oracle.get_price("bitcoin", "usd"),
+            oracle.get_price("bitcoin", "eur"),
+        )
+        
+        assert sorted(vs for _, vs in oracle.requests) == ["eur", "usd"]
+    
+    @pytest.mark.asyncio
+    async def test_failing_batch_releases_every_waiter(self, oracle):
+        """Test si el batch falla, todos reciben la excepción y no se quedan colgados."""
+        async def failing_batch(token_ids, vs_currency="usd"):
+            raise RuntimeError("coingecko down")
+        oracle.get_prices_batch = failing_batch
+        
+        results = await asyncio.wait_for(
+            asyncio.gather(
+                oracle.get_price("bitcoin"),
+                oracle.get_price("ethereum"),
+                oracle.get_price("bitcoin"),
+                return_exceptions=True,
+            ),
+            timeout=1,
+        )
+        
+        assert len(results) == 3
+        assert all(isinstance(r, RuntimeError) for r in results)
+        assert oracle._inflight == {}
+        assert oracle._pending == {}
+    
+    @pytest.mark.asyncio
+    async def test_missing_price_resolves_to_none(self, oracle):
+        """Test un id que CoinGecko no devuelve se resuelve a None."""
+        async def partial_batch(token_ids, vs_currency="usd"):
+            return {"bitcoin": Decimal("50000")}
+        oracle.get_prices_batch = partial_batch
+        
+        results = await asyncio.gather(
+            oracle.get_price("bitcoin"),
+            oracle.get_price("not-a-token"),
+        )
+        
+        assert results == [Decimal("50000"), None]
+
+
+class TestPriceCache:
+    """Tests para la caché (token_id, vs_currency)."""
+    
+    @pytest.mark.asyncio
+    async def test_fresh_entry_is_served_from_cache(self, oracle):
+        """Test una entrada dentro del TTL no genera request."""
+        oracle.cache[("bitcoin", "usd")] = (time.time(), Decimal("1"))
+        
+        assert await oracle.get_price("bitcoin") == Decimal("1")
+        assert oracle.requests == []
+    
+    @pytest.mark.asyncio
+    async def test_entry_expires_after_ttl(self, oracle):
+        """Test una entrada más vieja que cache_ttl se vuelve a pedir."""
+        oracle.cache[("bitcoin", "usd")] = (time.time() - oracle.cache_ttl - 1, Decimal("1"))
+        
+        assert await oracle.get_price("bitcoin") == Decimal(7)
+        assert len(oracle.requests) == 1
+    
+    @pytest.mark.asyncio
+    async def test_cache_is_keyed_by_vs_currency(self, oracle):
+        """Test el precio en usd no sirve para eur."""
+        oracle.cache[("bitcoin", "usd")] = (time.time(), Decimal("1"))
+        
+        await oracle.get_price("bitcoin", "eur")
+        
+        assert oracle.requests == [(["bitcoin"], "eur")]
+    
+    @pytest.mark.asyncio
+    async def test_batch_only_requests_stale_ids(self, oracle):
+        """Test get_prices_batch solo pide los ids caducados."""
+        oracle.cache[("bitcoin", "usd")] = (time.time(), Decimal("1"))
+        oracle.cache[("ethereum", "usd")] = (time.time() - oracle.cache_ttl - 1, Decimal("2"))
+        
+        prices = await oracle.get_prices_batch(["bitcoin", "ethereum"])
+        
+        assert prices == {"bitcoin": Decimal("1"), "ethereum": Decimal(8)}
+        assert oracle.requests == [(["ethereum"], "usd")]
@@ -0,0 +1,118 @@
+"""
+Test Suite for EVM RPC Helpers
+===========================================================================
+
+Tests para Multicall3 y read_contracts (src/api/connectors/blockchains/evm_rpc.py).
+
+Cubre:
+- Codificación/decodificación de aggregate3
+- Llamadas revertidas -> None
+- Fallback a batch JSON-RPC si Multicall3 no está disponible
+
+Author: Crypto Portfolio Tracker Team
+Version: 3.0.0
+License: MIT
+"""
+
+import pytest
+from eth_abi import decode as abi_decode, encode as abi_encode
+from web3 import Web3
+
+from src.api.connectors.blockchains import evm_rpc
+
+pytestmark = pytest.mark.unit
+
+TOKEN_A = "0xA0b86991c6218b36c1d19D4a2e9Eb0cE3606eB48"
+TOKEN_B = "0xdAC17F958D2ee523a2206206994597C13D831ec7"
+CALLS = [(TOKEN_A, b"\x01\x02\x03\x04"), (TOKEN_B, b"\x05\x06\x07\x08")]
+
+
+@pytest.fixture
+def w3():
+    """Web3 sobre un HTTPProvider que nunca se contacta."""
+    return Web3(Web3.HTTPProvider("http://rpc.invalid"))
+
+
+def aggregate3_result(results):
+    """Respuesta hex de aggregate3 para [(success, returnData), ...]."""
+    return "0x" + abi_encode(["(bool,bytes)[]"], [results]).hex()
+
+
+class TestMulticall:
+    """Tests para multicall."""
+    
+    @pytest.mark.asyncio
+    async def test_encodes_calls_and_decodes_results(self, w3, monkeypatch):
+        """Test una sola eth_call a Multicall3 con todas las llamadas."""
+        sent = []
+        
+        async def fake_json_rpc(url, method, params, headers=None):
+            sent.append((url, method, params))
+            return aggregate3_result([(True, b"a" * 32), (True, b"b" * 32)])
+        monkeypatch.setattr(evm_rpc, "json_rpc", fake_json_rpc)
+        
+        results = await evm_rpc.multicall(w3, CALLS)
+        
+        assert results == [b"a" * 32, b"b" * 32]
+        assert len(sent) == 1
+        url, method, params = sent[0]
+        assert url == "http://rpc.invalid"
+        assert method == "eth_call"
+        assert params[0]["to"] == evm_rpc.MULTICALL3_ADDRESS
+        data = bytes.fromhex(params[0]["data"][2:])
+        assert data[:4] == evm_rpc.AGGREGATE3_SELECTOR
+        calls = abi_decode(["(address,bool,bytes)[]"], data[4:])[0]
+        assert [(Web3.to_checksum_address(t), allow, cd) for t, allow, cd in calls] == [
+            (TOKEN_A, True, CALLS[0][1]),
+            (TOKEN_B, True, CALLS[1][1]),
+        ]
+    
+    @pytest.mark.asyncio
+    async def test_reverted_and_empty_calls_are_none(self, w3, monkeypatch):
+        """Test llamadas revertidas o sin datos -> None en su posición."""
+        async def fake_json_rpc(url, method, params, headers=None):
+            return aggregate3_result([(False, b"revert"), (True, b"")])
+        monkeypatch.setattr(evm_rpc, "json_rpc", fake_json_rpc)
+        
+        assert await evm_rpc.multicall(w3, CALLS) == [None, None]
+    
+    @pytest.mark.asyncio
+    async def test_no_calls(self, w3):
+        """Test sin llamadas no hay request."""
+        assert await evm_rpc.multicall(w3, []) == []
+
+
+class TestReadContracts:
+    """Tests para read_contracts."""
+    
+    @pytest.mark.asyncio
+    async def test_uses_multicall(self, w3, monkeypatch):
+        """Test con Multicall3 disponible no se usa batch RPC."""
+        async def fake_json_rpc(url, method, params, headers=None):
+            return aggregate3_result([(True, b"a"), (True, b"b")])
+        
+        async def fail_batch(*args, **kwargs):
+            raise AssertionError("batch RPC should not be used")
+        monkeypatch.setattr(evm_rpc, "json_rpc", fake_json_rpc)
+        monkeypatch.setattr(evm_rpc, "json_rpc_batch", fail_batch)
+        
+        assert await evm_rpc.read_contracts(w3, CALLS) == [b"a", b"b"]
+    
+    @pytest.mark.asyncio
+    async def test_falls_back_to_batch_rpc(self, w3, monkeypatch):
+        """Test si Multicall3 no responde, una eth_call por llamada en batch."""
+        batches = []
+        
+        async def no_multicall(url, method, params, headers=None):
+            return "0x"
+        
+        async def fake_batch(url, calls, batch_size, headers=None):
+            batches.append(calls)
+            return ["0x" + b"a".hex(), None]
+        monkeypatch.setattr(evm_rpc, "json_rpc", no_multicall)
+        monkeypatch.setattr(evm_rpc, "json_rpc_batch", fake_batch)
+        
+        results = await evm_rpc.read_contracts(w3, CALLS)
+        
+        assert results == [b"a", None]
+        assert batches == [[evm_rpc.eth_call(target, data) for target, data in CALLS]]
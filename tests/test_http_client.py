@@ -0,0 +1,148 @@
+"""
+Test Suite for Shared HTTP Client
+===========================================================================
+
+Tests para los helpers JSON-RPC de src/api/connectors/http_client.py.
+
+Cubre:
+- Emparejado de respuestas batch por id
+- Fallback a llamadas individuales si el proveedor rechaza el batch
+- Errores parciales dentro de un batch
+- División en chunks
+
+Author: Crypto Portfolio Tracker Team
+Version: 3.0.0
+License: MIT
+"""
+
+import pytest
+
+from src.api.connectors import http_client
+
+pytestmark = pytest.mark.unit
+
+
+class FakeResponse:
+    """Respuesta httpx mínima."""
+    
+    def __init__(self, payload):
+        self._payload = payload
+    
+    def raise_for_status(self):
+        pass
+    
+    def json(self):
+        return self._payload
+
+
+class FakeClient:
+    """Cliente que delega cada POST en un handler y registra los payloads."""
+    
+    def __init__(self, handler):
+        self.handler = handler
+        self.posts = []
+    
+    async def post(self, url, json=None, headers=None):
+        self.posts.append(json)
+        return FakeResponse(self.handler(json))
+
+
+def echo_result(call):
+    """Resultado determinista para una llamada: '<method>:<param>'."""
+    return f"{call['method']}:{call['params'][0]}"
+
+
+@pytest.fixture
+def fake_client(monkeypatch):
+    """Sustituye el cliente compartido por uno falso configurable."""
+    def install(handler):
+        client = FakeClient(handler)
+        monkeypatch.setattr(http_client, "get_http_client", lambda: client)
+        return client
+    return install
+
+
+CALLS = [("eth_getBalance", ["0xa"]), ("eth_getBalance", ["0xb"]), ("eth_blockNumber", ["latest"])]
+
+
+class TestJsonRpcBatch:
+    """Tests para json_rpc_batch."""
+    
+    @pytest.mark.asyncio
+    async def test_out_of_order_responses(self, fake_client):
+        """Test respuestas desordenadas se devuelven en el orden de las llamadas."""
+        def handler(payload):
+            return [{"jsonrpc": "2.0", "id": c["id"], "result": echo_result(c)} for c in reversed(payload)]
+        client = fake_client(handler)
+        
+        results = await http_client.json_rpc_batch("http://rpc", CALLS)
+        
+        assert results == ["eth_getBalance:0xa", "eth_getBalance:0xb", "eth_blockNumber:latest"]
+        assert len(client.posts) == 1
+    
+    @pytest.mark.asyncio
+    async def test_batch_rejected_falls_back_to_single_calls(self, fake_client):
+        """Test batch rechazado -> una llamada individual por elemento."""
+        def handler(payload):
+            if isinstance(payload, list):
+                return {"jsonrpc": "2.0", "id": None, "error": {"code": -32600, "message": "batch not supported"}}
+            return {"jsonrpc": "2.0", "id": payload["id"], "result": echo_result(payload)}
+        client = fake_client(handler)
+        
+        results = await http_client.json_rpc_batch("http://rpc", CALLS)
+        
+        assert results == ["eth_getBalance:0xa", "eth_getBalance:0xb", "eth_blockNumber:latest"]
+        assert isinstance(client.posts[0], list)
+        assert len(client.posts) == 1 + len(CALLS)
+    
+    @pytest.mark.asyncio
+    async def test_fallback_failures_become_none(self, fake_client):
+        """Test en el fallback, una llamada fallida da None sin tumbar las demás."""
+        def handler(payload):
+            if isinstance(payload, list):
+                return {"error": {"message": "batch not supported"}}
+            if payload["params"] == ["0xb"]:
+                return {"id": payload["id"], "error": {"code": -32000, "message": "boom"}}
+            return {"id": payload["id"], "result": echo_result(payload)}
+        fake_client(handler)
+        
+        results = await http_client.json_rpc_batch("http://rpc", CALLS)
+        
+        assert results == ["eth_getBalance:0xa", None, "eth_blockNumber:latest"]
+    
+    @pytest.mark.asyncio
+    async def test_partial_errors(self, fake_client):
+        """Test errores parciales y respuestas ausentes dan None en su posición."""
+        def handler(payload):
+            return [
+                {"id": 0, "result": echo_result(payload[0])},
+                {"id": 1, "error": {"code": -32000, "message": "execution reverted"}},
+                # id 2 no llega en la respuesta
+            ]
+        client = fake_client(handler)
+        
+        results = await http_client.json_rpc_batch("http://rpc", CALLS)
+        
+        assert results == ["eth_getBalance:0xa", None, None]
+        assert len(client.posts) == 1
+    
+    @pytest.mark.asyncio
+    async def test_chunks_keep_global_order(self, fake_client):
+        """Test un POST por chunk y resultados en el orden original."""
+        calls = [("eth_getBalance", [f"0x{i}"]) for i in range(5)]
+        def handler(payload):
+            return [{"id": c["id"], "result": echo_result(c)} for c in reversed(payload)]
+        client = fake_client(handler)
+        
+        results = await http_client.json_rpc_batch("http://rpc", calls, batch_size=2)
+        
+        assert results == [f"eth_getBalance:0x{i}" for i in range(5)]
+        assert [len(p) for p in client.posts] == [2, 2, 1]
+    
+    @pytest.mark.asyncio
+    async def test_empty_calls(self, fake_client):
+        """Test sin llamadas no hay requests."""
+        client = fake_client(lambda payload: [])
+        
+        assert await http_client.json_rpc_batch("http://rpc", []) == []
+        assert client.posts == []
@@ -0,0 +1,217 @@
+"""
+Test Suite for Kraken Connector
+===========================================================================
+
+Tests para KrakenConnector (src/api/kraken_connector.py).
+
+Cubre:
+- Mapeo de llaves de par de Kraken a los activos pedidos
+- Ticker en un solo batch
+- Fallback a un ticker por activo si Kraken rechaza el batch
+- Códigos de /0/private/Balance -> mismos símbolos que los precios
+
+Author: Crypto Portfolio Tracker Team
+Version: 3.0.0
+License: MIT
+"""
+
+import base64
+import json
+from decimal import Decimal
+
+import pytest
+
+from src.api.kraken_connector import KrakenConnector, _balance_asset, _canonical_asset, _match_pair
+
+pytestmark = pytest.mark.unit
+
+
+class FakeResponse:
+    """Respuesta requests mínima."""
+    
+    def __init__(self, payload, status_code=200):
+        self.status_code = status_code
+        self._payload = payload
+        self.content = json.dumps(payload).encode()
+    
+    def raise_for_status(self):
+        pass
+    
+    def json(self):
+        return self._payload
+
+
+def ticker(price):
+    """Entrada de Ticker con el último precio cerrado."""
+    return {"c": [price, "0.1"]}
+
+
+@pytest.fixture
+def connector():
+    """Conector con secreto base64 válido; se cierra al terminar."""
+    connector = KrakenConnector("key", base64.b64encode(b"secret").decode())
+    yield connector
+    connector.close()
+
+
+# (llave devuelta por Kraken, activos pedidos, activo esperado)
+PAIR_CASES = [
+    ("XXBTZUSD", ["BTC"], "BTC"),
+    ("XXBTZUSD", ["XBT"], "XBT"),
+    ("XETHZUSD", ["ETH"], "ETH"),
+    ("XXRPZUSD", ["XRP"], "XRP"),
+    ("XLTCZUSD", ["LTC"], "LTC"),
+    ("XXLMZUSD", ["XLM"], "XLM"),
+    ("XXMRZUSD", ["XMR"], "XMR"),
+    ("XZECZUSD", ["ZEC"], "ZEC"),
+    ("XDGUSD", ["DOGE"], "DOGE"),
+    ("XTZUSD", ["XTZ"], "XTZ"),
+    ("ZRXUSD", ["ZRX"], "ZRX"),
+    ("USDTZUSD", ["USDT"], "USDT"),
+    ("USDCUSD", ["USDC"], "USDC"),
+    ("SOLUSD", ["SOL"], "SOL"),
+    ("DOTUSD", ["DOT"], "DOT"),
+    ("ADAUSD", ["ADA"], "ADA"),
+    # Con varios activos pedidos, cada llave va a su activo
+    ("XTZUSD", ["XTZ", "BTC", "ETH"], "XTZ"),
+    ("XXBTZUSD", ["XTZ", "BTC", "ETH"], "BTC"),
+    # Pares que no son del activo pedido no se asignan
+    ("XETHZEUR", ["ETH"], None),
+    ("XXBTZEUR", ["BTC"], None),
+    ("ETHUSDT", ["ETH"], None),
+    ("XETHZUSD", ["BTC"], None),
+    ("SOLUSD", ["SO"], None),
+]
+
+
+class TestPairMapping:
+    """Tests para _match_pair / _canonical_asset."""
+    
+    @pytest.mark.parametrize("pair,assets,expected", PAIR_CASES)
+    def test_match_pair(self, pair, assets, expected):
+        """Test llave de Kraken -> activo pedido."""
+        requested = {_canonical_asset(asset): asset for asset in assets}
+        
+        assert _match_pair(pair, requested) == expected
+    
+    @pytest.mark.parametrize("symbol,expected", [
+        ("XBT", "BTC"),
+        ("XDG", "DOGE"),
+        ("BTC", "BTC"),
+        ("ETH", "ETH"),
+    ])
+    def test_canonical_asset(self, symbol, expected):
+        """Test alias de Kraken -> símbolo habitual."""
+        assert _canonical_asset(symbol) == expected
+
+
+class TestGetPrices:
+    """Tests para get_prices."""
+    
+    def test_single_batch_request(self, connector, monkeypatch):
+        """Test todos los activos en un solo Ticker."""
+        calls = []
+        
+        def fake_get(url, params=None, **kwargs):
+            calls.append(params["pair"])
+            return FakeResponse({"error": [], "result": {
+                "XXBTZUSD": ticker("50000.1"),
+                "XETHZUSD": ticker("3000.2"),
+                "SOLUSD": ticker("150.3"),
+            }})
+        monkeypatch.setattr(connector.session, "get", fake_get)
+        
+        prices = connector.get_prices(["BTC", "ETH", "SOL"])
+        
+        assert prices == {
+            "BTC": Decimal("50000.1"),
+            "ETH": Decimal("3000.2"),
+            "SOL": Decimal("150.3"),
+        }
+        assert calls == ["BTCUSD,ETHUSD,SOLUSD"]
+    
+    def test_rejected_batch_falls_back_to_single_tickers(self, connector, monkeypatch):
+        """Test si Kraken rechaza el batch, se pide un ticker por activo."""
+        single = {
+            "BTCUSD": {"XXBTZUSD": ticker("50000.1")},
+            "ETHUSD": {"XETHZUSD": ticker("3000.2")},
+        }
+        calls = []
+        
+        def fake_get(url, params=None, **kwargs):
+            pair = params["pair"]
+            calls.append(pair)
+            if pair in single:
+                return FakeResponse({"error": [], "result": single[pair]})
+            return FakeResponse({"error": ["EQuery:Unknown asset pair"]})
+        monkeypatch.setattr(connector.session, "get", fake_get)
+        
+        prices = connector.get_prices(["BTC", "ETH", "NOPE"])
+        
+        assert prices == {"BTC": Decimal("50000.1"), "ETH": Decimal("3000.2")}
+        assert calls[0] == "BTCUSD,ETHUSD,NOPEUSD"
+        assert sorted(calls[1:]) == ["BTCUSD", "ETHUSD", "NOPEUSD"]
+    
+    def test_cached_prices_are_not_requested(self, connector, monkeypatch):
+        """Test dentro del TTL solo se piden los activos que faltan."""
+        calls = []
+        
+        def fake_get(url, params=None, **kwargs):
+            calls.append(params["pair"])
+            result = {"XXBTZUSD": ticker("1")} if "BTC" in params["pair"] else {"XETHZUSD": ticker("2")}
+            return FakeResponse({"error": [], "result": result})
+        monkeypatch.setattr(connector.session, "get", fake_get)
+        
+        connector.get_prices(["BTC"])
+        prices = connector.get_prices(["BTC", "ETH"])
+        
+        assert prices == {"BTC": Decimal("1"), "ETH": Decimal("2")}
+        assert calls == ["BTCUSD", "ETHUSD"]
+
+
+# (código devuelto por /0/private/Balance, símbolo esperado)
+BALANCE_CASES = [
+    ("XXBT", "BTC"),
+    ("XBT", "BTC"),
+    ("XETH", "ETH"),
+    ("XXDG", "DOGE"),
+    ("XXRP", "XRP"),
+    ("XXLM", "XLM"),
+    ("ZUSD", "USD"),
+    ("ZEUR", "EUR"),
+    ("XTZ", "XTZ"),
+    ("ZRX", "ZRX"),
+    ("USDT", "USDT"),
+    ("USDC", "USDC"),
+    ("SOL", "SOL"),
+    ("ETH2.S", "ETH2.S"),
+]
+
+
+class TestBalances:
+    """Tests para los códigos de activo de los saldos."""
+    
+    @pytest.mark.parametrize("code,expected", BALANCE_CASES)
+    def test_balance_asset(self, code, expected):
+        """Test código de saldo de Kraken -> símbolo habitual."""
+        assert _balance_asset(code) == expected
+    
+    def test_balances_match_price_symbols(self, connector, monkeypatch):
+        """Test get_balances usa las mismas claves que get_prices."""
+        def fake_post(url, headers=None, data=None, **kwargs):
+            return FakeResponse({"error": [], "result": {
+                "XXBT": "0.5",
+                "XTZ": "10",
+                "ZUSD": "100.25",
+                "XETH": "0",
+            }})
+        monkeypatch.setattr(connector.session, "post", fake_post)
+        
+        balances = connector.get_balances()
+        
+        assert balances == {
+            "BTC": Decimal("0.5"),
+            "XTZ": Decimal("10"),
+            "USD": Decimal("100.25"),
+        }
+        assert connector.get_balances("XBT") == {"XBT": Decimal("0.5")}
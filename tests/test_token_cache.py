@@ -0,0 +1,90 @@
+"""
+Test Suite for Token Metadata Cache
+===========================================================================
+
+Tests para TokenMetadataCache (src/api/connectors/blockchains/token_cache.py).
+
+Cubre:
+- Ida y vuelta put/get
+- Fallo de caché
+- Persistencia entre instancias
+- Ruta por defecto independiente del directorio de trabajo
+
+Author: Crypto Portfolio Tracker Team
+Version: 3.0.0
+License: MIT
+"""
+
+import pytest
+
+from src.api.connectors.blockchains import token_cache
+from src.api.connectors.blockchains.token_cache import TokenMetadataCache, get_token_cache
+
+pytestmark = pytest.mark.unit
+
+USDC = "0xa0b86991c6218b36c1d19d4a2e9eb0ce3606eb48"
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """Caché sobre un SQLite temporal."""
+    cache = TokenMetadataCache(str(tmp_path / "token_metadata.db"))
+    yield cache
+    cache.close()
+
+
+class TestTokenMetadataCache:
+    """Tests para TokenMetadataCache."""
+    
+    def test_round_trip(self, cache):
+        """Test set y get devuelven (symbol, decimals)."""
+        cache.set("ethereum", USDC, "USDC", 6)
+        
+        assert cache.get("ethereum", USDC) == ("USDC", 6)
+    
+    def test_miss(self, cache):
+        """Test token no cacheado -> None."""
+        assert cache.get("ethereum", USDC) is None
+    
+    def test_keyed_by_chain(self, cache):
+        """Test la misma dirección en otra chain es otra entrada."""
+        cache.set("ethereum", USDC, "USDC", 6)
+        
+        assert cache.get("arbitrum", USDC) is None
+    
+    def test_survives_reopen(self, tmp_path):
+        """Test las entradas persisten entre instancias."""
+        path = str(tmp_path / "token_metadata.db")
+        first = TokenMetadataCache(path)
+        first.set("ethereum", USDC, "USDC", 6)
+        first.close()
+        
+        second = TokenMetadataCache(path)
+        assert second.get("ethereum", USDC) == ("USDC", 6)
+        second.close()
+    
+    def test_default_path_ignores_working_directory(self, tmp_path, monkeypatch):
+        """Test la ruta por defecto cuelga de la raíz del proyecto, no del cwd."""
+        monkeypatch.delenv("TOKEN_METADATA_DB", raising=False)
+        monkeypatch.chdir(tmp_path)
+        
+        cache = TokenMetadataCache()
+        
+        assert cache.db_path.is_absolute()
+        assert cache.db_path == token_cache._PROJECT_ROOT / "data" / "token_metadata.db"
+    
+    def test_env_overrides_default_path(self, tmp_path, monkeypatch):
+        """Test TOKEN_METADATA_DB cambia la ruta por defecto."""
+        monkeypatch.setenv("TOKEN_METADATA_DB", str(tmp_path / "meta.db"))
+        
+        assert TokenMetadataCache().db_path == tmp_path / "meta.db"
+
+
+class TestGetTokenCache:
+    """Tests para get_token_cache."""
+    
+    def test_shared_instance(self, monkeypatch):
+        """Test todas las llamadas devuelven la misma instancia."""
+        monkeypatch.setattr(token_cache, "_token_cache", None)
+        
+        assert get_token_cache() is get_token_cache()
@@ -0,0 +1,93 @@
+"""
+Test Suite for Wrapped Token Detector
+===========================================================================
+
+Tests para WrappedTokenDetector (src/api/connectors/tokens/wrapped_token_detector.py).
+
+Cubre:
+- Direcciones EVM sin distinguir mayúsculas
+- Mints de Solana (base58) conservados tal cual
+- Detección sobre un dict de balances
+
+Author: Crypto Portfolio Tracker Team
+Version: 3.0.0
+License: MIT
+"""
+
+import pytest
+
+from src.api.connectors.tokens.wrapped_token_detector import WrappedTokenDetector
+
+pytestmark = pytest.mark.unit
+
+WSOL_MINT = "So11111111111111111111111111111111111111112"
+POLYGON_WETH = "0x7ceB23fD6bC0adD59E62ac25578270cFf1b9f619"
+
+
+@pytest.fixture
+def detector():
+    """Detector con la caché de detecciones vacía."""
+    WrappedTokenDetector._detect_cache.clear()
+    yield WrappedTokenDetector()
+    WrappedTokenDetector._detect_cache.clear()
+
+
+class TestSolanaMint:
+    """Tests para el mint base58 de wSOL."""
+    
+    def test_wrapper_contract_keeps_mint_case(self, detector):
+        """Test get_wrapper_contract devuelve el mint válido."""
+        assert detector.get_wrapper_contract("SOL", "solana") == WSOL_MINT
+    
+    def test_all_wrappers_keep_mint_case(self, detector):
+        """Test get_all_wrappers_for_network devuelve el mint válido."""
+        wrappers = detector.get_all_wrappers_for_network("solana")
+        
+        assert [w.wrapper_address for w in wrappers] == [WSOL_MINT]
+    
+    def test_detect_mint(self, detector):
+        """Test el mint se detecta y conserva su forma."""
+        info = detector.detect_wrapped_token(WSOL_MINT, "solana")
+        
+        assert info.wrapper_address == WSOL_MINT
+        assert info.underlying_symbol == "SOL"
+    
+    def test_mint_is_case_sensitive(self, detector):
+        """Test un mint en minúsculas es otra dirección."""
+        assert detector.detect_wrapped_token(WSOL_MINT.lower(), "solana") is None
+
+
+class TestEvmAddresses:
+    """Tests para direcciones hex."""
+    
+    @pytest.mark.parametrize("address", [POLYGON_WETH, POLYGON_WETH.lower(), "0x" + POLYGON_WETH[2:].upper()])
+    def test_detect_ignores_case(self, detector, address):
+        """Test cualquier capitalización detecta el mismo token."""
+        info = detector.detect_wrapped_token(address, "polygon")
+        
+        assert info.wrapper_symbol == "WETH"
+        assert info.wrapper_address == POLYGON_WETH
+    
+    def test_unknown_address(self, detector):
+        """Test una dirección desconocida no se detecta ni se cachea."""
+        assert detector.detect_wrapped_token("0x" + "0" * 40, "ethereum") is None
+        assert WrappedTokenDetector._detect_cache == {}
+    
+    @pytest.mark.asyncio
+    async def test_detect_all_keeps_balance_keys(self, detector):
+        """Test las claves del resultado son las del dict de balances."""
+        balances = {
+            POLYGON_WETH.lower(): 1,
+            "0x" + "1" * 40: 2,
+        }
+        
+        detected = await detector.detect_all_wrapped_tokens(balances, "polygon")
+        
+        assert list(detected) == [POLYGON_WETH.lower()]
+    
+    @pytest.mark.asyncio
+    async def test_detect_all_on_solana(self, detector):
+        """Test detect_all_wrapped_tokens encuentra el mint de wSOL."""
+        detected = await detector.detect_all_wrapped_tokens({WSOL_MINT: 1}, "solana")
+        
+        assert detected[WSOL_MINT].wrapper_address == WSOL_MINT